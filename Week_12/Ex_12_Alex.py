@@ -1,6 +1,16 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+import sys
+import time
+
+import gurobipy as gp
 from gurobipy import Model, GRB, LinExpr, quicksum
 import numpy as np
 
+# shared helpers in common.py at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import shared_env
+
 # Input data
 load = 200  # Inflexible load (MWh)
 generators = {
@@ -14,7 +24,7 @@ probabilities = [0.25, 0.25, 0.4, 0.1]  # Scenario probabilities
 # Helper functions
 def solve_master(day_ahead_dispatch, cuts):
     """Solves the master problem with Benders cuts."""
-    master = Model("Master Problem")
+    master = Model("Master Problem", env=shared_env())
 
     # Variables
     da_gen = master.addVars(generators.keys(), lb=0, name="day_ahead_gen")
@@ -46,7 +56,7 @@ def solve_subproblems(day_ahead_dispatch):
     duals = []
 
     for scenario, wind in enumerate(wind_scenarios):
-        sub = Model(f"Subproblem_{scenario}")
+        sub = Model(f"Subproblem_{scenario}", env=shared_env())
 
         # Variables
         up = sub.addVars(generators.keys(), lb=0, name="up")
@@ -114,6 +124,512 @@ def benders_algorithm():
     print("Benders Decomposition converged.")
     return day_ahead_dispatch
 
-# Run Benders algorithm
-optimal_dispatch = benders_algorithm()
-print("Optimal Day-Ahead Dispatch:", optimal_dispatch)
+class Expando(object):
+    '''
+        A small class which can have attributes set
+    '''
+    pass
+
+
+class SubproblemChunk():
+    '''
+        Persistent recourse LPs for a block of wind scenarios, in their own gurobi environment
+        so that blocks can be solved concurrently (a block solved alone can be given a shared env).
+        The day-ahead dispatch only enters the right-hand sides, which are updated in place on
+        every Benders iteration.
+    '''
+
+    def __init__(self, data: Expando, scenarios: range, env: gp.Env = None):
+        self.data = data
+        self.scenarios = scenarios
+        self.owns_env = env is None
+        self.env = gp.Env(params={'OutputFlag': 0, 'Threads': 1}) if env is None else env
+        self.models = []
+        self.balance_constraints = []
+        self.capacity_constraints = []
+        for s in scenarios:
+            sub = gp.Model(f"Subproblem_{s}", env=self.env)
+            up = sub.addMVar(len(data.GENERATORS), lb=0, ub=data.up_adj, obj=data.up_cost, name="up")
+            down = sub.addMVar(len(data.GENERATORS), lb=0, ub=data.down_adj, obj=-data.down_cost, name="down")
+            # sum(up - down) = load - wind - sum(day-ahead dispatch)
+            self.balance_constraints.append(sub.addConstr(up.sum() - down.sum() == 0, name="load_balance"))
+            # up - down <= capacity - day-ahead dispatch
+            self.capacity_constraints.append(sub.addConstr(up - down <= data.capacity, name="capacity"))
+            self.models.append(sub)
+
+    def solve(self, day_ahead_dispatch: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        '''
+            Returns the recourse cost of every scenario and its subgradient with respect to the dispatch
+        '''
+        values = np.empty(len(self.scenarios))
+        subgradients = np.empty((len(self.scenarios), len(day_ahead_dispatch)))
+        balance_rhs = self.data.load - self.data.wind[self.scenarios] - day_ahead_dispatch.sum()
+        for i, sub in enumerate(self.models):
+            self.balance_constraints[i].RHS = balance_rhs[i]
+            self.capacity_constraints[i].RHS = self.data.capacity - day_ahead_dispatch
+            sub.optimize()
+            if sub.status != GRB.OPTIMAL:
+                raise RuntimeError(f"optimization of {sub.ModelName} was not successful")
+            values[i] = sub.ObjVal
+            # the dispatch enters both right-hand sides with coefficient -1
+            subgradients[i] = -self.balance_constraints[i].Pi - self.capacity_constraints[i].Pi
+        return values, subgradients
+
+
+class MeritOrderRecourse():
+    '''
+        Closed-form recourse of all scenarios at once. With up_cost >= down_cost for every
+        generator, the recourse LP is a merit-order dispatch of the imbalance: starting from
+        every generator at full down-regulation, the net adjustment is raised by the cheapest
+        increments first, where undoing down-regulation of a generator costs its down_cost and
+        up-regulation costs its up_cost (limited by up_adj and the headroom above the dispatch).
+        The marginal increment sets the price of load_balance in every scenario.
+    '''
+
+    def __init__(self, data: Expando):
+        if np.any(data.up_cost < data.down_cost):
+            raise ValueError("the merit-order recourse requires up_cost >= down_cost for every generator")
+        self.data = data
+        self.scenarios = range(len(data.wind))
+        self.models = []
+
+    def solve(self, day_ahead_dispatch: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        '''
+            Returns the recourse cost of every scenario and its subgradient with respect to the dispatch
+        '''
+        data = self.data
+        headroom = data.capacity - day_ahead_dispatch
+        up_limit = np.minimum(data.up_adj, headroom)
+        prices = np.concatenate([data.down_cost, data.up_cost])
+        quantities = np.concatenate([data.down_adj, up_limit])
+        order = np.argsort(prices, kind='stable')
+        prices, quantities = prices[order], quantities[order]
+        cumulative_quantity = np.cumsum(quantities)
+        cumulative_cost = np.concatenate([[0.0], np.cumsum(prices * quantities)])
+        # net adjustment needed on top of full down-regulation
+        needed = data.load - data.wind - day_ahead_dispatch.sum() + data.down_adj.sum()
+        tolerance = 1e-9 * max(1, cumulative_quantity[-1])
+        if np.any(needed < -tolerance) or np.any(needed > cumulative_quantity[-1] + tolerance):
+            raise RuntimeError("recourse problem is infeasible for some scenarios")
+        marginal = np.minimum(np.searchsorted(cumulative_quantity, needed), len(prices) - 1)
+        filled = np.concatenate([[0.0], cumulative_quantity])[marginal]
+        price = prices[marginal]
+        values = -data.down_cost @ data.down_adj + cumulative_cost[marginal] + price * (needed - filled)
+        # the capacity row of a generator is binding when its headroom limits up-regulation, and
+        # then has the dual up_cost - price whenever that up-regulation is dispatched in full
+        capacity_duals = np.where(headroom < data.up_adj, np.minimum(0, data.up_cost - price[:, None]), 0)
+        subgradients = -price[:, None] - capacity_duals
+        return values, subgradients
+
+
+class BendersDecomposition():
+    '''
+        Benders decomposition of the two-stage dispatch with a persistent master problem,
+        to which cuts are added incrementally, and persistent subproblems solved in
+        parallel by a pool of worker threads (gurobi releases the GIL while optimizing).
+        multi_cut=True adds one cut per scenario instead of one aggregated cut.
+
+        recourse='closed-form' evaluates all scenarios at once with MeritOrderRecourse (falling
+        back to gurobi when some up_cost is below its down_cost), recourse='gurobi' solves the
+        recourse LPs, and recourse='verify' does both and checks that the costs agree.
+    '''
+
+    def __init__(
+        self,
+        generators: dict = generators,
+        load: float = load,
+        wind_scenarios: list = wind_scenarios,
+        probabilities: list = probabilities,
+        multi_cut: bool = False,
+        workers: int = 1,
+        recourse: str = 'closed-form',
+        env: gp.Env = None,
+    ):
+        self.data = Expando()
+        self.data.GENERATORS = list(generators)
+        self.data.load = load
+        self.data.wind = np.asarray(wind_scenarios, dtype=float) * generators["G2"]["capacity"]
+        self.data.probabilities = np.asarray(probabilities, dtype=float)
+        for key, attribute in (
+            ("day_ahead_cost", "day_ahead_cost"), ("up_cost", "up_cost"), ("down_cost", "down_cost"),
+            ("capacity", "capacity"), ("up_adj", "up_adj"), ("down_adj", "down_adj"),
+        ):
+            setattr(self.data, attribute, np.array([generators[g][key] for g in self.data.GENERATORS], dtype=float))
+        if recourse not in ('closed-form', 'gurobi', 'verify'):
+            raise ValueError(f"unknown recourse {recourse}")
+        if recourse == 'closed-form' and np.any(self.data.up_cost < self.data.down_cost):
+            recourse = 'gurobi'
+        self.recourse = recourse
+        self.env = env # gurobi environment of the master problem (None for the shared one of this process)
+        self.multi_cut = multi_cut
+        self.cuts = []
+        self.cut_ages = {}
+        self.variables = Expando()
+        self.results = Expando()
+        self._build_master()
+        self._build_subproblems(workers)
+
+    def _build_master(self):
+        self.master = Model("Master Problem", env=shared_env(self.env))
+        self.variables.da_gen = self.master.addMVar(
+            len(self.data.GENERATORS), lb=0, ub=self.data.capacity, obj=self.data.day_ahead_cost, name="day_ahead_gen"
+        )
+        # the recourse can at most earn the down-regulation of every generator at full range,
+        # which bounds theta and keeps the first master problem bounded
+        theta_lb = -self.data.down_cost @ self.data.down_adj
+        if self.multi_cut:
+            self.variables.theta = self.master.addMVar(
+                len(self.data.wind), lb=theta_lb, obj=self.data.probabilities, name="theta"
+            )
+        else:
+            self.variables.theta = self.master.addVar(lb=theta_lb, obj=1, name="theta")
+        self.master.addConstr(self.variables.da_gen.sum() == self.data.load, name="load_balance")
+        self.master.ModelSense = GRB.MINIMIZE
+
+    def _build_subproblems(self, workers: int):
+        self.oracle = MeritOrderRecourse(self.data) if self.recourse != 'gurobi' else None
+        if self.recourse == 'closed-form':
+            self.chunks, self.pool = [], None
+            return
+        bounds = np.linspace(0, len(self.data.wind), workers + 1).astype(int)
+        # without concurrency the subproblems need no environment of their own
+        env = shared_env(self.env) if workers == 1 else None
+        self.chunks = [
+            SubproblemChunk(self.data, range(bounds[i], bounds[i + 1]), env=env)
+            for i in range(workers) if bounds[i] < bounds[i + 1]
+        ]
+        self.pool = ThreadPoolExecutor(max_workers=len(self.chunks)) if len(self.chunks) > 1 else None
+
+    def solve_subproblems(self, day_ahead_dispatch: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        if self.oracle is not None:
+            values, subgradients = self.oracle.solve(day_ahead_dispatch)
+            if self.recourse == 'closed-form':
+                return values, subgradients
+        if self.pool is None:
+            parts = [chunk.solve(day_ahead_dispatch) for chunk in self.chunks]
+        else:
+            parts = list(self.pool.map(lambda chunk: chunk.solve(day_ahead_dispatch), self.chunks))
+        lp_values = np.concatenate([p[0] for p in parts])
+        if self.recourse == 'verify':
+            # duals of degenerate LPs are not unique, so only the recourse costs are compared
+            if not np.allclose(values, lp_values, rtol=1e-7, atol=1e-6):
+                worst = np.argmax(np.abs(values - lp_values))
+                raise RuntimeError(
+                    f"closed-form recourse {values[worst]} differs from the LP {lp_values[worst]} in scenario {worst}"
+                )
+            return values, subgradients
+        return lp_values, np.concatenate([p[1] for p in parts])
+
+    def _add_cuts(
+        self,
+        point: np.ndarray,
+        values: np.ndarray,
+        subgradients: np.ndarray,
+        master_point: np.ndarray,
+        master_theta: np.ndarray,
+        tolerance: float,
+    ) -> int:
+        '''
+            Add the cuts generated at point that are violated at the master solution,
+            returns the number of cuts added
+        '''
+        da_gen = self.variables.da_gen
+        cut_values = values + subgradients @ (master_point - point)
+        if self.multi_cut:
+            # only scenarios whose recourse is underestimated get a new cut
+            violated = np.flatnonzero(cut_values - master_theta > tolerance * np.maximum(1, np.abs(cut_values)))
+            if len(violated):
+                cuts = self.master.addConstr(
+                    self.variables.theta[violated] - subgradients[violated] @ da_gen
+                    >= values[violated] - subgradients[violated] @ point,
+                    name="cut",
+                )
+                self.cut_ages.update((cut, 0) for cut in cuts.tolist())
+            return len(violated)
+        expected_value = self.data.probabilities @ cut_values
+        if expected_value - master_theta[0] <= tolerance * max(1, abs(expected_value)):
+            return 0
+        expected_subgradient = self.data.probabilities @ subgradients
+        rhs = self.data.probabilities @ values - expected_subgradient @ point
+        cut = self.master.addLConstr(
+            self.variables.theta - gp.LinExpr(expected_subgradient.tolist(), da_gen.tolist()), GRB.GREATER_EQUAL, rhs,
+            name="cut",
+        )
+        self.cut_ages[cut] = 0
+        # same cut in the (coeffs, rhs) format of solve_master
+        self.cuts.append((dict(zip(self.data.GENERATORS, expected_subgradient.tolist())), rhs))
+        return 1
+
+    def _remove_inactive_cuts(self, cut_removal_age: int) -> int:
+        '''
+            Age every cut that is slack at the current master solution, reset the age of
+            binding cuts, and remove the cuts that stayed slack for cut_removal_age iterations
+        '''
+        if not self.cut_ages:
+            return 0
+        cuts = list(self.cut_ages)
+        slacks = np.array(self.master.getAttr(GRB.Attr.Slack, cuts))
+        removed = []
+        for cut, slack in zip(cuts, slacks):
+            self.cut_ages[cut] = self.cut_ages[cut] + 1 if abs(slack) > 1e-6 else 0
+            if self.cut_ages[cut] >= cut_removal_age:
+                removed.append(cut)
+        for cut in removed:
+            del self.cut_ages[cut]
+        self.master.remove(removed)
+        return len(removed)
+
+    def _evaluate(self, point: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        '''
+            Solve the subproblems at a feasible dispatch and update the incumbent
+        '''
+        values, subgradients = self.solve_subproblems(point)
+        upper_bound = self.data.day_ahead_cost @ point + self.data.probabilities @ values
+        if upper_bound < self.results.objective_value:
+            self.incumbent = point
+            self.results.objective_value = upper_bound
+            self.results.day_ahead_dispatch = dict(zip(self.data.GENERATORS, point.tolist()))
+        return values, subgradients
+
+    def run(
+        self,
+        tolerance: float = 1e-6,
+        max_iterations: int = 1000,
+        time_limit: float = None,
+        stabilization: str = None,
+        in_out_weight: float = 0.5,
+        trust_region_radius: float = None,
+        cut_removal_age: int = None,
+        verbose: bool = True,
+    ):
+        '''
+            Iterate until the relative gap between the bounds is below tolerance, or until
+            max_iterations or time_limit (seconds) is reached.
+
+            stabilization='in-out' separates at in_out_weight * master solution + (1 - in_out_weight)
+            * incumbent, and also at the master solution whenever that cut does not cut it off.
+            stabilization='trust-region' restricts the master to a box of trust_region_radius
+            (default: a tenth of the largest capacity) around the incumbent. The box doubles when it
+            no longer allows progress, and the master bound only counts as a lower bound when the box is slack.
+            cut_removal_age removes cuts that stayed slack for that many iterations.
+        '''
+        if stabilization not in (None, 'in-out', 'trust-region'):
+            raise ValueError(f"unknown stabilization {stabilization}")
+        self.results.iterations = []
+        self.results.lower_bound = []
+        self.results.upper_bound = []
+        self.results.objective_value = np.inf
+        self.incumbent = None
+        if trust_region_radius is None:
+            trust_region_radius = self.data.capacity.max() / 10
+        lower_bound = -np.inf
+        status = 'iteration limit'
+        start_run = time.perf_counter()
+        for iteration in range(1, max_iterations + 1):
+            start = time.perf_counter()
+            box_active = False
+            if stabilization == 'trust-region' and self.incumbent is not None:
+                box_lb = np.maximum(0, self.incumbent - trust_region_radius)
+                box_ub = np.minimum(self.data.capacity, self.incumbent + trust_region_radius)
+                self.variables.da_gen.LB, self.variables.da_gen.UB = box_lb, box_ub
+            self.master.optimize()
+            if self.master.status != GRB.OPTIMAL:
+                raise RuntimeError(f"optimization of {self.master.ModelName} was not successful")
+            day_ahead_dispatch = self.variables.da_gen.X
+            theta = np.atleast_1d(self.variables.theta.X)
+            if stabilization == 'trust-region' and self.incumbent is not None:
+                box_active = bool(
+                    np.any((box_lb > 0) & (day_ahead_dispatch <= box_lb + 1e-9))
+                    or np.any((box_ub < self.data.capacity) & (day_ahead_dispatch >= box_ub - 1e-9))
+                )
+            if not box_active:
+                lower_bound = max(lower_bound, self.master.ObjVal)
+            removed = self._remove_inactive_cuts(cut_removal_age) if cut_removal_age else 0
+            master_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            if stabilization == 'in-out' and self.incumbent is not None:
+                point = in_out_weight * day_ahead_dispatch + (1 - in_out_weight) * self.incumbent
+            else:
+                point = day_ahead_dispatch
+            values, subgradients = self._evaluate(point)
+            cuts = self._add_cuts(point, values, subgradients, day_ahead_dispatch, theta, tolerance)
+            if cuts == 0 and point is not day_ahead_dispatch:
+                # the stabilized cut does not cut off the master solution, separate there instead
+                values, subgradients = self._evaluate(day_ahead_dispatch)
+                cuts = self._add_cuts(day_ahead_dispatch, values, subgradients, day_ahead_dispatch, theta, tolerance)
+            if cuts == 0 and box_active:
+                # no progress inside the box: enlarge it
+                trust_region_radius *= 2
+            subproblem_time = time.perf_counter() - start
+
+            upper_bound = self.results.objective_value
+            gap = (upper_bound - lower_bound) / max(1, abs(upper_bound))
+            self.results.lower_bound.append(lower_bound)
+            self.results.upper_bound.append(upper_bound)
+            self.results.iterations.append({
+                'iteration': iteration,
+                'day_ahead_dispatch': dict(zip(self.data.GENERATORS, day_ahead_dispatch.tolist())),
+                'lower_bound': lower_bound,
+                'upper_bound': upper_bound,
+                'gap': gap,
+                'cuts': cuts,
+                'removed_cuts': removed,
+                'master_time': master_time,
+                'subproblem_time': subproblem_time,
+            })
+            if verbose:
+                print(
+                    f"Iteration {iteration}: LB {lower_bound:.4f}, UB {upper_bound:.4f}, gap {gap:.2e}, "
+                    f"cuts +{cuts}/-{removed}, master {master_time * 1e3:.1f} ms, subproblems {subproblem_time * 1e3:.1f} ms"
+                )
+            if gap <= tolerance or (cuts == 0 and not box_active):
+                status = 'converged'
+                break
+            if time_limit is not None and time.perf_counter() - start_run >= time_limit:
+                status = 'time limit'
+                break
+        self.variables.da_gen.LB, self.variables.da_gen.UB = 0, self.data.capacity
+        self.results.status = status
+        self.results.converged = status == 'converged'
+        return self.results.day_ahead_dispatch
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+        for chunk in self.chunks:
+            for sub in chunk.models:
+                sub.dispose()
+            if chunk.owns_env:
+                chunk.env.dispose()
+
+
+def random_scenarios(n_scenarios: int, seed: int = 0) -> tuple[list, list]:
+    '''
+        Normalized wind scenarios with random probabilities, used for benchmarks
+    '''
+    rng = np.random.default_rng(seed)
+    weights = rng.uniform(0.5, 1.5, n_scenarios)
+    return rng.uniform(0.5, 0.9, n_scenarios).round(3).tolist(), (weights / weights.sum()).tolist()
+
+
+def random_generators(n_generators: int, seed: int = 0) -> tuple[dict, float]:
+    '''
+        Random fleet in the format of generators, with a load of half its capacity, used for benchmarks
+    '''
+    rng = np.random.default_rng(seed)
+    fleet = {}
+    for i in range(1, n_generators + 1):
+        day_ahead_cost = rng.uniform(5, 100)
+        capacity = rng.uniform(50, 200)
+        fleet[f"G{i}"] = {
+            "day_ahead_cost": day_ahead_cost,
+            "up_cost": day_ahead_cost + rng.uniform(1, 20),
+            "down_cost": day_ahead_cost - rng.uniform(1, 20),
+            "capacity": capacity,
+            "up_adj": capacity * rng.uniform(0.1, 1),
+            "down_adj": capacity * rng.uniform(0.1, 1),
+        }
+    return fleet, sum(g["capacity"] for g in fleet.values()) / 2
+
+
+def benchmark_benders(scenario_counts: tuple = (4, 100, 1000), workers: int = 4):
+    '''
+        Compare the Benders engine (single-cut, multi-cut, parallel or closed-form subproblems) against the
+        helper functions above, which rebuild the master with all cuts and one model per
+        scenario on every iteration. The helpers are replayed on the engine's own iterates
+        and cuts, since their convergence loop cannot be timed on its own.
+    '''
+    global wind_scenarios, probabilities
+    print()
+    print("-------------------   BENDERS BENCHMARK  -------------------")
+    print(
+        f"{'scenarios':>10} {'mode':>24} {'iterations':>11} {'build [s]':>10} {'run [s]':>10} "
+        f"{'per iteration [ms]':>19} {'objective':>10}"
+    )
+    default_scenarios = (wind_scenarios, probabilities)
+    for n_scenarios in scenario_counts:
+        wind_scenarios, probabilities = random_scenarios(n_scenarios) if n_scenarios != 4 else default_scenarios
+        replay = None
+        for mode, multi_cut, n_workers, recourse in (
+            ('single-cut', False, 1, 'gurobi'),
+            (f'single-cut, {workers} workers', False, workers, 'gurobi'),
+            ('single-cut, closed-form', False, 1, 'closed-form'),
+            ('multi-cut', True, 1, 'gurobi'),
+            (f'multi-cut, {workers} workers', True, workers, 'gurobi'),
+            ('multi-cut, closed-form', True, 1, 'closed-form'),
+        ):
+            start = time.perf_counter()
+            engine = BendersDecomposition(
+                wind_scenarios=wind_scenarios, probabilities=probabilities, multi_cut=multi_cut, workers=n_workers,
+                recourse=recourse,
+            )
+            build = time.perf_counter() - start
+            start = time.perf_counter()
+            engine.run(verbose=False)
+            total = time.perf_counter() - start
+            iterations = len(engine.results.iterations)
+            print(
+                f"{n_scenarios:>10} {mode:>24} {iterations:>11} {build:>10.3f} {total:>10.3f} "
+                f"{1e3 * total / iterations:>19.2f} {engine.results.objective_value:>10.2f}"
+            )
+            if replay is None:
+                replay = (engine.results.iterations, engine.cuts)
+            engine.close()
+
+        iterations, cuts = replay
+        start = time.perf_counter()
+        for i, row in enumerate(iterations):
+            solve_master(row['day_ahead_dispatch'], cuts[:i])
+            solve_subproblems(row['day_ahead_dispatch'])
+        total = time.perf_counter() - start
+        print(
+            f"{n_scenarios:>10} {'rebuild (helpers)':>24} {len(iterations):>11} {'-':>10} {total:>10.3f} "
+            f"{1e3 * total / len(iterations):>19.2f} {'-':>10}"
+        )
+    wind_scenarios, probabilities = default_scenarios
+
+
+def benchmark_stabilization(scenario_counts: tuple = (100, 1000), n_generators: int = 30, cut_removal_age: int = 5):
+    '''
+        Compare iterations to convergence and master size of the stabilization and cut removal options
+    '''
+    fleet, fleet_load = random_generators(n_generators)
+    print()
+    print("-------------------   BENDERS STABILIZATION BENCHMARK  -------------------")
+    print(f"{n_generators} generators, cuts removed after {cut_removal_age} slack iterations")
+    print(
+        f"{'scenarios':>10} {'cuts':>7} {'stabilization':>14} {'removal':>8} {'iterations':>11} "
+        f"{'time [s]':>9} {'master rows':>12} {'objective':>12}"
+    )
+    for n_scenarios in scenario_counts:
+        scenarios, scenario_probabilities = random_scenarios(n_scenarios)
+        for multi_cut in (False, True):
+            for stabilization in (None, 'in-out', 'trust-region'):
+                for removal in (None, cut_removal_age):
+                    engine = BendersDecomposition(
+                        generators=fleet, load=fleet_load, wind_scenarios=scenarios,
+                        probabilities=scenario_probabilities, multi_cut=multi_cut,
+                    )
+                    start = time.perf_counter()
+                    engine.run(stabilization=stabilization, cut_removal_age=removal, verbose=False)
+                    total = time.perf_counter() - start
+                    print(
+                        f"{n_scenarios:>10} {'multi' if multi_cut else 'single':>7} {str(stabilization):>14} "
+                        f"{str(removal):>8} {len(engine.results.iterations):>11} {total:>9.3f} "
+                        f"{engine.master.NumConstrs:>12} {engine.results.objective_value:>12.2f}"
+                    )
+                    engine.close()
+
+
+if __name__ == '__main__':
+    engine = BendersDecomposition()
+    optimal_dispatch = engine.run()
+    print("Benders Decomposition converged." if engine.results.converged else "Benders Decomposition did not converge.")
+    print("Optimal Day-Ahead Dispatch:", optimal_dispatch)
+    print("Expected cost:", engine.results.objective_value)
+    engine.close()
+
+    if '--benchmark' in sys.argv:
+        benchmark_benders()
+        benchmark_stabilization()
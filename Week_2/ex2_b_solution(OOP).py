@@ -3,8 +3,21 @@ Here, we introduce a more specific class called EconomicDispatch to solve the ec
 Note that the InputData class has also been modified to be specific for the economic dispatch problem. 
 '''
 
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
 import gurobipy as gp
 from gurobipy import GRB
+import numpy as np
+from scipy.optimize import linprog
+import scipy.sparse as sp
+
+# shared helpers in common.py at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import LabeledArray, as_array, shared_env
 
 
 class Expando(object):
@@ -14,6 +27,13 @@ class Expando(object):
     pass
 
 
+class DispatchResults:
+    '''
+        Results of EconomicDispatch, dispatch and capacity sensitivities keyed by generator
+    '''
+    __slots__ = ('objective_value', 'generator_production', 'price', 'capacity_sensitivities')
+
+
 class InputData:
     
     def __init__(
@@ -36,14 +56,38 @@ class InputData:
         self.load_capacity = load_capacity 
 
 
+def merge_data(current, new):
+    '''
+        Overwrite the changed entries of a dict, or replace an array as a whole
+    '''
+    if isinstance(current, dict) and isinstance(new, dict):
+        return {**current, **new}
+    return new
+
+
 class EconomicDispatch():
+    '''
+        backend='gurobi' builds and solves a gurobi model, backend='highs' solves the same LP from
+        sparse matrices with HiGHS (scipy.optimize.linprog), which needs no gurobi license
+    '''
 
-    def __init__(self, input_data: InputData): # initialize class
+    def __init__(
+        self, input_data: InputData, vectorized: bool = False, backend: str = 'gurobi', env: gp.Env = None
+    ): # initialize class
+        if backend not in ('gurobi', 'highs'):
+            raise ValueError(f"unknown backend {backend}")
         self.data = input_data # define data attributes
+        self.env = env # gurobi environment of the model (None for the shared one of this process)
+        self.vectorized = vectorized # build with the matrix API instead of one addVar/addLConstr per generator
+        self.backend = backend
         self.variables = Expando() # define variable attributes
         self.constraints = Expando() # define constraints attributes
-        self.results = Expando() # define results attributes
-        self._build_model() # build gurobi model
+        self.results = DispatchResults() # define results attributes
+        self.timings = Expando() # define latency attributes (seconds)
+        if backend == 'gurobi':
+            self._build_model() # build gurobi model
+        else:
+            self._build_matrices() # build LP matrices for HiGHS
     
     def _build_variables(self):
         # build generator production variables
@@ -72,6 +116,34 @@ class EconomicDispatch():
             )
         )
 
+    def _build_variables_vectorized(self):
+        # build all generator production variables in one call, objective coefficients (c^G_i) included
+        self.variables.generator_production = self.model.addMVar(
+            len(self.data.GENERATORS),
+            lb=0,
+            obj=as_array(self.data.generator_cost, self.data.GENERATORS),
+            name='Electricity production',
+        )
+
+    def _build_constraints_vectorized(self):
+        n_generators = len(self.data.GENERATORS)
+        # build capacity constraints as a single (identity) matrix constraint
+        self.constraints.capacity_constraints = self.model.addMConstr(
+            sp.identity(n_generators, format='csr'),
+            self.variables.generator_production,
+            GRB.LESS_EQUAL,
+            as_array(self.data.generator_capacity, self.data.GENERATORS),
+            name='Capacity constraint',
+        )
+        # build balance constraint as a single row of ones
+        self.constraints.balance_constraint = self.model.addMConstr(
+            sp.csr_matrix(np.ones((1, n_generators))),
+            self.variables.generator_production,
+            GRB.EQUAL,
+            np.array([as_array(self.data.load_capacity, self.data.LOADS).sum()]),
+            name='Balance constraint',
+        )
+
     def _build_objective_function(self):
         objective = gp.quicksum(
             self.data.generator_cost[g] * self.variables.generator_production[g] for g in self.data.GENERATORS
@@ -79,32 +151,138 @@ class EconomicDispatch():
         self.model.setObjective(objective, GRB.MINIMIZE)
 
     def _build_model(self):
-        self.model = gp.Model(name='Economic dispatch')
-        self._build_variables()
-        self._build_objective_function()
-        self._build_constraints()
+        start = time.perf_counter()
+        self.model = gp.Model(name='Economic dispatch', env=shared_env(self.env))
+        if self.vectorized:
+            self._build_variables_vectorized()
+            self.model.ModelSense = GRB.MINIMIZE
+            self._build_constraints_vectorized()
+        else:
+            self._build_variables()
+            self._build_objective_function()
+            self._build_constraints()
         self.model.update()
+        self.timings.build = time.perf_counter() - start
+
+    def _build_matrices(self):
+        # min c^T p subject to p <= P^G (capacity), sum p = sum P^D (balance) and p >= 0
+        start = time.perf_counter()
+        n_generators = len(self.data.GENERATORS)
+        self.matrices = Expando()
+        self.matrices.c = as_array(self.data.generator_cost, self.data.GENERATORS)
+        self.matrices.A_ub = sp.identity(n_generators, format='csr')
+        self.matrices.b_ub = as_array(self.data.generator_capacity, self.data.GENERATORS)
+        self.matrices.A_eq = sp.csr_matrix(np.ones((1, n_generators)))
+        self.matrices.b_eq = np.array([as_array(self.data.load_capacity, self.data.LOADS).sum()])
+        self.timings.build = time.perf_counter() - start
+
+    def _save_results_highs(self, solution):
+        # HiGHS marginals are the objective sensitivities to the right-hand sides, as gurobi's Pi
+        self.results.objective_value = solution.fun
+        self.results.generator_production = LabeledArray(solution.x, self.data.GENERATORS)
+        self.results.price = float(solution.eqlin.marginals[0])
+        self.results.capacity_sensitivities = LabeledArray(solution.ineqlin.marginals, self.data.GENERATORS)
+
+    def _save_results_vectorized(self):
+        # same results as _save_results, read from the matrix variables and constraints
+        self.results.objective_value = self.model.ObjVal
+        self.results.generator_production = LabeledArray(self.variables.generator_production.X, self.data.GENERATORS)
+        self.results.price = float(self.constraints.balance_constraint.Pi[0])
+        self.results.capacity_sensitivities = LabeledArray(
+            self.constraints.capacity_constraints.Pi, self.data.GENERATORS
+        )
     
     def _save_results(self):
         # save objective value
         self.results.objective_value = self.model.ObjVal
-        # save generator dispatch values
-        self.results.generator_production = {
-            g: self.variables.generator_production[g].x for g in self.data.GENERATORS
-        }
+        # save generator dispatch values, one attribute query for all generators
+        self.results.generator_production = LabeledArray(
+            np.array(self.model.getAttr(GRB.Attr.X, list(self.variables.generator_production.values()))),
+            self.data.GENERATORS,
+        )
         # save price (i.e., dual variable of balance constraint)
         self.results.price = self.constraints.balance_constraint.Pi
         # save generator capacity sensitivities (i.e., dual variables of capacity constraints)
-        self.results.capacity_sensitivities = {
-            g: self.constraints.capacity_constraints[g].Pi for g in self.data.GENERATORS
-        }
+        self.results.capacity_sensitivities = LabeledArray(
+            np.array(self.model.getAttr(GRB.Attr.Pi, list(self.constraints.capacity_constraints.values()))),
+            self.data.GENERATORS,
+        )
+
+    def update(
+        self,
+        load_capacity: dict[str, int] = None,
+        generator_cost: dict[str, int] = None,
+        generator_capacity: dict[str, int] = None,
+    ):
+        '''
+            Change load, costs and/or capacities in place on the existing model.
+            Dicts may hold only the entries that changed. The model is not rebuilt,
+            so the next run() warm-starts from the previous simplex basis.
+        '''
+        start = time.perf_counter()
+        if self.backend == 'highs':
+            # the matrices are rebuilt from the merged data, HiGHS is not warm-started
+            if load_capacity is not None:
+                self.data.load_capacity = merge_data(self.data.load_capacity, load_capacity)
+            if generator_cost is not None:
+                self.data.generator_cost = merge_data(self.data.generator_cost, generator_cost)
+            if generator_capacity is not None:
+                self.data.generator_capacity = merge_data(self.data.generator_capacity, generator_capacity)
+            self._build_matrices()
+            self.timings.update = time.perf_counter() - start
+            return
+        if load_capacity is not None:
+            self.data.load_capacity = merge_data(self.data.load_capacity, load_capacity)
+            total_load = as_array(self.data.load_capacity, self.data.LOADS).sum()
+            self.constraints.balance_constraint.RHS = np.array([total_load]) if self.vectorized else total_load
+        if generator_cost is not None:
+            self.data.generator_cost = merge_data(self.data.generator_cost, generator_cost)
+            cost = as_array(self.data.generator_cost, self.data.GENERATORS)
+            if self.vectorized:
+                self.variables.generator_production.Obj = cost
+            else:
+                self.model.setAttr(
+                    GRB.Attr.Obj, [self.variables.generator_production[g] for g in self.data.GENERATORS], cost.tolist()
+                )
+        if generator_capacity is not None:
+            self.data.generator_capacity = merge_data(self.data.generator_capacity, generator_capacity)
+            capacity = as_array(self.data.generator_capacity, self.data.GENERATORS)
+            if self.vectorized:
+                self.constraints.capacity_constraints.RHS = capacity
+            else:
+                self.model.setAttr(
+                    GRB.Attr.RHS, [self.constraints.capacity_constraints[g] for g in self.data.GENERATORS], capacity.tolist()
+                )
+        self.model.update()
+        self.timings.update = time.perf_counter() - start
 
     def run(self):
+        start = time.perf_counter()
+        if self.backend == 'highs':
+            solution = linprog(
+                self.matrices.c,
+                A_ub=self.matrices.A_ub,
+                b_ub=self.matrices.b_ub,
+                A_eq=self.matrices.A_eq,
+                b_eq=self.matrices.b_eq,
+                bounds=(0, None),
+                method='highs',
+            )
+            self.timings.solve = time.perf_counter() - start
+            if solution.status == 0:
+                self._save_results_highs(solution)
+            else:
+                print(f"optimization of Economic dispatch was not successful ({solution.message})")
+            return
         self.model.optimize()
+        self.timings.solve = time.perf_counter() - start
         if self.model.status == GRB.OPTIMAL:
-            self._save_results()
+            if self.vectorized:
+                self._save_results_vectorized()
+            else:
+                self._save_results()
         else:
-            print(f"optimization of {model.ModelName} was not successful")
+            print(f"optimization of {self.model.ModelName} was not successful")
     
     def display_results(self):
         print()
@@ -119,7 +297,388 @@ class EconomicDispatch():
         print(self.results.capacity_sensitivities)
 
 
+class MultiPeriodInputData(InputData):
+
+    def __init__(
+        self,
+        GENERATORS: list,
+        LOADS: list,
+        TIMES: list,
+        generator_cost: dict[str, list],
+        generator_capacity: dict[str, int],
+        load_capacity: dict[str, list],
+        generator_ramp: dict[str, int] = None,
+    ):
+        # generator_cost (c^G_it) and load_capacity (P^D_jt) hold one value per period,
+        # a constant cost per generator is also accepted
+        super().__init__(GENERATORS, LOADS, generator_cost, generator_capacity, load_capacity)
+        # List of time periods
+        self.TIMES = TIMES
+        # Generators ramping limits between consecutive periods (R^G_i), None for no ramping limits
+        self.generator_ramp = generator_ramp
+
+
+def as_matrix(values, keys: list, n_times: int) -> np.ndarray:
+    '''
+        Return per-key time series (dict of lists/scalars or a 2D array ordered like keys) as a (keys, times) array
+    '''
+    if not isinstance(values, np.ndarray):
+        values = np.array([np.broadcast_to(np.asarray(values[k], dtype=float), (n_times,)) for k in keys])
+    return np.broadcast_to(values.astype(float, copy=False).reshape(len(keys), -1), (len(keys), n_times))
+
+
+class MultiPeriodEconomicDispatch():
+
+    def __init__(self, input_data: MultiPeriodInputData, env: gp.Env = None): # initialize class
+        self.data = input_data # define data attributes
+        self.env = env # gurobi environment of the model (None for the shared one of this process)
+        self.variables = Expando() # define variable attributes
+        self.constraints = Expando() # define constraints attributes
+        self.results = Expando() # define results attributes
+        self.timings = Expando() # define latency attributes (seconds)
+        self._build_model() # build gurobi model
+
+    def _build_variables(self):
+        # build generator production variables indexed by (generator, time), bounded by capacity (P^G_i)
+        n_times = len(self.data.TIMES)
+        self.variables.generator_production = self.model.addMVar(
+            (len(self.data.GENERATORS), n_times),
+            lb=0,
+            ub=as_matrix(self.data.generator_capacity, self.data.GENERATORS, n_times),
+            obj=as_matrix(self.data.generator_cost, self.data.GENERATORS, n_times),
+            name='Electricity production',
+        )
+
+    def _build_constraints(self):
+        production = self.variables.generator_production
+        # build one balance constraint per period
+        self.constraints.balance_constraint = self.model.addConstr(
+            production.sum(axis=0) == as_matrix(self.data.load_capacity, self.data.LOADS, len(self.data.TIMES)).sum(axis=0),
+            name='Balance constraint',
+        )
+        # build ramping constraints between consecutive periods
+        if self.data.generator_ramp is not None and len(self.data.TIMES) > 1:
+            ramp = as_array(self.data.generator_ramp, self.data.GENERATORS)[:, None]
+            self.constraints.ramp_up_constraints = self.model.addConstr(
+                production[:, 1:] - production[:, :-1] <= ramp, name='Ramp-up constraint'
+            )
+            self.constraints.ramp_down_constraints = self.model.addConstr(
+                production[:, :-1] - production[:, 1:] <= ramp, name='Ramp-down constraint'
+            )
+
+    def _build_model(self):
+        start = time.perf_counter()
+        self.model = gp.Model(name='Multi-period economic dispatch', env=shared_env(self.env))
+        self._build_variables()
+        self.model.ModelSense = GRB.MINIMIZE
+        self._build_constraints()
+        self.model.update()
+        self.timings.build = time.perf_counter() - start
+
+    def _save_results(self):
+        # save objective value
+        self.results.objective_value = self.model.ObjVal
+        # save generator dispatch values as a (generator, time) array
+        self.results.generator_production = self.variables.generator_production.X
+        # save prices (i.e., dual variables of balance constraints) as a (time,) array
+        self.results.price = self.constraints.balance_constraint.Pi
+
+    def run(self):
+        start = time.perf_counter()
+        self.model.optimize()
+        self.timings.solve = time.perf_counter() - start
+        if self.model.status == GRB.OPTIMAL:
+            self._save_results()
+        else:
+            print(f"optimization of {self.model.ModelName} was not successful")
+
+    def display_results(self):
+        print()
+        print("-------------------   RESULTS  -------------------")
+        print("Optimal energy production cost:")
+        print(self.results.objective_value)
+        print("Optimal generator dispatches:")
+        for i, g in enumerate(self.data.GENERATORS):
+            print(f"{g}: {self.results.generator_production[i]}")
+        print("Prices at optimality:")
+        print(self.results.price)
+
+
+def random_input_data(n_generators: int, seed: int = 0) -> InputData:
+    '''
+        Synthetic fleet with a load of half the total capacity, used for benchmarks
+    '''
+    rng = np.random.default_rng(seed)
+    generators = [f'G{i}' for i in range(1, n_generators + 1)]
+    capacity = rng.uniform(50, 300, n_generators).round()
+    return InputData(
+        GENERATORS=generators,
+        LOADS=['L1'],
+        generator_cost=dict(zip(generators, rng.uniform(0, 200, n_generators).round().tolist())),
+        generator_capacity=dict(zip(generators, capacity.tolist())),
+        load_capacity={'L1': float(capacity.sum() / 2)},
+    )
+
+
+def benchmark_build_time(sizes: tuple = (10, 1_000, 10_000, 100_000)):
+    '''
+        Compare model build time of the loop and the vectorized (matrix API) modes
+    '''
+    print()
+    print("-------------------   BUILD TIME BENCHMARK  -------------------")
+    print(f"{'generators':>12} {'loop [s]':>10} {'vectorized [s]':>15} {'speedup':>8}")
+    # warm-up so that environment start-up is not charged to the first size
+    EconomicDispatch(random_input_data(10), vectorized=True)
+    for n in sizes:
+        input_data = random_input_data(n)
+        timings = []
+        for vectorized in (False, True):
+            start = time.perf_counter()
+            EconomicDispatch(input_data, vectorized=vectorized)
+            timings.append(time.perf_counter() - start)
+        print(f"{n:>12} {timings[0]:>10.4f} {timings[1]:>15.4f} {timings[0] / timings[1]:>7.1f}x")
+
+
+def benchmark_update_latency(n_generators: int = 1_000, n_steps: int = 12, vectorized: bool = True):
+    '''
+        Compare rebuilding the model against in-place update() for a sequence of
+        5-minute dispatch steps with small changes in load and cost
+    '''
+    rng = np.random.default_rng(1)
+    input_data = random_input_data(n_generators)
+    base_load = input_data.load_capacity['L1']
+    steps = [
+        (
+            {'L1': base_load * rng.uniform(0.95, 1.05)},
+            dict(zip(input_data.GENERATORS, (as_array(input_data.generator_cost, input_data.GENERATORS)
+                                             * rng.uniform(0.98, 1.02, n_generators)).tolist())),
+        ) for _ in range(n_steps)
+    ]
+
+    rebuild = {'build': 0.0, 'solve': 0.0, 'iterations': 0}
+    for load_capacity, generator_cost in steps:
+        input_data.load_capacity, input_data.generator_cost = load_capacity, generator_cost
+        ec_model = EconomicDispatch(input_data, vectorized=vectorized)
+        ec_model.run()
+        rebuild['build'] += ec_model.timings.build
+        rebuild['solve'] += ec_model.timings.solve
+        rebuild['iterations'] += ec_model.model.IterCount
+
+    in_place = {'build': 0.0, 'solve': 0.0, 'iterations': 0}
+    ec_model = EconomicDispatch(random_input_data(n_generators), vectorized=vectorized)
+    ec_model.run()
+    for load_capacity, generator_cost in steps:
+        ec_model.update(load_capacity=load_capacity, generator_cost=generator_cost)
+        ec_model.run()
+        in_place['build'] += ec_model.timings.update
+        in_place['solve'] += ec_model.timings.solve
+        in_place['iterations'] += ec_model.model.IterCount
+
+    print()
+    print("-------------------   UPDATE LATENCY BENCHMARK  -------------------")
+    print(f"{n_generators} generators, {n_steps} dispatch steps (averages per step)")
+    print(f"{'mode':>10} {'build/update [ms]':>18} {'solve [ms]':>11} {'simplex its':>12}")
+    for mode, timing in (('rebuild', rebuild), ('in-place', in_place)):
+        print(
+            f"{mode:>10} {1e3 * timing['build'] / n_steps:>18.3f} "
+            f"{1e3 * timing['solve'] / n_steps:>11.3f} {timing['iterations'] / n_steps:>12.1f}"
+        )
+
+
+def random_multi_period_input_data(n_generators: int, n_times: int, seed: int = 0) -> MultiPeriodInputData:
+    '''
+        Synthetic fleet with a daily load profile and noisy costs, used for benchmarks
+    '''
+    rng = np.random.default_rng(seed)
+    generators = [f'G{i}' for i in range(1, n_generators + 1)]
+    capacity = rng.uniform(50, 300, n_generators).round()
+    cost = rng.uniform(0, 200, n_generators)[:, None] * rng.uniform(0.9, 1.1, (n_generators, n_times))
+    load = capacity.sum() * (0.5 + 0.2 * np.sin(2 * np.pi * np.arange(n_times) / 24))
+    return MultiPeriodInputData(
+        GENERATORS=generators,
+        LOADS=['L1'],
+        TIMES=list(range(n_times)),
+        generator_cost=cost,
+        generator_capacity=capacity,
+        load_capacity=load[None, :],
+    )
+
+
+def benchmark_multi_period(n_generators: int = 50, horizons: tuple = (24, 96, 8760)):
+    '''
+        Compare one multi-period model against one single-period model per period
+    '''
+    print()
+    print("-------------------   MULTI-PERIOD BENCHMARK  -------------------")
+    print(f"{n_generators} generators")
+    print(f"{'periods':>8} {'per-period [s]':>15} {'multi-period [s]':>17} {'speedup':>8} {'max price diff':>15}")
+    for n_times in horizons:
+        input_data = random_multi_period_input_data(n_generators, n_times)
+
+        start = time.perf_counter()
+        prices = np.empty(n_times)
+        for t in range(n_times):
+            ec_model = EconomicDispatch(
+                InputData(
+                    GENERATORS=input_data.GENERATORS,
+                    LOADS=input_data.LOADS,
+                    generator_cost=input_data.generator_cost[:, t],
+                    generator_capacity=input_data.generator_capacity,
+                    load_capacity=input_data.load_capacity[:, t],
+                ),
+                vectorized=True,
+            )
+            ec_model.run()
+            prices[t] = ec_model.results.price
+        per_period = time.perf_counter() - start
+
+        start = time.perf_counter()
+        mp_model = MultiPeriodEconomicDispatch(input_data)
+        mp_model.run()
+        multi_period = time.perf_counter() - start
+
+        print(
+            f"{n_times:>8} {per_period:>15.3f} {multi_period:>17.3f} {per_period / multi_period:>7.1f}x "
+            f"{np.abs(prices - mp_model.results.price).max():>15.2e}"
+        )
+
+
+def _read_results_loop(ec_model: EconomicDispatch) -> dict:
+    # the former extraction into dicts, one attribute read per variable and constraint, for the benchmark
+    return {
+        'generator_production': {
+            g: ec_model.variables.generator_production[g].x for g in ec_model.data.GENERATORS
+        },
+        'capacity_sensitivities': {
+            g: ec_model.constraints.capacity_constraints[g].Pi for g in ec_model.data.GENERATORS
+        },
+    }
+
+
+def benchmark_result_extraction(sizes: tuple = (1_000, 100_000, 1_000_000)):
+    '''
+        Time and peak memory of reading the dispatch and capacity sensitivities one object at a time
+        into dicts against the bulk getAttr query into LabeledArray. Times are measured without tracing,
+        as tracemalloc slows down every allocation, and peak memory in a second, traced pass.
+    '''
+    print()
+    print("-------------------   RESULT EXTRACTION BENCHMARK  -------------------")
+    print(f"{'generators':>12} {'loop [s]':>10} {'loop peak [MB]':>15} {'bulk [s]':>10} {'bulk peak [MB]':>15}")
+    for n in sizes:
+        ec_model = EconomicDispatch(random_input_data(n))
+        ec_model.run()
+        row = f"{n:>12}"
+        for extract in (_read_results_loop, lambda model: model._save_results()):
+            start = time.perf_counter()
+            extract(ec_model)
+            elapsed = time.perf_counter() - start
+            tracemalloc.start()
+            extract(ec_model)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            row += f" {elapsed:>10.4f} {peak / 1e6:>15.2f}"
+        print(row)
+        ec_model.model.dispose()
+
+
+def check_backend_parity(input_data: InputData, tolerance: float = 1e-6) -> float:
+    '''
+        Solve with both backends and assert that objective, dispatch, price and capacity
+        sensitivities agree. Returns the largest difference.
+    '''
+    results = []
+    for backend in ('gurobi', 'highs'):
+        ec_model = EconomicDispatch(input_data, vectorized=True, backend=backend)
+        ec_model.run()
+        results.append(ec_model.results)
+    gurobi, highs = results
+    difference = max(
+        abs(gurobi.objective_value - highs.objective_value),
+        abs(gurobi.price - highs.price),
+        *(abs(gurobi.generator_production[g] - highs.generator_production[g]) for g in input_data.GENERATORS),
+        *(abs(gurobi.capacity_sensitivities[g] - highs.capacity_sensitivities[g]) for g in input_data.GENERATORS),
+    )
+    assert difference <= tolerance * max(1, abs(gurobi.objective_value)), f"backends differ by {difference}"
+    return difference
+
+
+def benchmark_backends(sizes: tuple = (100, 1_000, 10_000, 100_000), gurobi_sizes: tuple = (100, 1_000, 10_000, 100_000)):
+    '''
+        Compare build and solve time of the gurobi (vectorized) and HiGHS backends, and their objective and price
+    '''
+    print()
+    print("-------------------   BACKEND BENCHMARK  -------------------")
+    print(f"{'generators':>12} {'gurobi [s]':>11} {'HiGHS [s]':>10} {'objective diff':>15} {'price diff':>11}")
+    for n in sizes:
+        input_data = random_input_data(n)
+        highs = EconomicDispatch(input_data, backend='highs')
+        highs.run()
+        row = f"{n:>12}"
+        if n in gurobi_sizes:
+            gurobi = EconomicDispatch(input_data, vectorized=True)
+            gurobi.run()
+            row += (
+                f" {gurobi.timings.build + gurobi.timings.solve:>11.4f} {highs.timings.build + highs.timings.solve:>10.4f}"
+                f" {abs(gurobi.results.objective_value - highs.results.objective_value):>15.2e}"
+                f" {abs(gurobi.results.price - highs.results.price):>11.2e}"
+            )
+        else:
+            row += f" {'-':>11} {highs.timings.build + highs.timings.solve:>10.4f} {'-':>15} {'-':>11}"
+        print(row)
+
+
+def _startup_probe(mode: str):
+    '''
+        Run in a fresh process by benchmark_startup: start an environment, then build and solve a
+        dispatch and a second one with a changed load. Prints the timings as one line.
+    '''
+    start = time.perf_counter()
+    # 'logging' and 'env per model' start an environment with gurobi's defaults (banner and solver log)
+    env = shared_env() if mode == 'shared' else gp.Env()
+    env_time = time.perf_counter() - start
+    input_data = random_input_data(100)
+    start = time.perf_counter()
+    ec_model = EconomicDispatch(input_data, vectorized=True, env=env)
+    ec_model.run()
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    input_data.load_capacity = {'L1': 0.9 * input_data.load_capacity['L1']}
+    ec_model = EconomicDispatch(input_data, vectorized=True, env=gp.Env() if mode == 'env per model' else env)
+    ec_model.run()
+    second = time.perf_counter() - start
+    print(f"startup-probe {env_time} {first} {second}")
+
+
+def benchmark_startup(repeats: int = 5):
+    '''
+        Latency of a dispatch in a fresh process, as for a command-line call: the whole process, starting
+        the gurobi environment, the first build and solve, and a second dispatch in the same process.
+        Compares the shared silent environment with gurobi's logging defaults and with one environment per model.
+    '''
+    print()
+    print("-------------------   STARTUP LATENCY BENCHMARK  -------------------")
+    print(f"{'mode':>14} {'process [s]':>12} {'env start [ms]':>15} {'first dispatch [ms]':>20} {'second dispatch [ms]':>21}")
+    for mode in ('shared', 'logging', 'env per model'):
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--startup-probe', mode],
+                capture_output=True, text=True, check=True,
+            ).stdout
+            process = time.perf_counter() - start
+            probe = [line for line in output.splitlines() if line.startswith('startup-probe')][-1]
+            timings.append([process, *map(float, probe.split()[1:])])
+        process, env_time, first, second = np.median(timings, axis=0)
+        print(f"{mode:>14} {process:>12.3f} {1e3 * env_time:>15.1f} {1e3 * first:>20.1f} {1e3 * second:>21.1f}")
+
+
 if __name__ == '__main__':
+    if '--startup-probe' in sys.argv:
+        # child process of benchmark_startup
+        _startup_probe(sys.argv[-1])
+        sys.exit()
+
     input_data = InputData(
         GENERATORS = ['G1', 'G2', 'G3'],
         LOADS = ['L1'],
@@ -130,3 +689,16 @@ if __name__ == '__main__':
     ec_model = EconomicDispatch(input_data)
     ec_model.run()
     ec_model.display_results()
+    # same results without a gurobi license
+    ec_model = EconomicDispatch(input_data, backend='highs')
+    ec_model.run()
+    ec_model.display_results()
+    print(f"Largest difference between the gurobi and HiGHS backends: {check_backend_parity(input_data):.2e}")
+
+    if '--benchmark' in sys.argv:
+        benchmark_backends()
+        benchmark_build_time()
+        benchmark_update_latency()
+        benchmark_multi_period()
+        benchmark_result_extraction()
+        benchmark_startup()
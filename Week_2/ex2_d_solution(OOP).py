@@ -2,10 +2,30 @@
 Here, we reuse the OptimizationProblem class from the Gurobi Tutorial. 
 Note that the InputData and OptimizationProblem classes have been modified 
 to allow inputting upper and lower bounds  
+
+The constraint coefficients can also be given as a scipy sparse matrix (COO, CSR, ...) of shape
+constraints x variables, with the right-hand sides, senses, objective coefficients and bounds as
+arrays ordered like VARIABLES. The model is built from the CSR matrix with a single addMConstr
+call, so the build time grows with the number of nonzeros and not with constraints x variables.
+
+dualize writes the LP dual of an InputData as another InputData, so the dual of the economic
+dispatch below (ex2_b) no longer has to be written by hand. OptimizationProblem(form='dual')
+solves the dual and maps its solution back, form='auto' picks the form predicted to be cheaper.
 '''
 
+import os
+import sys
+import time
+
 import gurobipy as gp
 from gurobipy import GRB
+import numpy as np
+from scipy.optimize import linprog
+import scipy.sparse as sp
+
+# shared helpers in common.py at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import LabeledArray, as_array, shared_env
 
 
 class Expando(object):
@@ -15,16 +35,24 @@ class Expando(object):
     pass
 
 
+class ProblemResults:
+    '''
+        Results of OptimizationProblem, variable values keyed by name and duals in constraint order
+    '''
+    __slots__ = ('objective_value', 'variables', 'duals')
+
+
 class InputData:
     def __init__(
         self,
         VARIABLES: list,
         objective_coeff: dict[str, int],    # Coefficients in objective function
-        constraints_coeff: dict[str, int],  # Linear coefficients of constraints
+        constraints_coeff: dict[str, int],  # Linear coefficients of constraints (per-variable lists or a sparse matrix)
         constraints_rhs: dict[str, int],    # Right hand side coefficients of constraints
         constraints_sense: dict[str, int],  # Direction of constraints
         lower_bounds: dict[str, int],       # Lower bounds for variables 
         upper_bounds: dict[str, int],       # Upper bounds for variables
+        objective_sense: int = GRB.MAXIMIZE, # Direction of optimization
     ):
         self.VARIABLES = VARIABLES
         self.objective_coeff = objective_coeff
@@ -33,51 +61,243 @@ class InputData:
         self.constraints_sense = constraints_sense
         self.lower_bounds = lower_bounds
         self.upper_bounds = upper_bounds
+        self.objective_sense = objective_sense
+
+
+def constraint_matrix(input_data: InputData) -> sp.csr_matrix:
+    '''
+        Constraint coefficients as a CSR matrix of shape constraints x variables. Sparse input is
+        converted (duplicate COO entries are summed), per-variable coefficient lists are stacked.
+    '''
+    if sp.issparse(input_data.constraints_coeff):
+        A = sp.csr_matrix(input_data.constraints_coeff, dtype=float)
+    else:
+        A = sp.csr_matrix(np.array([input_data.constraints_coeff[v] for v in input_data.VARIABLES], dtype=float).T)
+    if A.shape != (len(input_data.constraints_rhs), len(input_data.VARIABLES)):
+        raise ValueError(
+            f"constraint matrix of shape {A.shape} does not match {len(input_data.constraints_rhs)} constraints "
+            f"and {len(input_data.VARIABLES)} variables"
+        )
+    return A
+
+
+def dualize(input_data: InputData) -> tuple[InputData, Expando]:
+    '''
+        LP dual of max (or min) c^T x subject to A x (sense) b and l <= x <= u, with one dual variable y
+        per constraint and one per finite nonzero bound, and one constraint A_j^T y + z_j (sense) c_j per
+        primal variable. For a maximization, y >= 0 on <= rows and y <= 0 on >= rows, the upper bound
+        duals are >= 0 and the lower bound duals <= 0 (signs reversed for a minimization). Zero bounds
+        need no dual variable and make the constraint of their variable an inequality, free variables
+        give equalities, and variables fixed at zero give no constraint.
+        The optimal y are gurobi's Pi of the primal constraints, and the Pi of the dual constraints are
+        the primal values. Returns the dual as an InputData and a map with the number of primal
+        constraints (the first dual variables) and the primal variables with a dual constraint.
+    '''
+    variables = input_data.VARIABLES
+    A = constraint_matrix(input_data)
+    n_constraints, n_variables = A.shape
+    c = as_array(input_data.objective_coeff, variables)
+    b = np.asarray(input_data.constraints_rhs, dtype=float)
+    sense = np.asarray(input_data.constraints_sense, dtype=str)
+    lower_bounds = as_array(input_data.lower_bounds, variables)
+    upper_bounds = as_array(input_data.upper_bounds, variables)
+    finite_lower = lower_bounds > -GRB.INFINITY
+    finite_upper = upper_bounds < GRB.INFINITY
+    # +1 when the primal is a maximization: the dual is a minimization with the signs above
+    sign = 1.0 if input_data.objective_sense == GRB.MAXIMIZE else -1.0
+
+    y_lower = np.where(sense == GRB.LESS_EQUAL, 0, -np.inf)
+    y_upper = np.where(sense == GRB.GREATER_EQUAL, 0, np.inf)
+    upper = np.flatnonzero(finite_upper & (upper_bounds != 0))
+    lower = np.flatnonzero(finite_lower & (lower_bounds != 0))
+    bound_columns = sp.csr_matrix(
+        (np.ones(len(upper) + len(lower)), (np.concatenate([upper, lower]), np.arange(len(upper) + len(lower)))),
+        shape=(n_variables, len(upper) + len(lower)),
+    )
+    # sense of every dual constraint, before dropping the variables fixed at zero
+    zero_lower, zero_upper = lower_bounds == 0, upper_bounds == 0
+    dual_sense = np.full(n_variables, GRB.EQUAL)
+    dual_sense[zero_lower] = GRB.GREATER_EQUAL if sign > 0 else GRB.LESS_EQUAL
+    dual_sense[zero_upper] = GRB.LESS_EQUAL if sign > 0 else GRB.GREATER_EQUAL
+    columns = np.flatnonzero(~(zero_lower & zero_upper))
+
+    dual_lower = np.concatenate([y_lower, np.zeros(len(upper)), np.full(len(lower), -np.inf)])
+    dual_upper = np.concatenate([y_upper, np.full(len(upper), np.inf), np.zeros(len(lower))])
+    if sign < 0:
+        dual_lower, dual_upper = -dual_upper, -dual_lower
+    dual_map = Expando()
+    dual_map.n_constraints = n_constraints
+    dual_map.columns = columns
+    dual_data = InputData(
+        VARIABLES=(
+            [f'y{i}' for i in range(n_constraints)]
+            + [f'upper {variables[j]}' for j in upper] + [f'lower {variables[j]}' for j in lower]
+        ),
+        objective_coeff=np.concatenate([b, upper_bounds[upper], lower_bounds[lower]]),
+        constraints_coeff=sp.hstack([A.T.tocsr(), bound_columns], format='csr')[columns],
+        constraints_rhs=c[columns],
+        constraints_sense=dual_sense[columns],
+        lower_bounds=dual_lower,
+        upper_bounds=dual_upper,
+        objective_sense=GRB.MINIMIZE if sign > 0 else GRB.MAXIMIZE,
+    )
+    return dual_data, dual_map
+
+
+def cheaper_form(input_data: InputData, ratio: float = 2.0) -> str:
+    '''
+        'dual' when the dual is predicted to solve at least ratio times faster, else 'primal'. The simplex
+        work is estimated as rows x nonzeros (about one iteration per row, each touching the nonzeros):
+        the dual has a row per primal variable and a singleton column per finite nonzero bound.
+    '''
+    A = constraint_matrix(input_data)
+    lower_bounds = as_array(input_data.lower_bounds, input_data.VARIABLES)
+    upper_bounds = as_array(input_data.upper_bounds, input_data.VARIABLES)
+    n_bound_duals = (
+        np.count_nonzero((lower_bounds > -GRB.INFINITY) & (lower_bounds != 0))
+        + np.count_nonzero((upper_bounds < GRB.INFINITY) & (upper_bounds != 0))
+    )
+    n_dual_rows = np.count_nonzero((lower_bounds != 0) | (upper_bounds != 0))
+    primal_work = A.shape[0] * A.nnz
+    dual_work = n_dual_rows * (A.nnz + n_bound_duals)
+    return 'dual' if ratio * dual_work < primal_work else 'primal'
 
 
 class OptimizationProblem():
+    '''
+        LP, a maximization unless InputData.objective_sense is GRB.MINIMIZE. backend='gurobi' builds and
+        solves a gurobi model, backend='highs' solves the same LP from sparse matrices with HiGHS
+        (scipy.optimize.linprog), which needs no gurobi license. Both report the duals with gurobi's
+        sign convention. form='dual' solves the dual (see dualize) and reports the primal solution,
+        form='auto' solves the form chosen by cheaper_form.
+    '''
 
-    def __init__(self, input_data: InputData): # initialize class
+    def __init__(
+        self, input_data: InputData, backend: str = 'gurobi', env: gp.Env = None, form: str = 'primal'
+    ): # initialize class
+        if backend not in ('gurobi', 'highs'):
+            raise ValueError(f"unknown backend {backend}")
+        if form not in ('primal', 'dual', 'auto'):
+            raise ValueError(f"unknown form {form}")
         self.data = input_data # define data attributes
-        self.results = Expando() # define results attributes
-        self._build_model() # build gurobi model
+        self.backend = backend
+        self.env = env # gurobi environment of the model (None for the shared one of this process)
+        self.results = ProblemResults() # define results attributes
+        self.timings = Expando() # define latency attributes (seconds)
+        start = time.perf_counter()
+        self.form = cheaper_form(input_data) if form == 'auto' else form
+        if self.form == 'dual':
+            # the dual is solved as its own problem, its model is exposed as this problem's model
+            dual_data, self.dual_map = dualize(input_data)
+            self.dual = OptimizationProblem(dual_data, backend=backend, env=env)
+            if backend == 'gurobi':
+                self.model = self.dual.model
+        else:
+            self._build_matrices() # build LP matrices, shared by both backends
+            if backend == 'gurobi':
+                self._build_model() # build gurobi model
+        self.timings.build = time.perf_counter() - start
     
     def _build_variables(self):
-        self.variables = {
-            v: self.model.addVar(
-                lb=self.data.lower_bounds[v], 
-                ub=self.data.upper_bounds[v], 
-                name=f'Total {v}'.format(v),
-            ) for v in self.data.VARIABLES
-        }
+        self.variables = self.model.addMVar(
+            len(self.data.VARIABLES),
+            lb=self.matrices.lower_bounds,
+            ub=self.matrices.upper_bounds,
+            name=[f'Total {v}' for v in self.data.VARIABLES],
+        )
     
     def _build_constraints(self):
-        self.constraints = [
-            self.model.addConstr(
-                gp.quicksum(self.data.constraints_coeff[v][i] * self.variables[v] for v in self.data.VARIABLES),
-                self.data.constraints_sense[i],
-                self.data.constraints_rhs[i],
-            ) for i in range(len(self.data.constraints_rhs))
-        ]
+        # one call for all rows, from the nonzeros of the CSR matrix
+        self.constraints = self.model.addMConstr(self.matrices.A, self.variables, self.matrices.sense, self.matrices.rhs)
 
     def _build_objective_function(self):
-        objective = gp.quicksum(self.data.objective_coeff[v] * self.variables[v] for v in self.data.VARIABLES)
-        self.model.setObjective(objective, GRB.MAXIMIZE) 
+        self.model.setObjective(self.matrices.c @ self.variables, self.data.objective_sense)
 
     def _build_model(self):
-        self.model = gp.Model(name='Economic dispatch dual')
+        self.model = gp.Model(name='Economic dispatch dual', env=shared_env(self.env))
         self._build_variables()
         self._build_objective_function()
         self._build_constraints()
         self.model.update()
     
+    def _build_matrices(self):
+        # max c^T x subject to A x (sense) b and lb <= x <= ub, with gurobi's infinite bounds as np.inf
+        variables = self.data.VARIABLES
+        self.matrices = Expando()
+        self.matrices.c = as_array(self.data.objective_coeff, variables)
+        self.matrices.A = constraint_matrix(self.data)
+        self.matrices.sense = np.asarray(self.data.constraints_sense, dtype=str)
+        self.matrices.rhs = np.asarray(self.data.constraints_rhs, dtype=float)
+        lower_bounds = as_array(self.data.lower_bounds, variables)
+        upper_bounds = as_array(self.data.upper_bounds, variables)
+        self.matrices.lower_bounds = np.where(lower_bounds <= -GRB.INFINITY, -np.inf, lower_bounds)
+        self.matrices.upper_bounds = np.where(upper_bounds >= GRB.INFINITY, np.inf, upper_bounds)
+
+    def _solve_highs(self):
+        '''
+            Solve min c^T x (min -c^T x for a maximization) with >= rows negated into A_ub, and map the
+            HiGHS marginals (sensitivities of the minimized objective) back to gurobi's Pi
+        '''
+        matrices = self.matrices
+        sign = -1.0 if self.data.objective_sense == GRB.MAXIMIZE else 1.0
+        less, greater, equal = (matrices.sense == sense for sense in (GRB.LESS_EQUAL, GRB.GREATER_EQUAL, GRB.EQUAL))
+        A_ub = sp.vstack([matrices.A[less], -matrices.A[greater]], format='csr')
+        b_ub = np.concatenate([matrices.rhs[less], -matrices.rhs[greater]])
+        solution = linprog(
+            sign * matrices.c,
+            A_ub=A_ub if A_ub.shape[0] else None,
+            b_ub=b_ub if A_ub.shape[0] else None,
+            A_eq=matrices.A[equal] if equal.any() else None,
+            b_eq=matrices.rhs[equal] if equal.any() else None,
+            bounds=np.column_stack([matrices.lower_bounds, matrices.upper_bounds]),
+            method='highs',
+        )
+        if solution.status != 0:
+            return solution, None
+        duals = np.zeros(len(matrices.rhs))
+        n_less = int(less.sum())
+        duals[less] = sign * solution.ineqlin.marginals[:n_less]
+        duals[greater] = -sign * solution.ineqlin.marginals[n_less:]
+        if equal.any():
+            duals[equal] = sign * solution.eqlin.marginals
+        return solution, duals
+
+    def _save_results_highs(self, solution, duals: np.ndarray):
+        self.results.objective_value = solution.fun if self.data.objective_sense == GRB.MINIMIZE else -solution.fun
+        self.results.variables = LabeledArray(solution.x, self.data.VARIABLES)
+        self.results.duals = duals
+
     def _save_results(self):
         self.results.objective_value = self.model.ObjVal
-        self.results.variables = {v: self.variables[v].X for v in self.data.VARIABLES}
-        self.results.duals = [self.constraints[i].Pi for i in range(len(self.constraints))]
+        self.results.variables = LabeledArray(self.variables.X, self.data.VARIABLES)
+        self.results.duals = self.constraints.Pi
+
+    def _save_results_dual(self):
+        # primal values are the duals of the dual constraints, primal duals the values of the first dual variables
+        self.results.objective_value = self.dual.results.objective_value
+        values = np.zeros(len(self.data.VARIABLES))
+        values[self.dual_map.columns] = self.dual.results.duals
+        self.results.variables = LabeledArray(values, self.data.VARIABLES)
+        self.results.duals = self.dual.results.variables.array[:self.dual_map.n_constraints]
 
     def run(self):
+        start = time.perf_counter()
+        if self.form == 'dual':
+            self.dual.run()
+            self.timings.solve = time.perf_counter() - start
+            if hasattr(self.dual.results, 'objective_value'):
+                self._save_results_dual()
+            return
+        if self.backend == 'highs':
+            solution, duals = self._solve_highs()
+            self.timings.solve = time.perf_counter() - start
+            if solution.status == 0:
+                self._save_results_highs(solution, duals)
+            else:
+                print(f"Optimization with HiGHS was not successful ({solution.message})")
+            return
         self.model.optimize()
+        self.timings.solve = time.perf_counter() - start
         if self.model.status == GRB.OPTIMAL:
             self._save_results()
         else:
@@ -91,7 +311,170 @@ class OptimizationProblem():
         print("Optimal variable values:")
         print(self.results.variables)
         print("Optimal dual values:")
-        print(self.results.duals)
+        print(self.results.duals.tolist())
+
+
+def check_backend_parity(input_data: InputData, tolerance: float = 1e-6) -> float:
+    '''
+        Solve with both backends and assert that objective, variables and duals agree.
+        Returns the largest difference.
+    '''
+    results = []
+    for backend in ('gurobi', 'highs'):
+        problem = OptimizationProblem(input_data, backend=backend)
+        problem.run()
+        results.append(problem.results)
+    gurobi, highs = results
+    difference = max(
+        abs(gurobi.objective_value - highs.objective_value),
+        *(abs(gurobi.variables[v] - highs.variables[v]) for v in input_data.VARIABLES),
+        *(abs(a - b) for a, b in zip(gurobi.duals, highs.duals)),
+    )
+    assert difference <= tolerance * max(1, abs(gurobi.objective_value)), f"backends differ by {difference}"
+    return difference
+
+
+def random_input_data(
+    n_variables: int, n_constraints: int, density: float = 0.1, seed: int = 0, sparse: bool = False
+) -> InputData:
+    '''
+        Bounded packing LP (max c^T x, A x <= b, 0 <= x <= 10, A >= 0) with mixed senses, used for benchmarks.
+        sparse=True keeps A as a COO matrix and every other field as an array.
+    '''
+    rng = np.random.default_rng(seed)
+    variables = [f'x{i}' for i in range(n_variables)]
+    nnz = int(round(density * n_variables * n_constraints))
+    coefficients = sp.coo_matrix(
+        (rng.random(nnz), (rng.integers(n_constraints, size=nnz), rng.integers(n_variables, size=nnz))),
+        shape=(n_constraints, n_variables),
+    )
+    rhs = np.asarray(coefficients.sum(axis=1)).ravel() * rng.uniform(1, 5, n_constraints)
+    # a few >= rows with a small right-hand side keep both senses in the benchmark
+    senses = np.where(rng.random(n_constraints) < 0.1, GRB.GREATER_EQUAL, GRB.LESS_EQUAL)
+    rhs = np.where(senses == GRB.GREATER_EQUAL, 0.1 * rhs, rhs)
+    objective = rng.uniform(1, 10, n_variables)
+    if sparse:
+        return InputData(
+            VARIABLES=variables,
+            objective_coeff=objective,
+            constraints_coeff=coefficients,
+            constraints_rhs=rhs,
+            constraints_sense=senses,
+            lower_bounds=np.zeros(n_variables),
+            upper_bounds=np.full(n_variables, 10.0),
+        )
+    coefficients = coefficients.toarray()
+    return InputData(
+        VARIABLES=variables,
+        objective_coeff=dict(zip(variables, objective.tolist())),
+        constraints_coeff={v: coefficients[:, i].tolist() for i, v in enumerate(variables)},
+        constraints_rhs=rhs.tolist(),
+        constraints_sense=senses.tolist(),
+        lower_bounds={v: 0 for v in variables},
+        upper_bounds={v: 10 for v in variables},
+    )
+
+
+def _build_model_quicksum(input_data: InputData, env: gp.Env = None) -> gp.Model:
+    # the former build, one quicksum over every variable per constraint, for the benchmark
+    model = gp.Model(name='Economic dispatch dual', env=shared_env(env))
+    variables = {
+        v: model.addVar(lb=input_data.lower_bounds[v], ub=input_data.upper_bounds[v], name=f'Total {v}')
+        for v in input_data.VARIABLES
+    }
+    model.setObjective(
+        gp.quicksum(input_data.objective_coeff[v] * variables[v] for v in input_data.VARIABLES), GRB.MAXIMIZE
+    )
+    for i in range(len(input_data.constraints_rhs)):
+        model.addLConstr(
+            gp.quicksum(input_data.constraints_coeff[v][i] * variables[v] for v in input_data.VARIABLES),
+            input_data.constraints_sense[i],
+            input_data.constraints_rhs[i],
+        )
+    model.update()
+    return model
+
+
+def benchmark_forms(
+    shapes: tuple = ((200, 20_000), (20_000, 200), (2_000, 2_000)), density: float = 0.02, backend: str = 'highs'
+):
+    '''
+        Solve time of the primal and of the dual form on wide, tall and square random LPs, the form picked
+        by form='auto', and the difference of the objectives. The default HiGHS backend avoids the size
+        limits of a restricted gurobi license.
+    '''
+    print()
+    print(f"-------------------   PRIMAL / DUAL BENCHMARK ({backend})  -------------------")
+    print(f"{'variables':>10} {'constraints':>12} {'primal [s]':>11} {'dual [s]':>9} {'auto':>7} {'objective diff':>15}")
+    for n_variables, n_constraints in shapes:
+        input_data = random_input_data(n_variables, n_constraints, density, sparse=True)
+        timings, objectives = [], []
+        for form in ('primal', 'dual'):
+            problem = OptimizationProblem(input_data, backend=backend, form=form)
+            problem.run()
+            timings.append(problem.timings.build + problem.timings.solve)
+            objectives.append(problem.results.objective_value)
+        print(
+            f"{n_variables:>10} {n_constraints:>12} {timings[0]:>11.3f} {timings[1]:>9.3f} "
+            f"{cheaper_form(input_data):>7} {abs(objectives[0] - objectives[1]):>15.2e}"
+        )
+
+
+def benchmark_build(
+    shapes: tuple = ((1_000, 500), (10_000, 5_000), (100_000, 50_000)),
+    nonzeros: tuple = (10_000, 100_000, 1_000_000),
+    quicksum_max_cells: int = 500_000,
+):
+    '''
+        Build time of the sparse bulk build for every shape and number of nonzeros (one model per pair,
+        so the table shows the time following the nonzeros at any shape), against the former quicksum
+        build from per-variable lists where constraints x variables is small enough
+    '''
+    print()
+    print("-------------------   SPARSE BUILD BENCHMARK  -------------------")
+    print(f"{'variables':>10} {'constraints':>12} {'nonzeros':>10} {'bulk build [s]':>15} {'quicksum build [s]':>19}")
+    for n_variables, n_constraints in shapes:
+        for n_nonzeros in nonzeros:
+            density = n_nonzeros / (n_variables * n_constraints)
+            if density > 0.5:
+                continue
+            problem = OptimizationProblem(
+                random_input_data(n_variables, n_constraints, density, sparse=True)
+            )
+            row = (
+                f"{n_variables:>10} {n_constraints:>12} {problem.model.NumNZs:>10} {problem.timings.build:>15.3f}"
+            )
+            problem.model.dispose()
+            if n_variables * n_constraints <= quicksum_max_cells:
+                input_data = random_input_data(n_variables, n_constraints, density)
+                start = time.perf_counter()
+                _build_model_quicksum(input_data).dispose()
+                row += f" {time.perf_counter() - start:>19.3f}"
+            else:
+                row += f" {'-':>19}"
+            print(row)
+
+
+def benchmark_backends(sizes: tuple = ((100, 50), (1_000, 500), (5_000, 2_000)), density: float = 0.05):
+    '''
+        Compare build and solve time of the gurobi and HiGHS backends on random LPs, and their objectives
+    '''
+    print()
+    print("-------------------   BACKEND BENCHMARK  -------------------")
+    print(f"{'variables':>10} {'constraints':>12} {'gurobi [s]':>11} {'HiGHS [s]':>10} {'objective diff':>15}")
+    for n_variables, n_constraints in sizes:
+        input_data = random_input_data(n_variables, n_constraints, density)
+        timings, objectives = [], []
+        for backend in ('gurobi', 'highs'):
+            start = time.perf_counter()
+            problem = OptimizationProblem(input_data, backend=backend)
+            problem.run()
+            timings.append(time.perf_counter() - start)
+            objectives.append(problem.results.objective_value)
+        print(
+            f"{n_variables:>10} {n_constraints:>12} {timings[0]:>11.4f} {timings[1]:>10.4f} "
+            f"{abs(objectives[0] - objectives[1]):>15.2e}"
+        )
 
 
 if __name__ == '__main__':
@@ -107,3 +490,19 @@ if __name__ == '__main__':
     problem = OptimizationProblem(input_data)
     problem.run()
     problem.display_results()
+    # same results without a gurobi license
+    problem = OptimizationProblem(input_data, backend='highs')
+    problem.run()
+    problem.display_results()
+    print(f"Largest difference between the gurobi and HiGHS backends: {check_backend_parity(input_data):.2e}")
+    # the dual of this problem is the economic dispatch of ex2_b, solving it gives the same results
+    dual_data, _ = dualize(input_data)
+    print("Dual problem: minimize", dict(zip(dual_data.VARIABLES, dual_data.objective_coeff.tolist())))
+    problem = OptimizationProblem(input_data, form='dual')
+    problem.run()
+    problem.display_results()
+
+    if '--benchmark' in sys.argv:
+        benchmark_backends()
+        benchmark_build()
+        benchmark_forms()
@@ -0,0 +1,748 @@
+'''
+DC optimal power flow of Exercise 3 for networks of any size. The bus, line and generator
+tables are turned into sparse incidence matrices, so that the nodal balance and the line
+flows are built with a few matrix constraints instead of one named constraint per bus and line.
+'''
+
+from concurrent.futures import ProcessPoolExecutor
+import os
+import sys
+import time
+
+import gurobipy as gp
+from gurobipy import GRB
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+
+# shared helpers in common.py at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import as_array, shared_env
+
+
+class Expando(object):
+    '''
+        A small class which can have attributes set
+    '''
+    pass
+
+
+class InputData:
+
+    def __init__(
+        self,
+        BUSES: list,
+        LINES: list,
+        GENERATORS: list,
+        LOADS: list,
+        line_from: dict[str, str],
+        line_to: dict[str, str],
+        line_reactance: dict[str, float],
+        line_capacity: dict[str, float],
+        generator_bus: dict[str, str],
+        generator_cost: dict[str, float],
+        generator_capacity: dict[str, float],
+        load_bus: dict[str, str],
+        load_capacity: dict[str, float],
+        reference_bus: str = None,
+    ):
+        # List of buses
+        self.BUSES = BUSES
+        # List of lines
+        self.LINES = LINES
+        # List of generators
+        self.GENERATORS = GENERATORS
+        # List of loads
+        self.LOADS = LOADS
+        # Sending and receiving bus of every line, flows are positive from line_from to line_to
+        self.line_from = line_from
+        self.line_to = line_to
+        # Lines reactance (x_l)
+        self.line_reactance = line_reactance
+        # Lines capacity (F_l), np.inf for an unlimited line
+        self.line_capacity = line_capacity
+        # Bus of every generator
+        self.generator_bus = generator_bus
+        # Generators costs (c^G_i)
+        self.generator_cost = generator_cost
+        # Generators capacity (P^G_i)
+        self.generator_capacity = generator_capacity
+        # Bus of every load
+        self.load_bus = load_bus
+        # Loads capacity (P^D_j)
+        self.load_capacity = load_capacity
+        # Bus whose voltage angle is fixed to zero
+        self.reference_bus = BUSES[0] if reference_bus is None else reference_bus
+
+
+def as_indices(values, keys: list, index: dict) -> np.ndarray:
+    '''
+        Return the position in index of the values of a dict (or an array of positions ordered like keys)
+    '''
+    if isinstance(values, np.ndarray):
+        return values.astype(int, copy=False)
+    return np.fromiter((index[values[k]] for k in keys), dtype=int, count=len(keys))
+
+
+class Network:
+    '''
+        Sparse network matrices of the DC power flow:
+        incidence A (lines x buses), line susceptance matrix B_line = diag(1/x) A,
+        bus susceptance matrix B_bus = A^T diag(1/x) A, and the bus incidence of generators and loads.
+        The reduced B_bus (reference bus removed) is factorized once, which gives
+        flows of any injection and rows of the PTDF matrix without forming its inverse.
+    '''
+
+    def __init__(self, input_data: InputData):
+        data = input_data
+        bus_index = {b: n for n, b in enumerate(data.BUSES)}
+        self.n_buses, self.n_lines = len(data.BUSES), len(data.LINES)
+        self.reference = bus_index[data.reference_bus]
+        self.line_from = as_indices(data.line_from, data.LINES, bus_index)
+        self.line_to = as_indices(data.line_to, data.LINES, bus_index)
+        self.susceptance = 1 / as_array(data.line_reactance, data.LINES)
+        self.line_capacity = as_array(data.line_capacity, data.LINES)
+        lines = np.arange(self.n_lines)
+        self.incidence = sp.csr_matrix(
+            (np.r_[np.ones(self.n_lines), -np.ones(self.n_lines)], (np.r_[lines, lines], np.r_[self.line_from, self.line_to])),
+            shape=(self.n_lines, self.n_buses),
+        )
+        self.B_line = sp.diags(self.susceptance) @ self.incidence
+        self.B_bus = (self.incidence.T @ self.B_line).tocsc()
+        self.generator_incidence = sp.csr_matrix(
+            (
+                np.ones(len(data.GENERATORS)),
+                (as_indices(data.generator_bus, data.GENERATORS, bus_index), np.arange(len(data.GENERATORS))),
+            ),
+            shape=(self.n_buses, len(data.GENERATORS)),
+        )
+        # nodal demand (P^D_n)
+        self.demand = np.bincount(
+            as_indices(data.load_bus, data.LOADS, bus_index),
+            weights=as_array(data.load_capacity, data.LOADS),
+            minlength=self.n_buses,
+        )
+        self.non_reference = np.flatnonzero(np.arange(self.n_buses) != self.reference)
+        self._factor = None
+
+    @property
+    def factor(self):
+        if self._factor is None:
+            reduced = self.B_bus[self.non_reference][:, self.non_reference]
+            try:
+                self._factor = spla.splu(reduced.tocsc())
+            except RuntimeError as error:
+                raise RuntimeError("the network is not connected") from error
+        return self._factor
+
+    def angles(self, injections: np.ndarray) -> np.ndarray:
+        '''
+            Voltage angles of a nodal injection vector (or a (buses, k) array of them)
+        '''
+        theta = np.zeros(injections.shape)
+        theta[self.non_reference] = self.factor.solve(np.ascontiguousarray(injections[self.non_reference]))
+        return theta
+
+    def flows(self, injections: np.ndarray) -> np.ndarray:
+        '''
+            Line flows of a balanced nodal injection vector (or a (buses, k) array of them)
+        '''
+        return self.B_line @ self.angles(injections)
+
+    def ptdf(self, lines: np.ndarray = None) -> np.ndarray:
+        '''
+            Rows of the power transfer distribution factor matrix (lines x buses) for the given lines,
+            with the reference bus as slack
+        '''
+        return self.distribution_factors(self.B_line if lines is None else self.B_line[lines])
+
+    def distribution_factors(self, B_rows: sp.spmatrix) -> np.ndarray:
+        '''
+            Sensitivity to the nodal injections of flows given as B_rows @ theta (rows x buses).
+            B_bus is symmetric, so the rows are B_bus^-1 B_rows^T.
+        '''
+        return self.angles(B_rows.T.toarray()).T
+
+    def outage_factors(self, outages: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        '''
+            Line outage distribution factors (lines x outages): the change in the flow of every line
+            per MW flowing on the outaged line before its outage, so that post-contingency flows are
+            flow + LODF * flow[outages]. Also returns a mask of the outages that island the network,
+            whose columns are not meaningful.
+        '''
+        columns = np.arange(len(outages))
+        # flows of a 1 MW transfer between the ends of every outaged line
+        transfer = np.zeros((self.n_buses, len(outages)))
+        transfer[self.line_from[outages], columns] = 1
+        transfer[self.line_to[outages], columns] -= 1
+        phi = self.flows(transfer)
+        denominator = 1 - phi[outages, columns]
+        islanding = np.abs(denominator) < 1e-8
+        lodf = phi / np.where(islanding, 1, denominator)
+        lodf[outages, columns] = -1
+        return lodf, islanding
+
+    def __getstate__(self):
+        # the sparse LU factorization cannot be pickled, workers factorize again
+        return {**self.__dict__, '_factor': None}
+
+
+def screen_outages(
+    network: Network, flows: np.ndarray, outages: np.ndarray, rating: np.ndarray, tolerance: float = 1e-6
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    '''
+        Post-contingency flows of every line for every outage in one vectorized pass. For every line,
+        returns its worst overload above rating, the outage causing it (-1 without overload), and
+        the islanding outages that were skipped.
+    '''
+    lodf, islanding = network.outage_factors(outages)
+    post_contingency = flows[:, None] + lodf * flows[outages][None, :]
+    overload = np.abs(post_contingency) - rating[:, None]
+    overload[:, islanding] = -np.inf
+    overload[outages, np.arange(len(outages))] = -np.inf
+    worst = np.argmax(overload, axis=1) if len(outages) else np.zeros(len(flows), dtype=int)
+    worst_overload = overload[np.arange(len(flows)), worst] if len(outages) else np.full(len(flows), -np.inf)
+    violated = worst_overload > tolerance * np.maximum(1, rating)
+    return np.where(violated, worst_overload, 0), np.where(violated, outages[worst], -1), outages[islanding]
+
+
+_screening_network = None
+
+
+def _init_screening_worker(network: Network):
+    global _screening_network
+    _screening_network = network
+
+
+def _screen_outages_chunk(args: tuple) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    flows, outages, rating, tolerance = args
+    return screen_outages(_screening_network, flows, outages, rating, tolerance)
+
+
+def screen_contingencies(
+    network: Network,
+    flows: np.ndarray,
+    outages: np.ndarray = None,
+    contingency_rating: float = 1.0,
+    chunk_size: int = 500,
+    processes: int = 1,
+    tolerance: float = 1e-6,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    '''
+        N-1 screening of the base-case flows against contingency_rating times the line capacities,
+        with LODFs computed from the factorized B_bus for chunk_size outages at a time, so that the
+        full lines x lines LODF matrix is never formed. Chunks are screened by a pool of processes
+        when processes > 1. Returns, for every line, its worst overload and the outage causing it
+        (-1 without overload), and the outages that island the network.
+    '''
+    if outages is None:
+        outages = np.arange(network.n_lines)
+    rating = contingency_rating * network.line_capacity
+    chunks = [outages[i:i + chunk_size] for i in range(0, len(outages), chunk_size)]
+    if processes > 1:
+        with ProcessPoolExecutor(processes, initializer=_init_screening_worker, initargs=(network,)) as pool:
+            parts = list(pool.map(_screen_outages_chunk, [(flows, chunk, rating, tolerance) for chunk in chunks]))
+    else:
+        parts = [screen_outages(network, flows, chunk, rating, tolerance) for chunk in chunks]
+    overload = np.zeros(network.n_lines)
+    outage = np.full(network.n_lines, -1)
+    for chunk_overload, chunk_outage, _ in parts:
+        worse = chunk_overload > overload
+        overload[worse], outage[worse] = chunk_overload[worse], chunk_outage[worse]
+    islanding = np.concatenate([part[2] for part in parts]) if parts else np.empty(0, dtype=int)
+    return overload, outage, islanding
+
+
+class DCOptimalPowerFlow():
+    '''
+        formulation='angle' keeps the voltage angles as variables, with one sparse nodal balance
+        per bus (whose duals are the LMPs) and line limits on B_line theta.
+        formulation='ptdf' eliminates the angles: one system balance, and line limits on
+        PTDF (C_G p - P^D), whose duals are added to the system price to give the LMPs.
+
+        lazy_line_limits=True starts without line limits, and run() adds the limits of the lines
+        whose flows exceed their capacity and re-solves (warm-started from the previous basis)
+        until no limit is violated.
+    '''
+
+    def __init__(
+        self, input_data: InputData, formulation: str = 'angle', env: gp.Env = None, lazy_line_limits: bool = False
+    ):
+        if formulation not in ('angle', 'ptdf'):
+            raise ValueError(f"unknown formulation {formulation}")
+        self.data = input_data # define data attributes
+        self.formulation = formulation
+        self.env = env
+        self.lazy_line_limits = lazy_line_limits
+        self.network = Network(input_data) # sparse network matrices
+        self.variables = Expando() # define variable attributes
+        self.constraints = Expando() # define constraints attributes
+        self.results = Expando() # define results attributes
+        self.timings = Expando() # define latency attributes (seconds)
+        self._build_model() # build gurobi model
+
+    def _build_variables(self):
+        # build generator production variables, bounded by capacity (P^G_i), objective coefficients (c^G_i) included
+        self.variables.generator_production = self.model.addMVar(
+            len(self.data.GENERATORS),
+            lb=0,
+            ub=as_array(self.data.generator_capacity, self.data.GENERATORS),
+            obj=as_array(self.data.generator_cost, self.data.GENERATORS),
+            name='Electricity production',
+        )
+        if self.formulation == 'angle':
+            # build voltage angle variables, the reference angle is fixed to zero
+            lb = np.full(self.network.n_buses, -np.inf)
+            ub = np.full(self.network.n_buses, np.inf)
+            lb[self.network.reference] = ub[self.network.reference] = 0
+            self.variables.voltage_angle = self.model.addMVar(self.network.n_buses, lb=lb, ub=ub, name='Voltage angle')
+
+    def _build_constraints(self):
+        network = self.network
+        if self.formulation == 'angle':
+            # build nodal balance constraints: C_G p - B_bus theta = P^D
+            self.constraints.balance_constraint = self.model.addConstr(
+                network.generator_incidence @ self.variables.generator_production
+                - network.B_bus @ self.variables.voltage_angle == network.demand,
+                name='Nodal balance',
+            )
+        else:
+            # build system balance constraint
+            self.constraints.balance_constraint = self.model.addConstr(
+                self.variables.generator_production.sum() == network.demand.sum(), name='System balance'
+            )
+        # build line limit constraints in both directions, or none yet when they are added lazily
+        self.constraints.line_limits = []
+        self.constraints.contingency_limits = []
+        self.monitored_lines = np.zeros(network.n_lines, dtype=bool)
+        if not self.lazy_line_limits:
+            self._add_line_limits(np.flatnonzero(np.isfinite(network.line_capacity)))
+
+    def _add_flow_limits(self, B_rows: sp.spmatrix, capacity: np.ndarray, name: str) -> tuple:
+        '''
+            Add -capacity <= B_rows theta <= capacity as one block of constraints per direction
+        '''
+        network = self.network
+        if self.formulation == 'angle':
+            flow = B_rows @ self.variables.voltage_angle
+            upper = self.model.addConstr(flow <= capacity, name=f'{name} up')
+            lower = self.model.addConstr(flow >= -capacity, name=f'{name} down')
+            ptdf = None
+        else:
+            ptdf = network.distribution_factors(B_rows)
+            flow = (ptdf @ network.generator_incidence) @ self.variables.generator_production
+            # the demand is kept on the right-hand side so that the duals give its price
+            upper = self.model.addConstr(flow <= capacity + ptdf @ network.demand, name=f'{name} up')
+            lower = self.model.addConstr(flow >= -capacity + ptdf @ network.demand, name=f'{name} down')
+        return upper, lower, ptdf
+
+    def _add_line_limits(self, lines: np.ndarray):
+        '''
+            Add -F_l <= flow_l <= F_l for the given lines
+        '''
+        if len(lines) == 0:
+            return
+        upper, lower, ptdf = self._add_flow_limits(
+            self.network.B_line[lines], self.network.line_capacity[lines], 'Line limit'
+        )
+        self.constraints.line_limits.append((lines, upper, lower, ptdf))
+        self.monitored_lines[lines] = True
+
+    def _add_contingency_limits(self, lines: np.ndarray, outages: np.ndarray, contingency_rating: float):
+        '''
+            Add the limits of the given lines after the outage of the paired lines:
+            |flow_l + LODF_lk flow_k| <= contingency_rating F_l
+        '''
+        if len(lines) == 0:
+            return
+        network = self.network
+        lodf, _ = network.outage_factors(outages)
+        coefficients = lodf[lines, np.arange(len(lines))]
+        B_rows = network.B_line[lines] + sp.diags(coefficients) @ network.B_line[outages]
+        upper, lower, ptdf = self._add_flow_limits(
+            B_rows, contingency_rating * network.line_capacity[lines], 'Contingency limit'
+        )
+        self.constraints.contingency_limits.append((np.column_stack([lines, outages]), upper, lower, ptdf))
+
+    def _build_model(self):
+        start = time.perf_counter()
+        self.model = gp.Model(name='DC optimal power flow', env=shared_env(self.env))
+        self._build_variables()
+        self.model.ModelSense = GRB.MINIMIZE
+        self._build_constraints()
+        self.model.update()
+        self.timings.build = time.perf_counter() - start
+
+    def _save_results(self):
+        network = self.network
+        # save objective value
+        self.results.objective_value = self.model.ObjVal
+        # save generator dispatch values as an array ordered like GENERATORS
+        self.results.generator_production = self.variables.generator_production.X
+        injections = network.generator_incidence @ self.results.generator_production - network.demand
+        # save line flows as an array ordered like LINES
+        if self.formulation == 'angle':
+            self.results.voltage_angle = self.variables.voltage_angle.X
+            self.results.line_flow = network.B_line @ self.results.voltage_angle
+            # save nodal prices (i.e., dual variables of nodal balance constraints)
+            self.results.lmp = self.constraints.balance_constraint.Pi
+        else:
+            self.results.voltage_angle = network.angles(injections)
+            self.results.line_flow = network.B_line @ self.results.voltage_angle
+            # system price plus the congestion component of every monitored line
+            lmp = np.full(network.n_buses, self.constraints.balance_constraint.Pi)
+            for _, upper, lower, ptdf in self.constraints.line_limits + self.constraints.contingency_limits:
+                lmp += ptdf.T @ (upper.Pi + lower.Pi)
+            self.results.lmp = lmp
+        # save congestion rents of the lines (i.e., dual variables of line limits), zero for unmonitored lines
+        self.results.line_sensitivities = np.zeros(network.n_lines)
+        for lines, upper, lower, ptdf in self.constraints.line_limits:
+            self.results.line_sensitivities[lines] = upper.Pi - lower.Pi
+
+    def run(self, tolerance: float = 1e-6, max_iterations: int = 100, verbose: bool = False):
+        '''
+            Solve the OPF. With lazy line limits, repeat solving and adding the limits of the
+            violated lines (relative tolerance) for at most max_iterations rounds, recording the
+            number of line limit constraints and violated lines of every round in results.iterations.
+        '''
+        start = time.perf_counter()
+        if not self.lazy_line_limits:
+            self.model.optimize()
+            self.timings.solve = time.perf_counter() - start
+            if self.model.status == GRB.OPTIMAL:
+                self._save_results()
+            else:
+                print(f"optimization of {self.model.ModelName} was not successful")
+            return
+        network = self.network
+        self.results.iterations = []
+        self.results.converged = False
+        for iteration in range(1, max_iterations + 1):
+            start_iteration = time.perf_counter()
+            self.model.optimize()
+            if self.model.status != GRB.OPTIMAL:
+                self.timings.solve = time.perf_counter() - start
+                print(f"optimization of {self.model.ModelName} was not successful")
+                return
+            production = self.variables.generator_production.X
+            flows = network.flows(network.generator_incidence @ production - network.demand)
+            capacity = network.line_capacity
+            violated = np.flatnonzero(
+                ~self.monitored_lines & (np.abs(flows) > capacity + tolerance * np.maximum(1, capacity))
+            )
+            self.results.iterations.append({
+                'iteration': iteration,
+                'line_limits': 2 * int(self.monitored_lines.sum()),
+                'violated_lines': len(violated),
+                'objective_value': self.model.ObjVal,
+                'simplex_iterations': int(self.model.IterCount),
+                'time': time.perf_counter() - start_iteration,
+            })
+            if verbose:
+                print(
+                    f"Iteration {iteration}: {2 * int(self.monitored_lines.sum())} line limits, "
+                    f"{len(violated)} violated, objective {self.model.ObjVal:.4f}"
+                )
+            if len(violated) == 0:
+                self.results.converged = True
+                break
+            self._add_line_limits(violated)
+        self.timings.solve = time.perf_counter() - start
+        self._save_results()
+
+    def run_security_constrained(
+        self,
+        contingency_rating: float = 1.0,
+        outages: np.ndarray = None,
+        chunk_size: int = 500,
+        processes: int = 1,
+        tolerance: float = 1e-6,
+        max_iterations: int = 20,
+        verbose: bool = False,
+    ):
+        '''
+            N-1 security-constrained OPF: solve, screen all outages (default: every line) with
+            screen_contingencies, add the worst violated contingency limit of every overloaded line,
+            and repeat until the dispatch is N-1 secure. Records every round in results.security_iterations.
+        '''
+        start = time.perf_counter()
+        self.results.security_iterations = []
+        self.results.secure = False
+        for iteration in range(1, max_iterations + 1):
+            self.run(tolerance=tolerance)
+            if self.model.status != GRB.OPTIMAL:
+                return
+            solve_time = self.timings.solve
+            start_screening = time.perf_counter()
+            overload, outage, islanding = screen_contingencies(
+                self.network, self.results.line_flow, outages, contingency_rating, chunk_size, processes, tolerance
+            )
+            screening_time = time.perf_counter() - start_screening
+            lines = np.flatnonzero(outage >= 0)
+            self.results.security_iterations.append({
+                'iteration': iteration,
+                'contingency_limits': 2 * sum(len(block[0]) for block in self.constraints.contingency_limits),
+                'overloaded_lines': len(lines),
+                'max_overload': float(overload.max()),
+                'objective_value': self.results.objective_value,
+                'solve_time': solve_time,
+                'screening_time': screening_time,
+            })
+            if verbose:
+                print(
+                    f"Iteration {iteration}: {len(lines)} lines overloaded after an outage "
+                    f"(worst {overload.max():.2f} MW), objective {self.results.objective_value:.4f}, "
+                    f"solve {solve_time:.3f} s, screening {screening_time:.3f} s"
+                )
+            if len(lines) == 0:
+                self.results.secure = True
+                break
+            self._add_contingency_limits(lines, outage[lines], contingency_rating)
+        self.results.islanding_outages = islanding
+        self.timings.security = time.perf_counter() - start
+
+    def display_results(self):
+        print()
+        print("-------------------   RESULTS  -------------------")
+        print("Optimal energy production cost:")
+        print(self.results.objective_value)
+        print("Optimal generator dispatches:")
+        for i, g in enumerate(self.data.GENERATORS):
+            print(f"{g}: {self.results.generator_production[i]}")
+        print("Line flows:")
+        for i, l in enumerate(self.data.LINES):
+            print(f"{l}: {self.results.line_flow[i]}")
+        print("Nodal prices (LMPs):")
+        for i, b in enumerate(self.data.BUSES):
+            print(f"{b}: {self.results.lmp[i]}")
+
+
+def random_input_data(n_buses: int, seed: int = 0, n_1_secure: bool = False) -> InputData:
+    '''
+        Synthetic meshed grid for benchmarks: a ring of buses with random chords (about 1.5 lines per bus),
+        generators at a fifth of the buses and loads at half of them. Line capacities leave room for the
+        flows of a pro-rata dispatch (so the OPF is feasible) and are drawn around the flows of the
+        unconstrained economic dispatch, so that some lines congest. With n_1_secure=True the room is left
+        for the pro-rata flows after any single line outage, so that the N-1 secure OPF is feasible too.
+    '''
+    rng = np.random.default_rng(seed)
+    buses = np.arange(n_buses)
+    n_chords = n_buses // 2
+    line_from = np.r_[buses, rng.integers(0, n_buses, n_chords)]
+    line_to = np.r_[np.roll(buses, -1), (line_from[n_buses:] + rng.integers(2, max(3, n_buses // 10), n_chords)) % n_buses]
+    n_lines = len(line_from)
+    generator_bus = rng.choice(n_buses, max(2, n_buses // 5), replace=False)
+    load_bus = rng.choice(n_buses, max(1, n_buses // 2), replace=False)
+    n_generators, n_loads = len(generator_bus), len(load_bus)
+    generator_capacity = rng.uniform(50, 300, n_generators).round()
+    generator_cost = rng.uniform(5, 150, n_generators).round(1)
+    load_capacity = rng.uniform(0.5, 1.5, n_loads)
+    load_capacity *= generator_capacity.sum() * 0.6 / load_capacity.sum()
+    reactance = rng.uniform(0.05, 0.5, n_lines).round(3)
+
+    BUSES = [f'N{n}' for n in range(1, n_buses + 1)]
+    LINES = [f'L{l}' for l in range(1, n_lines + 1)]
+    GENERATORS = [f'G{i}' for i in range(1, n_generators + 1)]
+    LOADS = [f'D{j}' for j in range(1, n_loads + 1)]
+    input_data = InputData(
+        BUSES=BUSES,
+        LINES=LINES,
+        GENERATORS=GENERATORS,
+        LOADS=LOADS,
+        line_from=line_from,
+        line_to=line_to,
+        line_reactance=reactance,
+        line_capacity=np.full(n_lines, np.inf),
+        generator_bus=generator_bus,
+        generator_cost=generator_cost,
+        generator_capacity=generator_capacity,
+        load_bus=load_bus,
+        load_capacity=load_capacity,
+    )
+    network = Network(input_data)
+    # every generator at 60 % of its capacity
+    pro_rata = network.flows(network.generator_incidence @ (0.6 * generator_capacity) - network.demand)
+    pro_rata_room = np.abs(pro_rata)
+    if n_1_secure:
+        for start in range(0, n_lines, 500):
+            outages = np.arange(start, min(start + 500, n_lines))
+            lodf, islanding = network.outage_factors(outages)
+            post_contingency = np.abs(pro_rata[:, None] + lodf[:, ~islanding] * pro_rata[outages[~islanding]])
+            pro_rata_room = np.maximum(pro_rata_room, post_contingency.max(axis=1, initial=0))
+    # merit-order dispatch without network limits
+    order = np.argsort(generator_cost)
+    production = np.zeros(n_generators)
+    production[order] = np.clip(
+        load_capacity.sum() - np.r_[0, np.cumsum(generator_capacity[order])[:-1]], 0, generator_capacity[order]
+    )
+    merit_order = network.flows(network.generator_incidence @ production - network.demand)
+    input_data.line_capacity = np.ceil(
+        np.maximum(1.05 * pro_rata_room, rng.uniform(0.7, 2, n_lines) * np.abs(merit_order))
+    ) + 1
+    return input_data
+
+
+def benchmark_dc_opf(sizes: tuple = (500, 2_000, 5_000, 10_000), ptdf_sizes: tuple = (500, 2_000)):
+    '''
+        Build and solve time of both formulations on synthetic grids of increasing size.
+        The dense PTDF formulation is limited to ptdf_sizes since it has lines x generators coefficients.
+    '''
+    print()
+    print("-------------------   DC-OPF BENCHMARK  -------------------")
+    print(
+        f"{'buses':>7} {'lines':>7} {'formulation':>12} {'build [s]':>10} {'solve [s]':>10} "
+        f"{'objective':>14} {'congested':>10}"
+    )
+    env = shared_env()
+    for n_buses in sizes:
+        input_data = random_input_data(n_buses)
+        for formulation in ('angle', 'ptdf'):
+            if formulation == 'ptdf' and n_buses not in ptdf_sizes:
+                continue
+            opf = DCOptimalPowerFlow(input_data, formulation=formulation, env=env)
+            opf.run()
+            congested = int(np.sum(np.abs(opf.results.line_sensitivities) > 1e-6))
+            print(
+                f"{n_buses:>7} {len(input_data.LINES):>7} {formulation:>12} {opf.timings.build:>10.3f} "
+                f"{opf.timings.solve:>10.3f} {opf.results.objective_value:>14.2f} {congested:>10}"
+            )
+            opf.model.dispose()
+
+
+def benchmark_lazy_line_limits(sizes: tuple = (500, 2_000, 5_000, 10_000), formulation: str = 'angle'):
+    '''
+        Compare the full formulation (every line limit up front) against lazy line limits:
+        line limit constraints and solve time of every round, and total time of both
+    '''
+    print()
+    print("-------------------   LAZY LINE LIMITS BENCHMARK  -------------------")
+    print(f"{formulation} formulation")
+    env = shared_env()
+    for n_buses in sizes:
+        input_data = random_input_data(n_buses)
+        full = DCOptimalPowerFlow(input_data, formulation=formulation, env=env)
+        full.run()
+        lazy = DCOptimalPowerFlow(input_data, formulation=formulation, env=env, lazy_line_limits=True)
+        lazy.run()
+        print(f"{n_buses} buses, {len(input_data.LINES)} lines")
+        print(f"{'round':>7} {'line limits':>12} {'violated':>9} {'time [s]':>9} {'objective':>14}")
+        for row in lazy.results.iterations:
+            print(
+                f"{row['iteration']:>7} {row['line_limits']:>12} {row['violated_lines']:>9} "
+                f"{row['time']:>9.3f} {row['objective_value']:>14.2f}"
+            )
+        print(
+            f"{'full':>7} {2 * int(full.monitored_lines.sum()):>12} {'-':>9} {full.timings.solve:>9.3f} "
+            f"{full.results.objective_value:>14.2f}"
+        )
+        full_total = full.timings.build + full.timings.solve
+        lazy_total = lazy.timings.build + lazy.timings.solve
+        print(
+            f"total (build + solve): full {full_total:.3f} s, lazy {lazy_total:.3f} s, "
+            f"speedup {full_total / lazy_total:.1f}x"
+        )
+        full.model.dispose()
+        lazy.model.dispose()
+
+
+def without_line(input_data: InputData, line: int) -> InputData:
+    '''
+        Copy of array-based input data with one line removed
+    '''
+    keep = np.arange(len(input_data.LINES)) != line
+    return InputData(
+        BUSES=input_data.BUSES,
+        LINES=[l for l, kept in zip(input_data.LINES, keep) if kept],
+        GENERATORS=input_data.GENERATORS,
+        LOADS=input_data.LOADS,
+        line_from=input_data.line_from[keep],
+        line_to=input_data.line_to[keep],
+        line_reactance=input_data.line_reactance[keep],
+        line_capacity=input_data.line_capacity[keep],
+        generator_bus=input_data.generator_bus,
+        generator_cost=input_data.generator_cost,
+        generator_capacity=input_data.generator_capacity,
+        load_bus=input_data.load_bus,
+        load_capacity=input_data.load_capacity,
+        reference_bus=input_data.reference_bus,
+    )
+
+
+def benchmark_n1_screening(
+    sizes: tuple = (500, 2_000, 5_000), processes: int = 4, n_models: int = 20, contingency_rating: float = 1.0
+):
+    '''
+        N-1 screening of the base-case OPF dispatch: one power flow model per outage (timed on n_models
+        outages and extrapolated to all lines) against the vectorized LODF screening, in one and in
+        several processes. Then the rounds of the security-constrained OPF.
+    '''
+    print()
+    print("-------------------   N-1 SCREENING BENCHMARK  -------------------")
+    print(
+        f"{'buses':>7} {'lines':>7} {'model per outage [s]':>21} {'LODF [s]':>9} "
+        f"{f'LODF {processes} proc. [s]':>18} {'overloaded':>11}"
+    )
+    env = shared_env()
+    for n_buses in sizes:
+        input_data = random_input_data(n_buses, n_1_secure=True)
+        opf = DCOptimalPowerFlow(input_data, env=env, lazy_line_limits=True)
+        opf.run()
+        production, flows = opf.results.generator_production, opf.results.line_flow
+
+        # one power flow model per outage: dispatch fixed to the base case, no line limits
+        start = time.perf_counter()
+        for line in range(n_models):
+            outage_model = DCOptimalPowerFlow(without_line(input_data, line), env=env, lazy_line_limits=True)
+            outage_model.variables.generator_production.LB = production
+            outage_model.variables.generator_production.UB = production
+            outage_model.model.optimize()
+            outage_model.model.dispose()
+        per_outage = (time.perf_counter() - start) / n_models
+
+        timings = []
+        for n_processes in (1, processes):
+            start = time.perf_counter()
+            overload, outage, _ = screen_contingencies(opf.network, flows, contingency_rating=contingency_rating, processes=n_processes)
+            timings.append(time.perf_counter() - start)
+        print(
+            f"{n_buses:>7} {opf.network.n_lines:>7} {per_outage * opf.network.n_lines:>21.3f} {timings[0]:>9.3f} "
+            f"{timings[1]:>18.3f} {int(np.sum(outage >= 0)):>11}"
+        )
+        opf.model.dispose()
+
+        sc_opf = DCOptimalPowerFlow(input_data, env=env, lazy_line_limits=True)
+        sc_opf.run_security_constrained(contingency_rating=contingency_rating, processes=processes)
+        for row in sc_opf.results.security_iterations:
+            print(
+                f"    round {row['iteration']}: {row['overloaded_lines']} overloaded lines, "
+                f"{row['contingency_limits']} contingency limits, objective {row['objective_value']:.2f}, "
+                f"solve {row['solve_time']:.3f} s, screening {row['screening_time']:.3f} s"
+            )
+        sc_opf.model.dispose()
+
+
+if __name__ == '__main__':
+    input_data = InputData(
+        BUSES = ['n1', 'n2', 'n3'],
+        LINES = ['L12', 'L23', 'L13'],
+        GENERATORS = ['G1', 'G2', 'G3'],
+        LOADS = ['D1'],
+        line_from = {'L12': 'n1', 'L23': 'n2', 'L13': 'n1'},
+        line_to = {'L12': 'n2', 'L23': 'n3', 'L13': 'n3'},
+        line_reactance = {'L12': 0.4, 'L23': 0.4, 'L13': 0.4}, # Lines reactance (x_l)
+        line_capacity = {'L12': 150, 'L23': 150, 'L13': 150}, # Lines capacity (F_l)
+        generator_bus = {'G1': 'n1', 'G2': 'n2', 'G3': 'n3'},
+        generator_cost = {'G1': 70, 'G2': 15, 'G3': 150}, # Generators costs (c^G_i)
+        generator_capacity = {'G1': 150, 'G2': 150, 'G3': 150}, # Generators capacity (P^G_i)
+        load_bus = {'D1': 'n3'},
+        load_capacity = {'D1': 200}, # Loads capacity (P^D_j)
+    )
+    opf = DCOptimalPowerFlow(input_data)
+    opf.run()
+    opf.display_results()
+
+    if '--benchmark' in sys.argv:
+        benchmark_dc_opf()
+        benchmark_lazy_line_limits()
+        benchmark_lazy_line_limits(sizes=(500, 2_000), formulation='ptdf')
+        benchmark_n1_screening()
@@ -0,0 +1,198 @@
+'''
+KKT verification (Exercise 4 c) for any solved LP or QP with linear constraints, such as the models
+of EconomicDispatch, OptimizationProblem or StochasticEconomicDispatch. Primal values, bounds,
+reduced costs, duals and right-hand sides are read with one getAttr call each over all variables and
+constraints, and the conditions are checked as array operations, since per-variable and
+per-constraint attribute access dominates for large models.
+
+Sign conventions are those of Gurobi for a minimization: Pi <= 0 for <= constraints, Pi >= 0 for
+>= constraints, RC >= 0 for variables at their lower bound and RC <= 0 at their upper bound, and the
+Lagrangian gradient grad f(x) - A^T Pi - RC is zero. Maximizations are checked on the negated problem.
+'''
+
+import os
+import sys
+import time
+
+import gurobipy as gp
+from gurobipy import GRB
+import numpy as np
+import scipy.sparse as sp
+
+# shared helpers in common.py at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import shared_env
+
+
+class Expando(object):
+    '''
+        A small class which can have attributes set
+    '''
+    pass
+
+
+def _worst(violations: np.ndarray, names: list) -> tuple[float, str]:
+    # largest violation and the name of the variable or constraint where it occurs
+    if len(violations) == 0 or violations.max() <= 0:
+        return 0.0, None
+    position = int(np.argmax(violations))
+    item = names[position]
+    return float(violations[position]), item.ConstrName if isinstance(item, gp.Constr) else item.VarName
+
+
+def check_kkt(problem, tolerance: float = 1e-6) -> Expando:
+    '''
+        Check primal feasibility, dual feasibility, complementary slackness and stationarity of a solved
+        model (a gp.Model or an object with a .model attribute). Returns the worst violation of every
+        condition, the variable or constraint where it occurs, and whether all are within tolerance.
+        A MIP is checked on its fixed model (integer variables fixed at the incumbent), re-solved here.
+    '''
+    model = getattr(problem, 'model', problem)
+    if model.IsQCP:
+        raise ValueError(f"{model.ModelName} has quadratic constraints, KKT duals are not available")
+    if model.status != GRB.OPTIMAL:
+        raise ValueError(f"{model.ModelName} is not solved to optimality (status {model.status})")
+    if model.IsMIP:
+        model = model.fixed()
+        model.Params.OutputFlag = 0
+        model.optimize()
+    start = time.perf_counter()
+    variables, constraints = model.getVars(), model.getConstrs()
+    # one bulk query per attribute
+    x = np.array(model.getAttr('X'))
+    lower_bound = np.array(model.getAttr('LB'))
+    upper_bound = np.array(model.getAttr('UB'))
+    reduced_cost = np.array(model.getAttr('RC'))
+    objective = np.array(model.getAttr('Obj'))
+    pi = np.array(model.getAttr('Pi', constraints)) if constraints else np.zeros(0)
+    rhs = np.array(model.getAttr('RHS', constraints)) if constraints else np.zeros(0)
+    sense = np.array(model.getAttr('Sense', constraints)) if constraints else np.zeros(0, dtype=str)
+    A = model.getA().tocsr() if constraints else sp.csr_matrix((0, len(variables)))
+    gradient = objective
+    if model.IsQP:
+        Q = model.getQ().tocsr()
+        gradient = objective + Q @ x + Q.T @ x
+    read = time.perf_counter() - start
+
+    # checked on the minimization form
+    sign = 1.0 if model.ModelSense == GRB.MINIMIZE else -1.0
+    pi, reduced_cost, gradient = sign * pi, sign * reduced_cost, sign * gradient
+
+    # primal feasibility: constraint activities and bounds
+    residual = A @ x - rhs
+    less, greater = sense == GRB.LESS_EQUAL, sense == GRB.GREATER_EQUAL
+    constraint_violation = np.where(less, np.maximum(residual, 0), np.where(greater, np.maximum(-residual, 0), np.abs(residual)))
+    bound_violation = np.maximum(np.maximum(lower_bound - x, 0), np.maximum(x - upper_bound, 0))
+    # dual feasibility: signs of the duals, and reduced costs only towards finite bounds
+    dual_violation = np.where(less, np.maximum(pi, 0), np.where(greater, np.maximum(-pi, 0), 0))
+    positive, negative = np.maximum(reduced_cost, 0), np.maximum(-reduced_cost, 0)
+    finite_lower, finite_upper = np.isfinite(lower_bound), np.isfinite(upper_bound)
+    reduced_cost_violation = np.where(finite_lower, 0, positive) + np.where(finite_upper, 0, negative)
+    # complementary slackness: dual times slack of every constraint and bound
+    constraint_complementarity = np.abs(pi * residual)
+    bound_complementarity = (
+        np.where(finite_lower, positive * np.abs(x - np.where(finite_lower, lower_bound, 0)), 0)
+        + np.where(finite_upper, negative * np.abs(np.where(finite_upper, upper_bound, 0) - x), 0)
+    )
+    # stationarity of the Lagrangian
+    stationarity = np.abs(gradient - A.T @ pi - reduced_cost)
+
+    report = Expando()
+    report.model_name = model.ModelName
+    report.worst = {}
+    for condition, parts in (
+        ('primal_feasibility', ((constraint_violation, constraints), (bound_violation, variables))),
+        ('dual_feasibility', ((dual_violation, constraints), (reduced_cost_violation, variables))),
+        ('complementary_slackness', ((constraint_complementarity, constraints), (bound_complementarity, variables))),
+        ('stationarity', ((stationarity, variables),)),
+    ):
+        value, name = max((_worst(violations, names) for violations, names in parts), key=lambda worst: worst[0])
+        setattr(report, condition, value)
+        report.worst[condition] = name
+    report.satisfied = all(
+        getattr(report, condition) <= tolerance
+        for condition in ('primal_feasibility', 'dual_feasibility', 'complementary_slackness', 'stationarity')
+    )
+    report.timings = Expando()
+    report.timings.read = read
+    report.timings.total = time.perf_counter() - start
+    return report
+
+
+def display_kkt(report: Expando):
+    print()
+    print(f"-------------------   KKT CONDITIONS ({report.model_name})  -------------------")
+    for condition in ('primal_feasibility', 'dual_feasibility', 'complementary_slackness', 'stationarity'):
+        worst = report.worst[condition]
+        print(f"{condition:>24}: worst violation {getattr(report, condition):.2e}" + (f" at {worst}" if worst else ""))
+    print(f"KKT conditions {'are' if report.satisfied else 'are not'} satisfied")
+
+
+def _read_attributes_loop(model: gp.Model) -> tuple:
+    # the same attributes read one variable and one constraint at a time, for the benchmark
+    variables, constraints = model.getVars(), model.getConstrs()
+    return (
+        [v.X for v in variables], [v.LB for v in variables], [v.UB for v in variables],
+        [v.RC for v in variables], [v.Obj for v in variables],
+        [c.Pi for c in constraints], [c.RHS for c in constraints], [c.Sense for c in constraints],
+    )
+
+
+def random_dispatch_model(n_generators: int, seed: int = 0, env: gp.Env = None) -> gp.Model:
+    '''
+        Economic dispatch LP with explicit capacity constraints (one row per generator), used for benchmarks
+    '''
+    rng = np.random.default_rng(seed)
+    capacity = rng.uniform(50, 300, n_generators).round()
+    model = gp.Model(name='Economic dispatch', env=shared_env(env))
+    production = model.addMVar(n_generators, lb=0, obj=rng.uniform(0, 200, n_generators).round(), name='Electricity production')
+    model.addConstr(production <= capacity, name='Capacity constraint')
+    model.addConstr(production.sum() == capacity.sum() / 2, name='Balance constraint')
+    model.optimize()
+    return model
+
+
+def benchmark_kkt(sizes: tuple = (100, 500, 1_000), repeats: int = 5):
+    '''
+        Time of reading the KKT attributes one object at a time against the bulk queries of check_kkt
+    '''
+    print()
+    print("-------------------   KKT VERIFIER BENCHMARK  -------------------")
+    print(f"{'variables':>10} {'constraints':>12} {'loop read [ms]':>15} {'bulk read [ms]':>15} {'check [ms]':>11} {'satisfied':>10}")
+    env = shared_env()
+    for n_generators in sizes:
+        model = random_dispatch_model(n_generators, env=env)
+        loop, bulk, total = [], [], []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            _read_attributes_loop(model)
+            loop.append(time.perf_counter() - start)
+            report = check_kkt(model)
+            bulk.append(report.timings.read)
+            total.append(report.timings.total)
+        print(
+            f"{model.NumVars:>10} {model.NumConstrs:>12} {1e3 * min(loop):>15.3f} {1e3 * min(bulk):>15.3f} "
+            f"{1e3 * min(total):>11.3f} {str(report.satisfied):>10}"
+        )
+        model.dispose()
+
+
+if __name__ == '__main__':
+    # Exercise 4: linear and quadratic dispatch with explicit max and min production constraints
+    generators = ['g1', 'g2', 'g3']
+    cost_beta = {'g1': 70, 'g2': 15, 'g3': 150}
+    for task, cost_alpha in (('linear', {g: 0 for g in generators}), ('quadratic', {'g1': 0.1, 'g2': 0.4, 'g3': 0.2})):
+        model = gp.Model(f'Exercise 4 ({task})', env=shared_env())
+        pg = model.addVars(generators, name='Power generation')
+        model.setObjective(gp.quicksum(cost_alpha[g] * pg[g] * pg[g] + cost_beta[g] * pg[g] for g in generators), GRB.MINIMIZE)
+        model.addLConstr(pg.sum(), GRB.EQUAL, 200, name='Balance equation')
+        for g in generators:
+            model.addLConstr(pg[g], GRB.LESS_EQUAL, 150, name=f'Max production {g}')
+            model.addLConstr(-pg[g], GRB.LESS_EQUAL, 0, name=f'Min production {g}')
+        model.optimize()
+        # in the linear case, Pi = -55 on the max production of g2 is dual feasible: <= constraints of a
+        # minimization have Pi <= 0 in Gurobi, the Lagrange multiplier of the textbook form is -Pi
+        display_kkt(check_kkt(model))
+
+    if '--benchmark' in sys.argv:
+        benchmark_kkt()
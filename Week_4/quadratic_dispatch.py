@@ -0,0 +1,289 @@
+'''
+Quadratic economic dispatch (Exercise 4): minimize sum_i alpha_i p_i^2 + beta_i p_i subject to the
+balance constraint and production limits. The problem is convex and separable, so at the optimum
+every generator produces where its incremental cost 2 alpha_i p_i + beta_i equals the price lambda,
+clipped to its limits (equal incremental cost). lambda_iteration finds lambda without a QP solver,
+the Gurobi QP is kept as a cross-check.
+'''
+
+import os
+import sys
+import time
+
+import gurobipy as gp
+from gurobipy import GRB
+import numpy as np
+
+# shared helpers in common.py at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import as_array, shared_env
+
+
+class Expando(object):
+    '''
+        A small class which can have attributes set
+    '''
+    pass
+
+
+class InputData:
+
+    def __init__(
+        self,
+        GENERATORS: list,
+        LOADS: list,
+        generator_quadratic_cost: dict[str, float],
+        generator_cost: dict[str, float],
+        generator_capacity: dict[str, float],
+        load_capacity: dict[str, float],
+        generator_min_production: dict[str, float] = None,
+    ):
+        # List of generators
+        self.GENERATORS = GENERATORS
+        # List of loads
+        self.LOADS = LOADS
+        # Generators quadratic cost coefficients (alpha_i)
+        self.generator_quadratic_cost = generator_quadratic_cost
+        # Generators linear cost coefficients (beta_i)
+        self.generator_cost = generator_cost
+        # Generators capacity (P^G_i)
+        self.generator_capacity = generator_capacity
+        # Loads capacity (P^D_j)
+        self.load_capacity = load_capacity
+        # Generators minimum production, zero when None
+        self.generator_min_production = generator_min_production
+
+
+def lambda_iteration(
+    quadratic_cost: np.ndarray,
+    linear_cost: np.ndarray,
+    capacity: np.ndarray,
+    demand: float,
+    min_production: np.ndarray = None,
+    seed: int = 0,
+) -> tuple[np.ndarray, float]:
+    '''
+        Dispatch and price (dual of the balance constraint) of the quadratic economic dispatch.
+        Generator i produces p_min + clip((lambda - k_low) / (2 alpha), 0, p_max - p_min), with kinks
+        k_low = beta + 2 alpha p_min and k_high = beta + 2 alpha p_max (a step at beta when alpha = 0).
+        lambda is bisected over the kinks: every step evaluates the supply at a random kink of the
+        generators still active, halves the price interval, and drops the generators that are at
+        a limit or strictly inside their range over the whole interval. When no kink is left, the supply
+        is linear in lambda and the price is solved for exactly. The expected work is linear in the
+        number of generators.
+    '''
+    if min_production is None:
+        min_production = np.zeros_like(capacity)
+    total_min = min_production.sum()
+    if not total_min <= demand <= capacity.sum():
+        raise ValueError(f"demand {demand} outside the production range [{total_min}, {capacity.sum()}]")
+    ranges = capacity - min_production
+    inverse = np.divide(0.5, quadratic_cost, out=np.zeros_like(quadratic_cost), where=quadratic_cost > 0)
+    low = linear_cost + 2 * quadratic_cost * min_production
+    high = linear_cost + 2 * quadratic_cost * capacity
+
+    rng = np.random.default_rng(seed)
+    lower, upper = -np.inf, np.inf
+    # supply above the minimum, from generators no longer active: a constant plus slope * lambda
+    constant, slope = 0.0, 0.0
+    # rows: k_low, k_high, 1 / (2 alpha), p_max - p_min of the active generators
+    active = np.stack([low, high, inverse, ranges])
+    price = None
+    while active.shape[1]:
+        active_low, active_high, active_inverse, active_ranges = active
+        # pivot: median of the kinks inside (lower, upper) of a few random active generators
+        sample = rng.integers(len(active_low), size=min(len(active_low), 31))
+        kinks = np.concatenate([active_low[sample], active_high[sample]])
+        pivot = np.median(kinks[(kinks > lower) & (kinks < upper)])
+        # supply at the pivot, generators with a step there counted at their minimum
+        supply = (
+            total_min + constant + slope * pivot
+            + np.clip((pivot - active_low) * active_inverse, 0, active_ranges).sum()
+        )
+        steps = active_low == active_high
+        supply += active_ranges @ (steps & (active_low < pivot))
+        marginal = active_ranges @ (steps & (active_low == pivot))
+        if supply <= demand <= supply + marginal:
+            price = pivot
+            break
+        if demand < supply:
+            upper = pivot
+        else:
+            lower = pivot
+        at_capacity = active_high <= lower
+        at_minimum = active_low >= upper
+        inside = ~steps & (active_low <= lower) & (active_high >= upper)
+        constant += active_ranges @ at_capacity - (active_low * active_inverse) @ inside
+        slope += active_inverse @ inside
+        # one take of the kept columns, boolean indexing of every row is several times slower
+        active = active.take(np.flatnonzero(~(at_capacity | at_minimum | inside)), axis=1)
+    if price is None:
+        # no kink inside (lower, upper), where the supply is total_min + constant + slope * lambda
+        if slope > 0:
+            price = (demand - total_min - constant) / slope
+        else:
+            price = lower if np.isfinite(lower) else upper
+
+    production = min_production + np.clip((price - low) * inverse, 0, ranges)
+    steps = low == high
+    production += ranges * (steps & (low < price))
+    # generators with a step at the price share the remaining demand in proportion to their range
+    marginal = steps & (low == price) & (ranges > 0)
+    if marginal.any():
+        production[marginal] += (demand - production.sum()) * ranges[marginal] / ranges[marginal].sum()
+    return production, float(price)
+
+
+class QuadraticEconomicDispatch():
+    '''
+        method='lambda-iteration' uses lambda_iteration, method='qp' solves the Gurobi QP
+    '''
+
+    def __init__(self, input_data: InputData, method: str = 'lambda-iteration', env: gp.Env = None):
+        if method not in ('lambda-iteration', 'qp'):
+            raise ValueError(f"unknown method {method}")
+        self.data = input_data # define data attributes
+        self.method = method
+        self.env = env
+        self.variables = Expando() # define variable attributes
+        self.constraints = Expando() # define constraints attributes
+        self.results = Expando() # define results attributes
+        self.timings = Expando() # define latency attributes (seconds)
+        self._read_data()
+        if method == 'qp':
+            self._build_model() # build gurobi model
+
+    def _read_data(self):
+        data = self.data
+        self.quadratic_cost = as_array(data.generator_quadratic_cost, data.GENERATORS)
+        self.linear_cost = as_array(data.generator_cost, data.GENERATORS)
+        self.capacity = as_array(data.generator_capacity, data.GENERATORS)
+        self.min_production = (
+            np.zeros(len(data.GENERATORS)) if data.generator_min_production is None
+            else as_array(data.generator_min_production, data.GENERATORS)
+        )
+        self.demand = as_array(data.load_capacity, data.LOADS).sum()
+
+    def _build_variables(self):
+        # build generator production variables, bounded by the production limits
+        self.variables.generator_production = self.model.addMVar(
+            len(self.data.GENERATORS), lb=self.min_production, ub=self.capacity, name='Electricity production'
+        )
+
+    def _build_constraints(self):
+        # build balance constraint
+        self.constraints.balance_constraint = self.model.addConstr(
+            self.variables.generator_production.sum() == self.demand, name='Balance constraint'
+        )
+
+    def _build_objective_function(self):
+        production = self.variables.generator_production
+        self.model.setObjective(
+            production @ (self.quadratic_cost * production) + self.linear_cost @ production, GRB.MINIMIZE
+        )
+
+    def _build_model(self):
+        start = time.perf_counter()
+        self.model = gp.Model(name='Quadratic economic dispatch', env=shared_env(self.env))
+        self._build_variables()
+        self._build_objective_function()
+        self._build_constraints()
+        self.model.update()
+        self.timings.build = time.perf_counter() - start
+
+    def _save_results(self, production: np.ndarray, price: float):
+        # save objective value
+        self.results.objective_value = float(self.quadratic_cost @ production**2 + self.linear_cost @ production)
+        # save generator dispatch values
+        self.results.generator_production = dict(zip(self.data.GENERATORS, production.tolist()))
+        # save price (i.e., dual variable of balance constraint)
+        self.results.price = price
+
+    def run(self):
+        start = time.perf_counter()
+        if self.method == 'lambda-iteration':
+            production, price = lambda_iteration(
+                self.quadratic_cost, self.linear_cost, self.capacity, self.demand, self.min_production
+            )
+            self.timings.solve = time.perf_counter() - start
+            self._save_results(production, price)
+            return
+        self.model.optimize()
+        self.timings.solve = time.perf_counter() - start
+        if self.model.status == GRB.OPTIMAL:
+            self._save_results(self.variables.generator_production.X, self.constraints.balance_constraint.Pi.item())
+        else:
+            print(f"optimization of {self.model.ModelName} was not successful")
+
+    def display_results(self):
+        print()
+        print(f"-------------------   RESULTS ({self.method})  -------------------")
+        print("Optimal energy production cost:")
+        print(self.results.objective_value)
+        print("Optimal generator dispatches:")
+        print(self.results.generator_production)
+        print("Price at optimality:")
+        print(self.results.price)
+
+
+def random_input_data(n_generators: int, seed: int = 0) -> InputData:
+    '''
+        Synthetic fleet with a load of half the total capacity and some linear-cost generators, used for benchmarks
+    '''
+    rng = np.random.default_rng(seed)
+    generators = [f'G{i}' for i in range(1, n_generators + 1)]
+    capacity = rng.uniform(50, 300, n_generators).round()
+    quadratic_cost = rng.uniform(0.01, 0.5, n_generators) * (rng.random(n_generators) > 0.1)
+    return InputData(
+        GENERATORS=generators,
+        LOADS=['L1'],
+        generator_quadratic_cost=quadratic_cost,
+        generator_cost=rng.uniform(0, 200, n_generators).round(),
+        generator_capacity=capacity,
+        load_capacity={'L1': float(capacity.sum() / 2)},
+    )
+
+
+def benchmark_lambda_iteration(sizes: tuple = (200, 10_000, 100_000, 1_000_000), qp_sizes: tuple = (200,), repeats: int = 20):
+    '''
+        Time of lambda_iteration (best of repeats) against the Gurobi QP, and difference of their prices
+    '''
+    print()
+    print("-------------------   LAMBDA-ITERATION BENCHMARK  -------------------")
+    print(f"{'generators':>12} {'lambda-iteration [ms]':>22} {'QP [s]':>9} {'price':>10} {'price diff':>11}")
+    env = shared_env()
+    for n_generators in sizes:
+        ec_model = QuadraticEconomicDispatch(random_input_data(n_generators))
+        timings = []
+        for _ in range(repeats):
+            ec_model.run()
+            timings.append(ec_model.timings.solve)
+        row = f"{n_generators:>12} {1e3 * min(timings):>22.3f}"
+        if n_generators in qp_sizes:
+            qp = QuadraticEconomicDispatch(ec_model.data, method='qp', env=env)
+            qp.run()
+            difference = abs(qp.results.price - ec_model.results.price)
+            row += f" {qp.timings.build + qp.timings.solve:>9.3f} {ec_model.results.price:>10.3f} {difference:>11.2e}"
+            qp.model.dispose()
+        else:
+            row += f" {'-':>9} {ec_model.results.price:>10.3f} {'-':>11}"
+        print(row)
+
+
+if __name__ == '__main__':
+    # Exercise 4 c): recorded Gurobi QP results are a cost of 13487.5, dispatch 105 / 95 / 0 MW and price 91
+    input_data = InputData(
+        GENERATORS=['g1', 'g2', 'g3'],
+        LOADS=['d1'],
+        generator_quadratic_cost={'g1': 0.1, 'g2': 0.4, 'g3': 0.2},
+        generator_cost={'g1': 70, 'g2': 15, 'g3': 150},
+        generator_capacity={'g1': 150, 'g2': 150, 'g3': 150},
+        load_capacity={'d1': 200},
+    )
+    for method in ('lambda-iteration', 'qp'):
+        ec_model = QuadraticEconomicDispatch(input_data, method=method)
+        ec_model.run()
+        ec_model.display_results()
+
+    if '--benchmark' in sys.argv:
+        benchmark_lambda_iteration()
@@ -0,0 +1,509 @@
+'''
+Uniform-price market clearing of Exercise 5 for large books of price-quantity blocks.
+Without a network, the welfare maximization is solved by sorting the supply and demand
+curves and intersecting them (merit order). With zones and interconnectors, the welfare
+LP is solved and the duals of the zonal balances are the prices.
+'''
+
+import os
+import sys
+import time
+
+import gurobipy as gp
+from gurobipy import GRB
+import numpy as np
+import scipy.sparse as sp
+
+# shared helpers in common.py at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import shared_env
+
+
+class Expando(object):
+    '''
+        A small class which can have attributes set
+    '''
+    pass
+
+
+class InputData:
+
+    def __init__(
+        self,
+        supply_price: np.ndarray,
+        supply_quantity: np.ndarray,
+        demand_price: np.ndarray,
+        demand_quantity: np.ndarray,
+        ZONES: list = None,
+        supply_zone: np.ndarray = None,
+        demand_zone: np.ndarray = None,
+        interconnector_from: np.ndarray = None,
+        interconnector_to: np.ndarray = None,
+        interconnector_capacity: np.ndarray = None,
+    ):
+        # Supply blocks offer price (c^G_i) and quantity (P^G_i)
+        self.supply_price = np.asarray(supply_price, dtype=float)
+        self.supply_quantity = np.asarray(supply_quantity, dtype=float)
+        # Demand blocks bid price (U^D_j) and quantity (P^D_j)
+        self.demand_price = np.asarray(demand_price, dtype=float)
+        self.demand_quantity = np.asarray(demand_quantity, dtype=float)
+        # List of zones, None for a single market without network
+        self.ZONES = ZONES
+        # Zone (position in ZONES) of every supply and demand block
+        self.supply_zone = None if supply_zone is None else np.asarray(supply_zone, dtype=int)
+        self.demand_zone = None if demand_zone is None else np.asarray(demand_zone, dtype=int)
+        # Interconnectors between zones (positions in ZONES) and their transfer capacity in both directions
+        self.interconnector_from = None if interconnector_from is None else np.asarray(interconnector_from, dtype=int)
+        self.interconnector_to = None if interconnector_to is None else np.asarray(interconnector_to, dtype=int)
+        self.interconnector_capacity = (
+            None if interconnector_capacity is None else np.asarray(interconnector_capacity, dtype=float)
+        )
+
+    @property
+    def has_network(self) -> bool:
+        return self.ZONES is not None and len(self.ZONES) > 1
+
+
+def merit_order_clearing(
+    supply_price: np.ndarray, supply_quantity: np.ndarray, demand_price: np.ndarray, demand_quantity: np.ndarray
+) -> tuple[float, float, float, np.ndarray, np.ndarray]:
+    '''
+        Intersect the supply curve (offers by increasing price) with the demand curve (bids by
+        decreasing price). Returns the cleared volume, the interval of market-clearing prices,
+        and the accepted quantity of every supply and demand block.
+        The interval is a single price whenever a block is partially accepted.
+    '''
+    supply_order = np.argsort(supply_price, kind='stable')
+    demand_order = np.argsort(-demand_price, kind='stable')
+    offer_price, offer_quantity = supply_price[supply_order], supply_quantity[supply_order]
+    bid_price, bid_quantity = demand_price[demand_order], demand_quantity[demand_order]
+    supply_end = np.cumsum(offer_quantity)
+    demand_end = np.cumsum(bid_quantity)
+    # block starts taken from the same cumulative sums, so that they compare exactly with the volume
+    supply_start = np.concatenate([[0.0], supply_end[:-1]])
+    demand_start = np.concatenate([[0.0], demand_end[:-1]])
+    total = min(supply_end[-1] if len(supply_end) else 0.0, demand_end[-1] if len(demand_end) else 0.0)
+
+    # both curves are constant between consecutive breakpoints, and a segment is traded as long as the
+    # marginal offer is not above the marginal bid. Offers increase and bids decrease, so the traded
+    # segments are a prefix of the breakpoints.
+    breakpoints = np.unique(np.concatenate([[0.0], supply_end[supply_end < total], demand_end[demand_end < total], [total]]))
+    starts = breakpoints[:-1]
+    traded = (
+        offer_price[np.searchsorted(supply_end, starts, side='right')]
+        <= bid_price[np.searchsorted(demand_end, starts, side='right')]
+    )
+    volume = breakpoints[np.count_nonzero(traded)]
+
+    accepted_supply = np.empty(len(supply_price))
+    accepted_supply[supply_order] = np.clip(volume - supply_start, 0, offer_quantity)
+    accepted_demand = np.empty(len(demand_price))
+    accepted_demand[demand_order] = np.clip(volume - demand_start, 0, bid_quantity)
+
+    # prices between the marginal accepted and the first rejected blocks of both curves
+    accepted_offers = offer_price[(supply_start < volume) & (offer_quantity > 0)]
+    rejected_offers = offer_price[supply_end > volume]
+    accepted_bids = bid_price[(demand_start < volume) & (bid_quantity > 0)]
+    rejected_bids = bid_price[demand_end > volume]
+    lower = max(accepted_offers.max(initial=-np.inf), rejected_bids.max(initial=-np.inf))
+    upper = min(accepted_bids.min(initial=np.inf), rejected_offers.min(initial=np.inf))
+    return volume, lower, upper, accepted_supply, accepted_demand
+
+
+class MarketClearing():
+    '''
+        method='merit-order' sorts and intersects the curves, method='lp' solves the welfare LP
+        (duals of the balances as prices), and method='auto' uses the merit order when there is no network.
+        With the merit order, the price is the offer or bid of the partially accepted block, or the
+        middle of the interval of market-clearing prices when no block is partially accepted.
+    '''
+
+    def __init__(self, input_data: InputData, method: str = 'auto', env: gp.Env = None):
+        if method not in ('auto', 'merit-order', 'lp'):
+            raise ValueError(f"unknown method {method}")
+        if method == 'merit-order' and input_data.has_network:
+            raise ValueError("the merit-order clearing does not support a network")
+        self.data = input_data # define data attributes
+        self.method = ('lp' if input_data.has_network else 'merit-order') if method == 'auto' else method
+        self.env = env
+        self.variables = Expando() # define variable attributes
+        self.constraints = Expando() # define constraints attributes
+        self.results = Expando() # define results attributes
+        self.timings = Expando() # define latency attributes (seconds)
+        if self.method == 'lp':
+            self._build_model() # build gurobi model
+
+    def _build_variables(self):
+        # build accepted supply and demand quantities, bounded by the block quantities,
+        # objective coefficients (U^D_j for demand, -c^G_i for supply) included
+        self.variables.supply = self.model.addMVar(
+            len(self.data.supply_price), lb=0, ub=self.data.supply_quantity, obj=-self.data.supply_price, name='Supply'
+        )
+        self.variables.demand = self.model.addMVar(
+            len(self.data.demand_price), lb=0, ub=self.data.demand_quantity, obj=self.data.demand_price, name='Demand'
+        )
+        if self.data.has_network:
+            # build interconnector flows, bounded by the transfer capacity in both directions
+            capacity = self.data.interconnector_capacity
+            self.variables.flow = self.model.addMVar(len(capacity), lb=-capacity, ub=capacity, name='Flow')
+
+    def _build_constraints(self):
+        data = self.data
+        if data.has_network:
+            n_zones = len(data.ZONES)
+            supply_incidence = sp.csr_matrix(
+                (np.ones(len(data.supply_zone)), (data.supply_zone, np.arange(len(data.supply_zone)))),
+                shape=(n_zones, len(data.supply_zone)),
+            )
+            demand_incidence = sp.csr_matrix(
+                (np.ones(len(data.demand_zone)), (data.demand_zone, np.arange(len(data.demand_zone)))),
+                shape=(n_zones, len(data.demand_zone)),
+            )
+            n_lines = len(data.interconnector_capacity)
+            lines = np.arange(n_lines)
+            flow_incidence = sp.csr_matrix(
+                (np.r_[np.ones(n_lines), -np.ones(n_lines)],
+                 (np.r_[data.interconnector_from, data.interconnector_to], np.r_[lines, lines])),
+                shape=(n_zones, n_lines),
+            )
+            # build zonal balance constraints: demand - supply + exports = 0, whose duals are the zonal prices
+            self.constraints.balance_constraint = self.model.addConstr(
+                demand_incidence @ self.variables.demand - supply_incidence @ self.variables.supply
+                + flow_incidence @ self.variables.flow == 0,
+                name='Balance',
+            )
+        else:
+            # build balance constraint: demand - supply = 0
+            self.constraints.balance_constraint = self.model.addConstr(
+                self.variables.demand.sum() - self.variables.supply.sum() == 0, name='Balance'
+            )
+
+    def _build_model(self):
+        start = time.perf_counter()
+        self.model = gp.Model(name='Market clearing', env=shared_env(self.env))
+        self._build_variables()
+        self.model.ModelSense = GRB.MAXIMIZE
+        self._build_constraints()
+        self.model.update()
+        self.timings.build = time.perf_counter() - start
+
+    def _save_results(self):
+        # save objective value (social welfare)
+        self.results.social_welfare = self.model.ObjVal
+        # save accepted quantities as arrays ordered like the blocks
+        self.results.accepted_supply = self.variables.supply.X
+        self.results.accepted_demand = self.variables.demand.X
+        # save prices (i.e., dual variables of balance constraints), one per zone with a network
+        prices = self.constraints.balance_constraint.Pi
+        self.results.price = prices if self.data.has_network else prices.item()
+        if self.data.has_network:
+            self.results.flow = self.variables.flow.X
+        self.results.volume = self.results.accepted_demand.sum()
+
+    def _clear_merit_order(self):
+        data = self.data
+        volume, lower, upper, accepted_supply, accepted_demand = merit_order_clearing(
+            data.supply_price, data.supply_quantity, data.demand_price, data.demand_quantity
+        )
+        self.results.volume = volume
+        self.results.accepted_supply = accepted_supply
+        self.results.accepted_demand = accepted_demand
+        self.results.social_welfare = data.demand_price @ accepted_demand - data.supply_price @ accepted_supply
+        self.results.price_interval = (lower, upper)
+        if lower == upper or not np.isfinite(upper):
+            self.results.price = lower
+        elif not np.isfinite(lower):
+            self.results.price = upper
+        else:
+            self.results.price = (lower + upper) / 2
+
+    def update(
+        self,
+        supply_price: np.ndarray = None,
+        supply_quantity: np.ndarray = None,
+        demand_price: np.ndarray = None,
+        demand_quantity: np.ndarray = None,
+    ):
+        '''
+            Change offers and bids in place, keeping the blocks and the network. The LP is not
+            rebuilt, so the next run() warm-starts from the previous simplex basis.
+        '''
+        start = time.perf_counter()
+        data = self.data
+        if supply_price is not None:
+            data.supply_price = np.asarray(supply_price, dtype=float)
+        if supply_quantity is not None:
+            data.supply_quantity = np.asarray(supply_quantity, dtype=float)
+        if demand_price is not None:
+            data.demand_price = np.asarray(demand_price, dtype=float)
+        if demand_quantity is not None:
+            data.demand_quantity = np.asarray(demand_quantity, dtype=float)
+        if self.method == 'lp':
+            if supply_price is not None:
+                self.variables.supply.Obj = -data.supply_price
+            if supply_quantity is not None:
+                self.variables.supply.UB = data.supply_quantity
+            if demand_price is not None:
+                self.variables.demand.Obj = data.demand_price
+            if demand_quantity is not None:
+                self.variables.demand.UB = data.demand_quantity
+        self.timings.update = time.perf_counter() - start
+
+    def run(self):
+        start = time.perf_counter()
+        if self.method == 'merit-order':
+            self._clear_merit_order()
+            self.timings.solve = time.perf_counter() - start
+            return
+        self.model.optimize()
+        self.timings.solve = time.perf_counter() - start
+        if self.model.status == GRB.OPTIMAL:
+            self._save_results()
+        else:
+            print(f"optimization of {self.model.ModelName} was not successful")
+
+    def display_results(self):
+        print()
+        print("-------------------   RESULTS  -------------------")
+        print("Optimal social welfare:")
+        print(self.results.social_welfare)
+        print("Accepted supply:")
+        print(self.results.accepted_supply)
+        print("Accepted demand:")
+        print(self.results.accepted_demand)
+        print("Market-clearing price:")
+        print(self.results.price)
+
+
+class ColumnarWriter:
+    '''
+        Results of a batch of auctions written column by column to one .npy file per column in
+        directory, through memory maps: rows are written as they come and flushed every flush_every
+        rows, so the batch never holds more than the open pages in memory. Read back with load_columns.
+        Without a directory the columns are plain in-memory arrays.
+    '''
+
+    def __init__(self, directory: str, n_rows: int, columns: dict[str, tuple], flush_every: int = 1000):
+        self.directory = directory
+        self.flush_every = flush_every
+        if directory is None:
+            self.columns = {name: np.empty((n_rows, *shape)) for name, shape in columns.items()}
+        else:
+            os.makedirs(directory, exist_ok=True)
+            self.columns = {
+                name: np.lib.format.open_memmap(
+                    os.path.join(directory, f'{name}.npy'), mode='w+', dtype=float, shape=(n_rows, *shape)
+                ) for name, shape in columns.items()
+            }
+        self.rows = 0
+
+    def write(self, row: int, **values):
+        for name, value in values.items():
+            self.columns[name][row] = value
+        self.rows += 1
+        if self.rows % self.flush_every == 0:
+            self.flush()
+
+    def flush(self):
+        if self.directory is not None:
+            for column in self.columns.values():
+                column.flush()
+
+
+def load_columns(directory: str) -> dict[str, np.ndarray]:
+    '''
+        Memory-mapped (read-only) columns written by ColumnarWriter
+    '''
+    return {
+        name[:-4]: np.load(os.path.join(directory, name), mmap_mode='r')
+        for name in sorted(os.listdir(directory)) if name.endswith('.npy')
+    }
+
+
+class BatchMarketClearing():
+    '''
+        Clear the same market for many hours. The market of input_data is built once as a template
+        and every hour only updates offer prices, bid prices and quantities (arrays with one row per
+        hour, None to keep the template values, input_data ends with the last hour). Prices, volume,
+        welfare and accepted quantities are streamed to a ColumnarWriter when a directory is given,
+        otherwise kept in memory as arrays.
+    '''
+
+    def __init__(self, input_data: InputData, method: str = 'auto', env: gp.Env = None):
+        self.market = MarketClearing(input_data, method=method, env=env)
+        if self.market.method == 'lp':
+            self.market.model.Params.OutputFlag = 0
+        self.results = Expando() # define results attributes
+        self.timings = Expando() # define latency attributes (seconds)
+
+    def run(
+        self,
+        supply_price: np.ndarray = None,
+        supply_quantity: np.ndarray = None,
+        demand_price: np.ndarray = None,
+        demand_quantity: np.ndarray = None,
+        directory: str = None,
+        flush_every: int = 1000,
+    ):
+        hourly = {
+            'supply_price': supply_price, 'supply_quantity': supply_quantity,
+            'demand_price': demand_price, 'demand_quantity': demand_quantity,
+        }
+        n_hours = max((len(values) for values in hourly.values() if values is not None), default=1)
+        data = self.market.data
+        n_zones = len(data.ZONES) if data.has_network else None
+        columns = {
+            'price': (n_zones,) if n_zones else (),
+            'volume': (),
+            'social_welfare': (),
+            'accepted_supply': (len(data.supply_price),),
+            'accepted_demand': (len(data.demand_price),),
+        }
+        writer = ColumnarWriter(directory, n_hours, columns, flush_every)
+        self.results.status = np.empty(n_hours, dtype=object)
+
+        start = time.perf_counter()
+        for hour in range(n_hours):
+            self.market.update(**{name: values[hour] for name, values in hourly.items() if values is not None})
+            self.market.run()
+            results = self.market.results
+            if self.market.method == 'lp' and self.market.model.status != GRB.OPTIMAL:
+                self.results.status[hour] = 'failed'
+                writer.write(hour, **{name: np.nan for name in columns})
+                continue
+            self.results.status[hour] = 'optimal'
+            writer.write(
+                hour,
+                price=results.price,
+                volume=results.volume,
+                social_welfare=results.social_welfare,
+                accepted_supply=results.accepted_supply,
+                accepted_demand=results.accepted_demand,
+            )
+        writer.flush()
+        if directory is None:
+            for name, values in writer.columns.items():
+                setattr(self.results, name, values)
+        self.results.directory = directory
+        self.timings.total = time.perf_counter() - start
+        self.timings.auctions_per_second = n_hours / self.timings.total
+
+
+def random_input_data(n_blocks: int, seed: int = 0) -> InputData:
+    '''
+        Synthetic book with n_blocks offers and n_blocks bids, used for benchmarks
+    '''
+    rng = np.random.default_rng(seed)
+    return InputData(
+        supply_price=rng.uniform(0, 150, n_blocks),
+        supply_quantity=rng.uniform(1, 50, n_blocks),
+        demand_price=rng.uniform(0, 300, n_blocks),
+        demand_quantity=rng.uniform(1, 50, n_blocks),
+    )
+
+
+def benchmark_market_clearing(sizes: tuple = (1_000, 10_000, 100_000, 1_000_000)):
+    '''
+        Compare the merit-order fast path against the welfare LP: time, welfare, and whether the LP
+        price lies in the interval of market-clearing prices found by the merit order
+    '''
+    print()
+    print("-------------------   MARKET CLEARING BENCHMARK  -------------------")
+    print(
+        f"{'blocks':>9} {'merit order [s]':>16} {'LP [s]':>9} {'speedup':>9} {'price':>9} "
+        f"{'LP price':>9} {'price in interval':>18} {'welfare diff':>13}"
+    )
+    env = shared_env()
+    for n_blocks in sizes:
+        input_data = random_input_data(n_blocks)
+        start = time.perf_counter()
+        fast = MarketClearing(input_data, method='merit-order')
+        fast.run()
+        fast_time = time.perf_counter() - start
+        start = time.perf_counter()
+        lp = MarketClearing(input_data, method='lp', env=env)
+        lp.run()
+        lp_time = time.perf_counter() - start
+        lower, upper = fast.results.price_interval
+        in_interval = lower - 1e-6 <= lp.results.price <= upper + 1e-6
+        print(
+            f"{2 * n_blocks:>9} {fast_time:>16.4f} {lp_time:>9.3f} {lp_time / fast_time:>8.0f}x "
+            f"{fast.results.price:>9.3f} {lp.results.price:>9.3f} {str(in_interval):>18} "
+            f"{abs(fast.results.social_welfare - lp.results.social_welfare):>13.2e}"
+        )
+        lp.model.dispose()
+
+
+def random_hourly_data(n_hours: int, n_blocks: int, seed: int = 0) -> tuple[InputData, dict[str, np.ndarray]]:
+    '''
+        Synthetic book whose capacities and utilities follow a daily profile with noise, used for benchmarks
+    '''
+    rng = np.random.default_rng(seed)
+    input_data = random_input_data(n_blocks, seed)
+    profile = 1 + 0.3 * np.sin(2 * np.pi * np.arange(n_hours) / 24)[:, None]
+    return input_data, {
+        'supply_quantity': input_data.supply_quantity * rng.uniform(0.8, 1.2, (n_hours, n_blocks)),
+        'demand_price': input_data.demand_price * profile * rng.uniform(0.9, 1.1, (n_hours, n_blocks)),
+        'demand_quantity': input_data.demand_quantity * profile * rng.uniform(0.9, 1.1, (n_hours, n_blocks)),
+    }
+
+
+def benchmark_batch_clearing(n_hours: int = 8_760, n_blocks: int = 200, n_rebuilt: int = 200, directory: str = 'batch_results'):
+    '''
+        Throughput of clearing n_hours auctions: one LP built per hour (timed on n_rebuilt hours),
+        the LP template updated in place, and the merit order, the last two streamed to directory
+    '''
+    print()
+    print("-------------------   BATCH CLEARING BENCHMARK  -------------------")
+    print(f"{n_hours} hours, {2 * n_blocks} blocks per auction")
+    print(f"{'mode':>16} {'auctions/s':>11} {'max price diff':>15}")
+    input_data, hourly = random_hourly_data(n_hours, n_blocks)
+    env = shared_env()
+
+    start = time.perf_counter()
+    rebuilt_prices = np.empty(n_rebuilt)
+    for hour in range(n_rebuilt):
+        market = MarketClearing(
+            InputData(
+                supply_price=input_data.supply_price,
+                supply_quantity=hourly['supply_quantity'][hour],
+                demand_price=hourly['demand_price'][hour],
+                demand_quantity=hourly['demand_quantity'][hour],
+            ),
+            method='lp',
+            env=env,
+        )
+        market.run()
+        rebuilt_prices[hour] = market.results.price
+        market.model.dispose()
+    print(f"{'LP rebuilt':>16} {n_rebuilt / (time.perf_counter() - start):>11.0f} {'-':>15}")
+
+    prices = {}
+    for method in ('lp', 'merit-order'):
+        batch = BatchMarketClearing(
+            InputData(input_data.supply_price, input_data.supply_quantity, input_data.demand_price, input_data.demand_quantity),
+            method=method,
+            env=env,
+        )
+        batch.run(**hourly, directory=os.path.join(directory, method))
+        prices[method] = load_columns(batch.results.directory)['price']
+        difference = np.abs(prices[method][:n_rebuilt] - rebuilt_prices).max()
+        print(f"{'LP template' if method == 'lp' else method:>16} {batch.timings.auctions_per_second:>11.0f} {difference:>15.2e}")
+
+
+if __name__ == '__main__':
+    # Exercise 5: W1, G1 and G2 offer 80 MWh each at 0, 30 and 35 $/MWh,
+    # D1 and D2 bid 100 and 50 MWh at 40 and 20 $/MWh
+    input_data = InputData(
+        supply_price = [0, 30, 35], # Generators costs (c^G_i)
+        supply_quantity = [80, 80, 80], # Generators capacity (P^G_i)
+        demand_price = [40, 20], # Loads utility (U^D_j)
+        demand_quantity = [100, 50], # Loads capacity (P^D_j)
+    )
+    market = MarketClearing(input_data)
+    market.run()
+    market.display_results()
+
+    if '--benchmark' in sys.argv:
+        benchmark_market_clearing()
+        benchmark_batch_clearing()
@@ -1,6 +1,17 @@
+from concurrent.futures import ProcessPoolExecutor
+import os
+import sys
+import time
+
 import gurobipy as gp
 from gurobipy import GRB
 import numpy as np
+from scipy.optimize import Bounds, LinearConstraint, linprog, milp
+import scipy.sparse as sp
+
+# shared helpers in common.py at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import LabeledArray, as_array, shared_env
 
 
 class Expando(object):
@@ -10,6 +21,17 @@ class Expando(object):
     pass
 
 
+class StochasticDispatchResults:
+    '''
+        Results of StochasticEconomicDispatch. Regulation is a (scenario, generator) LabeledArray,
+        balancing profits a (generator, scenario) one, as the nested dicts they replace.
+    '''
+    __slots__ = (
+        'objective_value', 'generator_DA_production', 'up_regulation', 'down_regulation', 'DA_price', 'B_price',
+        'DA_profits', 'B_profits', 'B_exp_profits', 'out_of_sample',
+    )
+
+
 class InputData:
     
     def __init__(
@@ -26,9 +48,11 @@ class InputData:
         wind_error: dict[str, float],
         wind_error_oos: dict[str, float],
         wind_mean: float,
+        pi: dict[str, float] = None,
     ):
         self.SCENARIOS = SCENARIOS
-        self.pi = {SCENARIOS[i]: 1/len(SCENARIOS) for i in range(len(SCENARIOS))}
+        # scenario probabilities, equal unless given
+        self.pi = pi if pi is not None else {SCENARIOS[i]: 1/len(SCENARIOS) for i in range(len(SCENARIOS))}
         self.GENERATORS = GENERATORS
         self.load_capacity = load_capacity
         self.generator_DA_cost = generator_DA_cost
@@ -42,15 +66,49 @@ class InputData:
         self.wind_mean = wind_mean
 
 
+def add_chance_constraint(model: gp.Model, formulation: str, binary: gp.Var, lhs, sense: str, big_M: float, name: str):
+    '''
+        Add "lhs sense 0", enforced only when binary = 1,
+        as a big-M constraint or as a gurobi indicator constraint
+    '''
+    if formulation == 'indicator':
+        return model.addGenConstrIndicator(binary, True, lhs, sense, 0, name=name)
+    if sense == GRB.LESS_EQUAL:
+        return model.addLConstr(lhs, GRB.LESS_EQUAL, (1 - binary) * big_M, name=name)
+    return model.addLConstr(lhs, GRB.GREATER_EQUAL, -(1 - binary) * big_M, name=name)
+
+
 class StochasticEconomicDispatch():
 
-    def __init__(self, input_data: InputData, epsilon: float = 0.0):
+    def __init__(
+        self,
+        input_data: InputData,
+        epsilon: float = 0.0,
+        env: gp.Env = None,
+        formulation: str = 'big-M',
+        backend: str = 'gurobi',
+    ):
+        if backend not in ('gurobi', 'highs'):
+            raise ValueError(f"unknown backend {backend}")
+        if backend == 'highs' and formulation == 'indicator':
+            raise ValueError("indicator constraints need the gurobi backend, use formulation='tight'")
         self.data = input_data
         self.epsilon = epsilon
+        # chance constraints as 'big-M' (global M, integer indicators), 'tight' (per-constraint M, binaries)
+        # or 'indicator' (gurobi indicator constraints on binaries)
+        self.formulation = formulation
+        self.env = env # gurobi environment to build the models in (None for the shared one of this process)
+        # 'gurobi' builds a gurobi model, 'highs' the same MILP as sparse matrices solved by HiGHS
+        # (scipy.optimize.milp), which needs no gurobi license
+        self.backend = backend
         self.variables = Expando()
         self.constraints = Expando()
-        self.results = Expando()
-        self.model = self._build_model()
+        self.results = StochasticDispatchResults()
+        self.big_M = 10000
+        if backend == 'gurobi':
+            self.model = self._build_model()
+        else:
+            self.matrices = self._build_matrices()
 
     def _build_variables(self, model: gp.Model):
         self.variables.generator_DA_production = {
@@ -69,27 +127,69 @@ class StochasticEconomicDispatch():
             ) for k in self.data.SCENARIOS for g in self.data.GENERATORS
         }
         # add binary variables for chance constraints
+        # (the original big-M formulation declares them as unbounded integers)
         self.big_M = 10000
+        vtype = GRB.INTEGER if self.formulation == 'big-M' else GRB.BINARY
         self.variables.binary_RT_balance = {
             k: model.addVar(
-                vtype=GRB.INTEGER, name='Binary var for real-time balance constraint'
+                vtype=vtype, name='Binary var for real-time balance constraint'
             ) for k in self.data.SCENARIOS
         }
         self.variables.binary_max_production = {
             k: model.addVar(
-                vtype=GRB.INTEGER, name='Binary var for max production constraint'
+                vtype=vtype, name='Binary var for max production constraint'
             ) for k in self.data.SCENARIOS
         }
         self.variables.binary_max_ramp = {
             k: model.addVar(
-                vtype=GRB.INTEGER, name='Binary var for max ramp constraint'
+                vtype=vtype, name='Binary var for max ramp constraint'
             ) for k in self.data.SCENARIOS
         }
         
         return model
 
+    def _compute_big_M(self, oos: bool = False):
+        '''
+            Smallest big-M of each chance constraint, i.e. the largest violation
+            its left-hand side can reach within the variable bounds
+        '''
+        big_M = Expando()
+        wind_error = self.data.wind_error_oos if oos else self.data.wind_error
+        big_M.RT_balance_lower = sum(self.data.generator_down_capacity.values())
+        big_M.RT_balance_upper = sum(self.data.generator_up_capacity.values())
+        big_M.min_production = {
+            g: max(0, self.data.generator_down_capacity[g]) for g in self.data.GENERATORS
+        }
+        big_M.max_production = {
+            g: max(0, self.data.generator_up_capacity[g]) for g in self.data.GENERATORS
+        }
+        big_M.max_production_G2 = {
+            k: max(
+                0,
+                self.data.generator_capacity['G2'] + self.data.generator_up_capacity['G2']
+                - (self.data.wind_mean + self.data.generator_capacity['G2'] * wind_error[k]),
+            ) for k in self.data.SCENARIOS
+        }
+        # up/down-regulation can never exceed its capacity (variable bounds),
+        # so the ramp constraints need no relaxation at all
+        big_M.max_ramp_up = {g: 0 for g in self.data.GENERATORS}
+        big_M.max_ramp_down = {g: 0 for g in self.data.GENERATORS}
+        return big_M
+
+    def _add_chance_constraint(self, model: gp.Model, binary: gp.Var, lhs, sense: str, big_M: float, name: str):
+        return add_chance_constraint(model, self.formulation, binary, lhs, sense, big_M, name)
+
     def _build_constraints(self, model: gp.Model, oos: bool = False):
-        self.constraints.DA_balance = model.addConstr(
+        if self.formulation == 'big-M':
+            big_M = Expando()
+            big_M.RT_balance_lower = big_M.RT_balance_upper = self.big_M
+            big_M.min_production = big_M.max_production = big_M.max_ramp_up = big_M.max_ramp_down = {
+                g: self.big_M for g in self.data.GENERATORS
+            }
+            big_M.max_production_G2 = {k: self.big_M for k in self.data.SCENARIOS}
+        else:
+            big_M = self._compute_big_M(oos)
+        self.constraints.DA_balance = model.addLConstr(
             gp.quicksum(
                 self.variables.generator_DA_production[g]
                 for g in self.data.GENERATORS
@@ -99,41 +199,49 @@ class StochasticEconomicDispatch():
             name='Day-ahead balance equation',
         )
         self.constraints.RT_balance_lower = {
-            k: model.addConstr(
+            k: self._add_chance_constraint(
+                model,
+                self.variables.binary_RT_balance[k],
                 gp.quicksum(
                     self.variables.up_regulation[(g,k)] - self.variables.down_regulation[(g,k)]
                     for g in self.data.GENERATORS
                 ),
                 GRB.GREATER_EQUAL,
-                (-(1 - self.variables.binary_RT_balance[k]) * self.big_M),
-                name='Real-time balance equation',
+                big_M.RT_balance_lower,
+                name=f'Real-time balance equation lower[{k}]',
             ) for k in self.data.SCENARIOS
         }
         self.constraints.RT_balance_upper = {
-            k: model.addConstr(
+            k: self._add_chance_constraint(
+                model,
+                self.variables.binary_RT_balance[k],
                 gp.quicksum(
                     self.variables.up_regulation[(g,k)] - self.variables.down_regulation[(g,k)]
                     for g in self.data.GENERATORS
                 ),
                 GRB.LESS_EQUAL,
-                ((1 - self.variables.binary_RT_balance[k]) * self.big_M),
-                name='Real-time balance equation',
+                big_M.RT_balance_upper,
+                name=f'Real-time balance equation upper[{k}]',
             ) for k in self.data.SCENARIOS
         }
         self.constraints.min_production_constraints = {
-            (g,k): model.addLConstr(
-                (- (1 - self.variables.binary_max_production[k]) * self.big_M),
-                GRB.LESS_EQUAL,
+            (g,k): self._add_chance_constraint(
+                model,
+                self.variables.binary_max_production[k],
                 (
                     self.variables.generator_DA_production[g]
                     + self.variables.up_regulation[(g,k)] 
                     - self.variables.down_regulation[(g,k)]
                 ),
+                GRB.GREATER_EQUAL,
+                big_M.min_production[g],
                 name='Min production constraint',
             ) for k in self.data.SCENARIOS for g in self.data.GENERATORS
         }
         self.constraints.max_production_constraints = {
-            (g,k): model.addLConstr(
+            (g,k): self._add_chance_constraint(
+                model,
+                self.variables.binary_max_production[k],
                 (
                     self.variables.generator_DA_production[g]
                     + self.variables.up_regulation[(g,k)] 
@@ -141,12 +249,14 @@ class StochasticEconomicDispatch():
                     - self.data.generator_capacity[g]
                 ),
                 GRB.LESS_EQUAL,
-                (1 - self.variables.binary_max_production[k]) * self.big_M,
+                big_M.max_production[g],
                 name='Max production constraint',
             ) for k in self.data.SCENARIOS for g in self.data.GENERATORS if g != 'G2'
         }
         self.constraints.max_production_constraints_G2 = {
-            k: model.addLConstr(
+            k: self._add_chance_constraint(
+                model,
+                self.variables.binary_max_production[k],
                 (
                     self.variables.generator_DA_production['G2']
                     + self.variables.up_regulation[('G2',k)] 
@@ -158,47 +268,51 @@ class StochasticEconomicDispatch():
                     * (self.data.wind_error_oos[k] if oos else self.data.wind_error[k])
                 ),
                 GRB.LESS_EQUAL,
-                ((1 - self.variables.binary_max_production[k]) * self.big_M),
+                big_M.max_production_G2[k],
                 name='Max production constraint',
             ) for k in self.data.SCENARIOS
         }
         self.constraints.max_ramp_up_constraints = {
-            (g,k): model.addLConstr(
+            (g,k): self._add_chance_constraint(
+                model,
+                self.variables.binary_max_ramp[k],
                 self.variables.up_regulation[(g,k)] - self.data.generator_up_capacity[g],
                 GRB.LESS_EQUAL,
-                ((1 - self.variables.binary_max_ramp[k]) * self.big_M),
+                big_M.max_ramp_up[g],
                 name='Max up-regulation constraint',
             ) for k in self.data.SCENARIOS for g in self.data.GENERATORS
         }
         self.constraints.max_ramp_down_constraints = {
-            (g,k): model.addLConstr(
+            (g,k): self._add_chance_constraint(
+                model,
+                self.variables.binary_max_ramp[k],
                 self.variables.down_regulation[(g,k)] - self.data.generator_down_capacity[g],
                 GRB.LESS_EQUAL,
-                ((1 - self.variables.binary_max_ramp[k]) * self.big_M),
+                big_M.max_ramp_down[g],
                 name='Max down-regulation constraint',
             ) for k in self.data.SCENARIOS for g in self.data.GENERATORS
         }
         # Constraints on rate of violation for RT constraints
         self.constraints.binary_RT_balance = model.addLConstr(
             gp.quicksum(
-                self.variables.binary_RT_balance[k] for k in self.data.SCENARIOS
-            ) / len(self.data.SCENARIOS),
+                self.data.pi[k] * self.variables.binary_RT_balance[k] for k in self.data.SCENARIOS
+            ),
             GRB.GREATER_EQUAL,
             1 - self.epsilon,
             name='Binary RT constraint',
         )
         self.constraints.binary_max_production = model.addLConstr(
             gp.quicksum(
-                self.variables.binary_max_production[k] for k in self.data.SCENARIOS
-            ) / len(self.data.SCENARIOS),
+                self.data.pi[k] * self.variables.binary_max_production[k] for k in self.data.SCENARIOS
+            ),
             GRB.GREATER_EQUAL,
             1 - self.epsilon,
             name='Binary max production constraint',
         )
         self.constraints.binary_max_ramp = model.addLConstr(
             gp.quicksum(
-                self.variables.binary_max_ramp[k] for k in self.data.SCENARIOS
-            ) / len(self.data.SCENARIOS),
+                self.data.pi[k] * self.variables.binary_max_ramp[k] for k in self.data.SCENARIOS
+            ),
             GRB.GREATER_EQUAL,
             1 - self.epsilon,
             name='Binary max ramp constraint',
@@ -239,55 +353,245 @@ class StochasticEconomicDispatch():
         return model
 
     def _build_model(self, oos: bool = False):
-        model = gp.Model(name='Two-stage stochastic economic dispatch')
+        model = gp.Model(name='Two-stage stochastic economic dispatch', env=shared_env(self.env))
         model = self._build_variables(model)
         model = self._build_constraints(model, oos)
         model = self._build_objective_function(model, oos)
         model.update()
         return model
 
+    def _build_matrices(self, oos: bool = False) -> Expando:
+        '''
+            The MILP of _build_model as sparse matrices, with the variables ordered as in the gurobi model:
+            DA dispatch, up-regulation and down-regulation (scenario-major), then the three binaries of
+            every scenario. Rows are the constraints of _build_constraints in the same order.
+        '''
+        data = self.data
+        generators, scenarios = data.GENERATORS, data.SCENARIOS
+        n_g, n_k = len(generators), len(scenarios)
+        wind_error = as_array(data.wind_error_oos if oos else data.wind_error, scenarios)
+        pi = as_array(data.pi, scenarios)
+        capacity = as_array(data.generator_capacity, generators)
+        up_capacity = as_array(data.generator_up_capacity, generators)
+        down_capacity = as_array(data.generator_down_capacity, generators)
+        if self.formulation == 'big-M':
+            M_balance_lower = M_balance_upper = self.big_M
+            M_min_production = M_max_production = M_ramp_up = M_ramp_down = np.full(n_g, float(self.big_M))
+            M_max_production_G2 = np.full(n_k, float(self.big_M))
+        else:
+            big_M = self._compute_big_M(oos)
+            M_balance_lower, M_balance_upper = big_M.RT_balance_lower, big_M.RT_balance_upper
+            M_min_production = as_array(big_M.min_production, generators)
+            M_max_production = as_array(big_M.max_production, generators)
+            M_ramp_up = as_array(big_M.max_ramp_up, generators)
+            M_ramp_down = as_array(big_M.max_ramp_down, generators)
+            M_max_production_G2 = as_array(big_M.max_production_G2, scenarios)
+
+        # column indices, (scenario, generator) pairs in the order of the gurobi model
+        k, g = np.divmod(np.arange(n_k * n_g), n_g)
+        DA, up, down = g, n_g + k * n_g + g, n_g + n_g * n_k + k * n_g + g
+        binary_RT, binary_production, binary_ramp = (n_g + 2 * n_g * n_k + i * n_k + np.arange(n_k) for i in range(3))
+        n_variables = n_g + 2 * n_g * n_k + 3 * n_k
+        blocks = []
+
+        def add_rows(columns: list, values: list, sense: str, rhs: np.ndarray):
+            # one row per entry of rhs, columns and values are lists of per-row arrays (or scalars)
+            n_rows = len(rhs)
+            blocks.append((
+                np.tile(np.arange(n_rows), len(columns)),
+                np.concatenate([np.broadcast_to(c, (n_rows,)) for c in columns]),
+                np.concatenate([np.broadcast_to(np.asarray(v, dtype=float), (n_rows,)) for v in values]),
+                np.full(n_rows, sense),
+                np.asarray(rhs, dtype=float),
+            ))
+
+        # DA balance
+        add_rows(list(range(n_g)), [1] * n_g, GRB.EQUAL, [data.load_capacity])
+        # RT balance: sum_g up - down within (1 - b) M of zero, one row per scenario and side
+        up_by_scenario, down_by_scenario = up.reshape(n_k, n_g).T, down.reshape(n_k, n_g).T
+        add_rows(
+            [*up_by_scenario, *down_by_scenario, binary_RT],
+            [1] * n_g + [-1] * n_g + [-M_balance_lower],
+            GRB.GREATER_EQUAL,
+            np.full(n_k, -M_balance_lower),
+        )
+        add_rows(
+            [*up_by_scenario, *down_by_scenario, binary_RT],
+            [1] * n_g + [-1] * n_g + [M_balance_upper],
+            GRB.LESS_EQUAL,
+            np.full(n_k, M_balance_upper),
+        )
+        # min and max production of every (scenario, generator), G2 limited by the wind instead
+        not_G2 = np.array([generators[i] != 'G2' for i in g])
+        add_rows([DA, up, down, binary_production[k]], [1, 1, -1, -M_min_production[g]], GRB.GREATER_EQUAL, -M_min_production[g])
+        add_rows(
+            [DA[not_G2], up[not_G2], down[not_G2], binary_production[k[not_G2]]],
+            [1, 1, -1, M_max_production[g[not_G2]]],
+            GRB.LESS_EQUAL,
+            M_max_production[g[not_G2]] + capacity[g[not_G2]],
+        )
+        G2 = generators.index('G2')
+        add_rows(
+            [G2, up[G2::n_g], down[G2::n_g], binary_production],
+            [1, 1, -1, M_max_production_G2],
+            GRB.LESS_EQUAL,
+            M_max_production_G2 + data.wind_mean + capacity[G2] * wind_error,
+        )
+        # up- and down-regulation limits
+        add_rows([up, binary_ramp[k]], [1, M_ramp_up[g]], GRB.LESS_EQUAL, M_ramp_up[g] + up_capacity[g])
+        add_rows([down, binary_ramp[k]], [1, M_ramp_down[g]], GRB.LESS_EQUAL, M_ramp_down[g] + down_capacity[g])
+        # rate of violation of each chance constraint
+        for binary in (binary_RT, binary_production, binary_ramp):
+            add_rows(list(binary), list(pi), GRB.GREATER_EQUAL, [1 - self.epsilon])
+        if oos:
+            # DA dispatch fixed to the in-sample solution
+            DA_production = as_array(self.results.generator_DA_production, generators)
+            add_rows([np.arange(n_g)], [1], GRB.EQUAL, DA_production)
+
+        matrices = Expando()
+        offsets = np.cumsum([0] + [len(block[4]) for block in blocks])
+        rows = np.concatenate([block[0] + offset for block, offset in zip(blocks, offsets)])
+        columns = np.concatenate([block[1] for block in blocks])
+        values = np.concatenate([block[2] for block in blocks])
+        matrices.A = sp.csr_matrix((values, (rows, columns)), shape=(offsets[-1], n_variables))
+        matrices.sense = np.concatenate([block[3] for block in blocks])
+        matrices.rhs = np.concatenate([block[4] for block in blocks])
+        # rows of the DA balance and of the lower and upper RT balance of every scenario
+        matrices.DA_balance_row = 0
+        matrices.RT_balance_rows = (1 + np.arange(n_k), 1 + n_k + np.arange(n_k))
+
+        matrices.c = np.zeros(n_variables)
+        matrices.c[:n_g] = as_array(data.generator_DA_cost, generators)
+        matrices.c[up] = pi[k] * as_array(data.generator_up_cost, generators)[g]
+        matrices.c[down] = -pi[k] * as_array(data.generator_down_cost, generators)[g]
+        matrices.constant = 0.0
+        if oos:
+            # penalty big_M (1 - b) of every violated chance constraint
+            matrices.c[n_g + 2 * n_g * n_k:] = -self.big_M
+            matrices.constant = 3 * n_k * self.big_M
+        matrices.lower_bounds = np.zeros(n_variables)
+        matrices.upper_bounds = np.concatenate([
+            capacity, up_capacity[g], down_capacity[g],
+            np.full(3 * n_k, np.inf if self.formulation == 'big-M' else 1.0),
+        ])
+        matrices.integrality = np.concatenate([np.zeros(n_g + 2 * n_g * n_k), np.ones(3 * n_k)])
+        return matrices
+
+    def _solve_highs(self):
+        '''
+            Solve the MILP with HiGHS, then the LP with the integer variables fixed at the solution
+            (as gurobi's fixed model) for the duals, mapped to gurobi's sign convention
+        '''
+        matrices = self.matrices
+        equal, less = matrices.sense == GRB.EQUAL, matrices.sense == GRB.LESS_EQUAL
+        greater = matrices.sense == GRB.GREATER_EQUAL
+        solution = milp(
+            matrices.c,
+            integrality=matrices.integrality,
+            bounds=Bounds(matrices.lower_bounds, matrices.upper_bounds),
+            constraints=LinearConstraint(
+                matrices.A,
+                np.where(less, -np.inf, matrices.rhs),
+                np.where(greater, np.inf, matrices.rhs),
+            ),
+        )
+        if solution.status != 0:
+            return solution, None
+        integer = matrices.integrality > 0
+        lower_bounds = np.where(integer, np.round(solution.x), matrices.lower_bounds)
+        upper_bounds = np.where(integer, np.round(solution.x), matrices.upper_bounds)
+        fixed = linprog(
+            matrices.c,
+            A_ub=sp.vstack([matrices.A[less], -matrices.A[greater]], format='csr'),
+            b_ub=np.concatenate([matrices.rhs[less], -matrices.rhs[greater]]),
+            A_eq=matrices.A[equal],
+            b_eq=matrices.rhs[equal],
+            bounds=np.column_stack([lower_bounds, upper_bounds]),
+            method='highs',
+        )
+        if fixed.status != 0:
+            raise RuntimeError(f'the fixed LP of the stochastic economic dispatch with HiGHS was not solved for the duals ({fixed.message})')
+        duals = np.zeros(len(matrices.rhs))
+        n_less = int(less.sum())
+        duals[less] = fixed.ineqlin.marginals[:n_less]
+        duals[greater] = -fixed.ineqlin.marginals[n_less:]
+        duals[equal] = fixed.eqlin.marginals
+        return solution, duals
+
+    def _save_solution(self, objective_value: float, x: np.ndarray, DA_price: float, RT_balance_duals: np.ndarray):
+        '''
+            Store the results from the values of all variables (DA dispatch, then up- and down-regulation
+            ordered by scenario and generator) and the duals of the balance constraints
+        '''
+        data = self.data
+        n_g, n_k = len(data.GENERATORS), len(data.SCENARIOS)
+        self.results.objective_value = objective_value
+        self.results.generator_DA_production = LabeledArray(x[:n_g], data.GENERATORS)
+        self.results.up_regulation = LabeledArray(
+            x[n_g:n_g + n_g * n_k].reshape(n_k, n_g), data.SCENARIOS, data.GENERATORS
+        )
+        self.results.down_regulation = LabeledArray(
+            x[n_g + n_g * n_k:n_g + 2 * n_g * n_k].reshape(n_k, n_g), data.SCENARIOS, data.GENERATORS
+        )
+        self.results.DA_price = float(DA_price)
+        self.results.B_price = LabeledArray(RT_balance_duals / as_array(data.pi, data.SCENARIOS), data.SCENARIOS)
+        self._save_profits()
+
+    def _save_results_highs(self, solution, duals: np.ndarray):
+        lower_rows, upper_rows = self.matrices.RT_balance_rows
+        self._save_solution(
+            solution.fun + self.matrices.constant,
+            solution.x,
+            duals[self.matrices.DA_balance_row],
+            duals[lower_rows] + duals[upper_rows],
+        )
+
     def _save_results(self):
-        self.results.objective_value = self.model.ObjVal
-        self.results.generator_DA_production = {
-            g: self.variables.generator_DA_production[g].x
-            for g in self.data.GENERATORS
-        }
-        self.results.up_regulation = {
-            k: {
-                g: self.variables.up_regulation[(g,k)].x 
-                for g in self.data.GENERATORS
-            } for k in self.data.SCENARIOS
-        }
-        self.results.down_regulation = {
-            k: {
-                g: self.variables.down_regulation[(g,k)].x
-                for g in self.data.GENERATORS
-            } for k in self.data.SCENARIOS
-        }
-        self.results.DA_price = self.fixed_model.getConstrs()[0].Pi
-        self.results.B_price = {
-            k: 10 * self.fixed_model.getConstrs()[i+1].Pi for i,k in enumerate(self.data.SCENARIOS)
-        }
-        self.results.DA_profits = {
-            g: round((self.results.DA_price - self.data.generator_DA_cost[g]) * self.results.generator_DA_production[g], 2)
-            for g in self.data.GENERATORS
-        }
-        self.results.B_profits = {
-            g: {
-                k: round(
-                    (self.results.B_price[k] - self.data.generator_up_cost[g]) * self.results.up_regulation[k][g] 
-                    + (self.data.generator_down_cost[g] - self.results.B_price[k]) * self.results.down_regulation[k][g], 
-                    2,
-                )
+        # one attribute query for all variables and one for all duals of the fixed model
+        x = np.array(self.model.getAttr(GRB.Attr.X))
+        constraints = self.fixed_model.getConstrs()
+        # duals looked up by name: the fixed model turns indicator constraints into linear rows after the
+        # others, and drops those whose binary is 0 (a relaxed constraint, so its dual is 0)
+        duals = dict(zip(
+            self.fixed_model.getAttr(GRB.Attr.ConstrName, constraints), self.fixed_model.getAttr(GRB.Attr.Pi, constraints)
+        ))
+        # the lower and upper RT balance rows share their left-hand side, so the balancing price is the
+        # sum of their duals (the solver may put it on either row)
+        RT_balance_duals = np.fromiter(
+            (
+                duals.get(f'Real-time balance equation lower[{k}]', 0.0)
+                + duals.get(f'Real-time balance equation upper[{k}]', 0.0)
                 for k in self.data.SCENARIOS
-            } for g in self.data.GENERATORS
-        }
-        self.results.B_exp_profits = {
-            g: round(np.mean(list(self.results.B_profits[g].values()))) 
-            for g in self.data.GENERATORS
-        }
+            ),
+            dtype=float,
+            count=len(self.data.SCENARIOS),
+        )
+        self._save_solution(self.model.ObjVal, x, duals['Day-ahead balance equation'], RT_balance_duals)
+
+    def _save_profits(self):
+        data = self.data
+        results = self.results
+        B_price = results.B_price.array
+        DA_profits = (results.DA_price - as_array(data.generator_DA_cost, data.GENERATORS)) * results.generator_DA_production.array
+        # (generator, scenario), from the (scenario, generator) regulation
+        B_profits = (
+            (B_price[None, :] - as_array(data.generator_up_cost, data.GENERATORS)[:, None]) * results.up_regulation.array.T
+            + (as_array(data.generator_down_cost, data.GENERATORS)[:, None] - B_price[None, :]) * results.down_regulation.array.T
+        )
+        results.DA_profits = LabeledArray(DA_profits.round(2), data.GENERATORS)
+        results.B_profits = LabeledArray(B_profits.round(2), data.GENERATORS, data.SCENARIOS)
+        # expectation over the scenario probabilities, which are not equal after scenario reduction
+        results.B_exp_profits = LabeledArray(
+            (B_profits @ as_array(data.pi, data.SCENARIOS)).round().astype(int), data.GENERATORS
+        )
 
     def run(self):
+        if self.backend == 'highs':
+            solution, duals = self._solve_highs()
+            if solution.status != 0:
+                raise RuntimeError(f'optimization of the stochastic economic dispatch with HiGHS was not successful ({solution.message})')
+            self._save_results_highs(solution, duals)
+            return
         self.model.optimize()
         self.fixed_model = self.model.fixed()
         self.fixed_model.optimize()
@@ -330,14 +634,661 @@ class StochasticEconomicDispatch():
         }
         return model
 
+    def evaluate_out_of_sample(self, wind_error_oos=None, processes: int = 1, chunk_size: int = 1000):
+        '''
+            Evaluate the fixed DA dispatch on out-of-sample wind errors (default: data.wind_error_oos)
+            without rebuilding the full MIP. Each scenario decouples into a small recourse problem,
+            solved by an OutOfSampleEvaluator, and chunks of scenarios are spread over a process pool.
+            Returns the cost and violation distributions in self.results.out_of_sample.
+        '''
+        if wind_error_oos is None:
+            wind_error_oos = [self.data.wind_error_oos[k] for k in self.data.SCENARIOS]
+        wind_error_oos = np.asarray(wind_error_oos, dtype=float)
+        chunks = [wind_error_oos[i:i + chunk_size] for i in range(0, len(wind_error_oos), chunk_size)]
+        job = (self.data, self.results.generator_DA_production, self.formulation, self.big_M)
+        if processes == 1:
+            evaluator = OutOfSampleEvaluator(*job, env=self.env)
+            parts = [evaluator.evaluate(chunk) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=processes, initializer=_init_sweep_worker) as pool:
+                parts = list(pool.map(_evaluate_out_of_sample_chunk, [job] * len(chunks), chunks))
+
+        out_of_sample = Expando()
+        for key in parts[0]:
+            setattr(out_of_sample, key, np.concatenate([part[key] for part in parts]))
+        DA_cost = sum(
+            self.data.generator_DA_cost[g] * self.results.generator_DA_production[g] for g in self.data.GENERATORS
+        )
+        out_of_sample.cost = DA_cost + out_of_sample.balancing_cost
+        out_of_sample.expected_cost = float(out_of_sample.cost.mean())
+        out_of_sample.violation_rate = {
+            'RT_balance': float(out_of_sample.RT_balance_violation.mean()),
+            'max_production': float(out_of_sample.max_production_violation.mean()),
+            'max_ramp': float(out_of_sample.max_ramp_violation.mean()),
+            'any': float((
+                out_of_sample.RT_balance_violation
+                | out_of_sample.max_production_violation
+                | out_of_sample.max_ramp_violation
+            ).mean()),
+        }
+        self.results.out_of_sample = out_of_sample
+        return out_of_sample
+
     def build_out_of_sample(self):
         # epsilon is set to 0 to allow constraint violations instead of having an infeasible model
         # constraint violations are penalized in the objective function 
         self.epsilon = 1
+        if self.backend == 'highs':
+            self.matrices = self._build_matrices(oos=True)
+            return
         self.model = self._build_model(oos=True)
         self.model = self._build_oos_constraints(self.model)
 
 
+class OutOfSampleEvaluator():
+    '''
+        Recourse of a fixed DA dispatch for one out-of-sample wind scenario at a time.
+        The scenario model is built once; each scenario only changes the bounds of
+        the wind variable. Constraint violations are allowed and penalized with big_M,
+        as in StochasticEconomicDispatch.build_out_of_sample.
+    '''
+
+    def __init__(
+        self,
+        input_data: InputData,
+        generator_DA_production: dict[str, float],
+        formulation: str = 'big-M',
+        big_M: float = 10000,
+        env: gp.Env = None,
+    ):
+        self.data = input_data
+        self.generator_DA_production = generator_DA_production
+        self.formulation = formulation
+        self.big_M = big_M
+        self.variables = Expando()
+        self.constraints = Expando()
+        self.model = self._build_model(env)
+
+    def _build_model(self, env: gp.Env):
+        model = gp.Model(name='Out-of-sample recourse', env=shared_env(env))
+        self.variables.up_regulation = {
+            g: model.addVar(lb=0, ub=self.data.generator_up_capacity[g], name='Up-regulation in BM')
+            for g in self.data.GENERATORS
+        }
+        self.variables.down_regulation = {
+            g: model.addVar(lb=0, ub=self.data.generator_down_capacity[g], name='Down-regulation in BM')
+            for g in self.data.GENERATORS
+        }
+        # available wind production, fixed through its bounds for each scenario
+        self.variables.wind = model.addVar(lb=0, ub=0, name='Available wind production')
+        self.variables.binary_RT_balance = model.addVar(vtype=GRB.BINARY, name='Binary var for real-time balance constraint')
+        self.variables.binary_max_production = model.addVar(vtype=GRB.BINARY, name='Binary var for max production constraint')
+        self.variables.binary_max_ramp = model.addVar(vtype=GRB.BINARY, name='Binary var for max ramp constraint')
+
+        # big-M values valid for every wind realization (the tight G2 value uses zero wind)
+        if self.formulation == 'big-M':
+            big_M_balance_lower = big_M_balance_upper = self.big_M
+            big_M_min_production = big_M_max_production = {g: self.big_M for g in self.data.GENERATORS}
+        else:
+            big_M_balance_lower = sum(self.data.generator_down_capacity.values())
+            big_M_balance_upper = sum(self.data.generator_up_capacity.values())
+            big_M_min_production = {g: max(0, self.data.generator_down_capacity[g]) for g in self.data.GENERATORS}
+            big_M_max_production = {g: max(0, self.data.generator_up_capacity[g]) for g in self.data.GENERATORS}
+            big_M_max_production['G2'] = self.data.generator_capacity['G2'] + self.data.generator_up_capacity['G2']
+
+        regulation = gp.quicksum(
+            self.variables.up_regulation[g] - self.variables.down_regulation[g] for g in self.data.GENERATORS
+        )
+        production = {
+            g: self.generator_DA_production[g] + self.variables.up_regulation[g] - self.variables.down_regulation[g]
+            for g in self.data.GENERATORS
+        }
+        self.constraints.RT_balance_lower = add_chance_constraint(
+            model, self.formulation, self.variables.binary_RT_balance, regulation,
+            GRB.GREATER_EQUAL, big_M_balance_lower, 'Real-time balance equation',
+        )
+        self.constraints.RT_balance_upper = add_chance_constraint(
+            model, self.formulation, self.variables.binary_RT_balance, regulation,
+            GRB.LESS_EQUAL, big_M_balance_upper, 'Real-time balance equation',
+        )
+        self.constraints.min_production_constraints = {
+            g: add_chance_constraint(
+                model, self.formulation, self.variables.binary_max_production, production[g],
+                GRB.GREATER_EQUAL, big_M_min_production[g], 'Min production constraint',
+            ) for g in self.data.GENERATORS
+        }
+        self.constraints.max_production_constraints = {
+            g: add_chance_constraint(
+                model, self.formulation, self.variables.binary_max_production,
+                production[g] - (self.variables.wind if g == 'G2' else self.data.generator_capacity[g]),
+                GRB.LESS_EQUAL, big_M_max_production[g], 'Max production constraint',
+            ) for g in self.data.GENERATORS
+        }
+        # the ramp constraints are implied by the regulation bounds and never need to be violated
+        model.addLConstr(self.variables.binary_max_ramp, GRB.EQUAL, 1, name='Max ramp constraint')
+
+        model.setObjective(
+            gp.quicksum(
+                self.data.generator_up_cost[g] * self.variables.up_regulation[g]
+                - self.data.generator_down_cost[g] * self.variables.down_regulation[g]
+                for g in self.data.GENERATORS
+            )
+            + self.big_M * (
+                3 - self.variables.binary_RT_balance - self.variables.binary_max_production - self.variables.binary_max_ramp
+            ),
+            GRB.MINIMIZE,
+        )
+        model.update()
+        return model
+
+    def evaluate(self, wind_error: np.ndarray) -> dict[str, np.ndarray]:
+        '''
+            Solve the recourse of every wind error in turn and return per-scenario arrays
+            of balancing cost and violations of each chance constraint
+        '''
+        wind = self.data.wind_mean + self.data.generator_capacity['G2'] * np.asarray(wind_error, dtype=float)
+        binaries = [
+            self.variables.binary_RT_balance, self.variables.binary_max_production, self.variables.binary_max_ramp
+        ]
+        results = {
+            'balancing_cost': np.empty(len(wind)),
+            'RT_balance_violation': np.empty(len(wind), dtype=bool),
+            'max_production_violation': np.empty(len(wind), dtype=bool),
+            'max_ramp_violation': np.empty(len(wind), dtype=bool),
+        }
+        for i, w in enumerate(wind):
+            self.variables.wind.LB = self.variables.wind.UB = w
+            self.model.optimize()
+            if self.model.status != GRB.OPTIMAL:
+                raise RuntimeError(f'optimization of {self.model.ModelName} was not successful')
+            satisfied = np.array(self.model.getAttr(GRB.Attr.X, binaries)) > 0.5
+            results['RT_balance_violation'][i] = not satisfied[0]
+            results['max_production_violation'][i] = not satisfied[1]
+            results['max_ramp_violation'][i] = not satisfied[2]
+            results['balancing_cost'][i] = self.model.ObjVal - self.big_M * (~satisfied).sum()
+        return results
+
+
+def sample_wind_errors(
+    n_samples: int,
+    historical: np.ndarray = None,
+    distribution: str = 'normal',
+    scale: float = 0.07,
+    seed: int = 0,
+) -> np.ndarray:
+    '''
+        Draw wind errors by bootstrapping a historical series, or from a zero-mean
+        parametric distribution ('normal' or 'laplace') with the given scale
+    '''
+    rng = np.random.default_rng(seed)
+    if historical is not None:
+        return rng.choice(np.asarray(historical, dtype=float), size=n_samples)
+    return getattr(rng, distribution)(0, scale, n_samples)
+
+
+class _SortedSamples():
+    '''
+        Sorted 1D samples with prefix sums of probability and probability-weighted value,
+        so that the transport cost of moving every sample in [lo, hi) onto a point s,
+        sum(p_i * |x_i - s|), is evaluated in O(log N) (vectorized over lo, hi, s)
+    '''
+
+    def __init__(self, samples: np.ndarray, probabilities: np.ndarray):
+        order = np.argsort(samples, kind='stable')
+        self.x = samples[order]
+        self.p = probabilities[order]
+        self.P = np.concatenate(([0], np.cumsum(self.p)))
+        self.PX = np.concatenate(([0], np.cumsum(self.p * self.x)))
+
+    def index(self, value):
+        return np.searchsorted(self.x, value, side='left')
+
+    def cost(self, lo, hi, s):
+        a, b = self.index(lo), self.index(hi)
+        c = np.clip(self.index(s), a, b)
+        return (
+            s * (self.P[c] - self.P[a]) - (self.PX[c] - self.PX[a])
+            + (self.PX[b] - self.PX[c]) - s * (self.P[b] - self.P[c])
+        )
+
+    def cell_bounds(self, selected: np.ndarray):
+        # nearest-point (Voronoi) cells of the sorted selected points
+        midpoints = (selected[:-1] + selected[1:]) / 2
+        return np.concatenate(([-np.inf], midpoints)), np.concatenate((midpoints, [np.inf]))
+
+
+def _forward_selection(samples: _SortedSamples, n_scenarios: int, max_candidates: int = 10_000) -> np.ndarray:
+    '''
+        Fast forward selection: greedily add the candidate that most reduces the transport
+        distance to the selected set. In 1D only the cell the candidate falls in changes,
+        so all candidates are scored at once from prefix sums. Large sample sets are
+        thinned to max_candidates evenly spaced quantiles.
+    '''
+    candidates = np.unique(samples.x)
+    if len(candidates) > max_candidates:
+        quantiles = np.searchsorted(samples.P[1:], np.linspace(0, 1, max_candidates), side='left')
+        candidates = np.unique(samples.x[quantiles.clip(0, len(samples.x) - 1)])
+    selected = np.empty(0)
+    for _ in range(min(n_scenarios, len(candidates))):
+        j = np.searchsorted(selected, candidates)
+        has_left, has_right = j > 0, j < len(selected)
+        left_point = selected[np.maximum(j - 1, 0)] if len(selected) else np.zeros(len(candidates))
+        right_point = selected[np.minimum(j, len(selected) - 1)] if len(selected) else np.zeros(len(candidates))
+        left, right = np.where(has_left, left_point, -np.inf), np.where(has_right, right_point, np.inf)
+        # cost of the cell [left, right] before and after adding the candidate
+        middle = np.where(has_left & has_right, (left_point + right_point) / 2, np.where(has_left, np.inf, -np.inf))
+        old_cost = (
+            np.where(has_left, samples.cost(left, middle, left_point), 0)
+            + np.where(has_right, samples.cost(middle, right, right_point), 0)
+        )
+        lower = np.where(has_left, (left_point + candidates) / 2, -np.inf)
+        upper = np.where(has_right, (candidates + right_point) / 2, np.inf)
+        new_cost = (
+            np.where(has_left, samples.cost(left, lower, left_point), 0)
+            + samples.cost(lower, upper, candidates)
+            + np.where(has_right, samples.cost(upper, right, right_point), 0)
+        )
+        best = np.argmin(new_cost - old_cost)
+        selected = np.insert(selected, j[best], candidates[best])
+        candidates = np.delete(candidates, best)
+    return selected
+
+
+def _k_medoids(samples: _SortedSamples, selected: np.ndarray, max_iterations: int = 100) -> np.ndarray:
+    '''
+        Alternate nearest-medoid assignment and medoid update. In 1D the medoid of
+        a cell under the transport (L1) distance is its weighted median.
+    '''
+    for _ in range(max_iterations):
+        lower, upper = samples.cell_bounds(selected)
+        a, b = samples.index(lower), samples.index(upper)
+        half = (samples.P[a] + samples.P[b]) / 2
+        median = np.clip(np.searchsorted(samples.P, half, side='left') - 1, a, np.maximum(b - 1, a))
+        medoids = np.unique(samples.x[median])
+        if len(medoids) == len(selected) and np.array_equal(medoids, selected):
+            break
+        selected = medoids
+    return selected
+
+
+def reduce_scenarios(
+    samples: np.ndarray,
+    n_scenarios: int,
+    method: str = 'forward-selection',
+    probabilities: np.ndarray = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    '''
+        Reduce 1D samples to n_scenarios representative samples by fast forward selection
+        ('forward-selection') or k-medoids started from it ('k-medoids'). Every sample's
+        probability is moved to its nearest kept sample, so the reduced probabilities are
+        in general not uniform. Returns (scenarios, probabilities).
+    '''
+    samples = np.asarray(samples, dtype=float)
+    if probabilities is None:
+        probabilities = np.full(len(samples), 1 / len(samples))
+    sorted_samples = _SortedSamples(samples, np.asarray(probabilities, dtype=float))
+    selected = _forward_selection(sorted_samples, n_scenarios)
+    if method == 'k-medoids':
+        selected = _k_medoids(sorted_samples, selected)
+    elif method != 'forward-selection':
+        raise ValueError(f'unknown scenario reduction method {method}')
+    lower, upper = sorted_samples.cell_bounds(selected)
+    reduced_probabilities = sorted_samples.P[sorted_samples.index(upper)] - sorted_samples.P[sorted_samples.index(lower)]
+    return selected, reduced_probabilities / reduced_probabilities.sum()
+
+
+def build_input_data(
+    template: InputData,
+    wind_error: np.ndarray,
+    probabilities: np.ndarray = None,
+    wind_error_oos: np.ndarray = None,
+) -> InputData:
+    '''
+        InputData with the template's fleet and load, and scenarios S1..SN built from
+        wind errors and probabilities (equal if not given). wind_error_oos must have
+        the same length; the template's out-of-sample errors are reused if not given.
+    '''
+    scenarios = [f'S{i}' for i in range(1, len(wind_error) + 1)]
+    if wind_error_oos is None:
+        wind_error_oos = [template.wind_error_oos[k] for k in template.SCENARIOS]
+    if len(wind_error_oos) != len(wind_error):
+        raise ValueError(f"{len(wind_error_oos)} out-of-sample wind errors for {len(wind_error)} scenarios")
+    if probabilities is not None and len(probabilities) != len(wind_error):
+        raise ValueError(f"{len(probabilities)} probabilities for {len(wind_error)} scenarios")
+    return InputData(
+        SCENARIOS=scenarios,
+        GENERATORS=template.GENERATORS,
+        load_capacity=template.load_capacity,
+        generator_DA_cost=template.generator_DA_cost,
+        generator_up_cost=template.generator_up_cost,
+        generator_down_cost=template.generator_down_cost,
+        generator_capacity=template.generator_capacity,
+        generator_up_capacity=template.generator_up_capacity,
+        generator_down_capacity=template.generator_down_capacity,
+        wind_error=dict(zip(scenarios, np.asarray(wind_error, dtype=float).tolist())),
+        wind_error_oos=dict(zip(scenarios, np.asarray(wind_error_oos, dtype=float).tolist())),
+        wind_mean=template.wind_mean,
+        pi=dict(zip(scenarios, probabilities.tolist())) if probabilities is not None else None,
+    )
+
+
+def generate_input_data(
+    template: InputData,
+    n_scenarios: int,
+    n_samples: int = 100_000,
+    method: str = 'forward-selection',
+    historical: np.ndarray = None,
+    seed: int = 0,
+    **distribution,
+) -> InputData:
+    '''
+        Scenario pipeline: sample n_samples wind errors (see sample_wind_errors), reduce them
+        to n_scenarios with their probabilities (see reduce_scenarios), and draw n_scenarios
+        further samples as out-of-sample errors
+    '''
+    samples = sample_wind_errors(n_samples + n_scenarios, historical=historical, seed=seed, **distribution)
+    wind_error, probabilities = reduce_scenarios(samples[:n_samples], n_scenarios, method=method)
+    return build_input_data(template, wind_error, probabilities, wind_error_oos=samples[n_samples:])
+
+
+def _init_sweep_worker():
+    # start the shared environment of a worker process before its first job
+    shared_env()
+
+
+def _solve_sweep_job(input_data: InputData, epsilon: float, threads: int, backend: str = 'gurobi') -> list[dict]:
+    '''
+        Solve one epsilon in-sample, then evaluate its DA dispatch out-of-sample.
+        Returns one result row per sample.
+    '''
+    model = StochasticEconomicDispatch(input_data, epsilon=epsilon, backend=backend)
+    rows = []
+    for sample in ('in-sample', 'out-of-sample'):
+        if sample == 'out-of-sample':
+            model.build_out_of_sample()
+        if backend == 'gurobi':
+            model.model.Params.Threads = threads
+        model.run()
+        rows.append({
+            'epsilon': epsilon,
+            'sample': sample,
+            'objective_value': model.results.objective_value,
+            'DA_price': model.results.DA_price,
+            **{f'DA_{g}': model.results.generator_DA_production[g] for g in input_data.GENERATORS},
+            'B_exp_cost': sum(
+                input_data.pi[k] * (
+                    input_data.generator_up_cost[g] * model.results.up_regulation[k][g]
+                    - input_data.generator_down_cost[g] * model.results.down_regulation[k][g]
+                ) for k in input_data.SCENARIOS for g in input_data.GENERATORS
+            ),
+        })
+    return rows
+
+
+def _evaluate_out_of_sample_chunk(job: tuple, wind_error: np.ndarray) -> dict[str, np.ndarray]:
+    return OutOfSampleEvaluator(*job).evaluate(wind_error)
+
+
+def run_epsilon_sweep(
+    input_data: InputData, epsilons: list, processes: int = 1, threads: int = 1, backend: str = 'gurobi'
+) -> list[dict]:
+    '''
+        Solve every epsilon in-sample and out-of-sample across a pool of worker processes,
+        each with its own gurobi environment (none with backend='highs', so the number of
+        processes is not limited by gurobi licenses). processes=1 runs the serial loop in this process.
+        Returns the result rows (one per epsilon and sample) in the order of epsilons.
+    '''
+    initializer = _init_sweep_worker if backend == 'gurobi' else None
+    if processes == 1:
+        if initializer is not None:
+            initializer()
+        jobs = [_solve_sweep_job(input_data, epsilon, threads, backend) for epsilon in epsilons]
+    else:
+        with ProcessPoolExecutor(max_workers=processes, initializer=initializer) as pool:
+            jobs = list(pool.map(
+                _solve_sweep_job, [input_data] * len(epsilons), epsilons, [threads] * len(epsilons),
+                [backend] * len(epsilons),
+            ))
+    return [row for rows in jobs for row in rows]
+
+
+def display_sweep(rows: list[dict]):
+    print()
+    print("-------------------   EPSILON SWEEP  -------------------")
+    columns = list(rows[0])
+    print(' '.join(f'{c:>14}' for c in columns))
+    for row in rows:
+        print(' '.join(f'{row[c]:>14.4g}' if isinstance(row[c], float) else f'{row[c]:>14}' for c in columns))
+
+
+def benchmark_sweep(input_data: InputData, n_epsilons: int = 100, processes: int = None, threads: int = 1):
+    '''
+        Compare wall-clock time of the serial loop and the process pool over an epsilon grid
+    '''
+    processes = processes or os.cpu_count()
+    epsilons = np.linspace(0, 0.5, n_epsilons).round(4).tolist()
+    start = time.perf_counter()
+    serial_rows = run_epsilon_sweep(input_data, epsilons, processes=1, threads=threads)
+    serial = time.perf_counter() - start
+    start = time.perf_counter()
+    parallel_rows = run_epsilon_sweep(input_data, epsilons, processes=processes, threads=threads)
+    parallel = time.perf_counter() - start
+    assert all(
+        abs(a['objective_value'] - b['objective_value']) <= 1e-6 * max(1, abs(a['objective_value']))
+        for a, b in zip(serial_rows, parallel_rows)
+    )
+    print()
+    print("-------------------   SWEEP BENCHMARK  -------------------")
+    print(f"{n_epsilons} epsilons x (in-sample, out-of-sample), {processes} processes, {threads} thread(s) per job")
+    print(f"serial: {serial:.3f} s, parallel: {parallel:.3f} s, speedup: {serial / parallel:.1f}x")
+
+
+def random_input_data(n_scenarios: int, seed: int = 0) -> InputData:
+    '''
+        Exercise fleet with normally distributed in-sample and out-of-sample wind errors, used for benchmarks
+    '''
+    rng = np.random.default_rng(seed)
+    scenarios = [f'S{i}' for i in range(1, n_scenarios + 1)]
+    return InputData(
+        SCENARIOS=scenarios,
+        GENERATORS=[f'G{i}' for i in range(1,4)],
+        load_capacity=200,
+        generator_DA_cost={'G1': 75, 'G2': 6, 'G3': 80},
+        generator_up_cost={'G1': 77, 'G2': 8, 'G3': 82},
+        generator_down_cost={'G1': 74, 'G2': 5, 'G3': 79},
+        generator_capacity={'G1': 100, 'G2': 150, 'G3': 50},
+        generator_up_capacity={'G1': 10, 'G2': 150, 'G3': 50},
+        generator_down_capacity={'G1': 10, 'G2': 150, 'G3': 50},
+        wind_error=dict(zip(scenarios, rng.normal(0, 0.07, n_scenarios).round(2).tolist())),
+        wind_error_oos=dict(zip(scenarios, rng.normal(0, 0.07, n_scenarios).round(2).tolist())),
+        wind_mean=110,
+    )
+
+
+def check_backend_parity(
+    input_data: InputData, epsilons: tuple = (0, 0.1, 0.2, 0.3), formulation: str = 'big-M', tolerance: float = 1e-6
+) -> dict[str, float]:
+    '''
+        Solve every epsilon in-sample and out-of-sample with both backends and assert that the expected
+        costs and DA dispatches agree. Prices are only reported: with epsilon > 0 the set of violated
+        scenarios, and so the balancing prices, can differ between equally good solutions.
+    '''
+    env = shared_env()
+    differences = {'objective': 0.0, 'DA_dispatch': 0.0, 'DA_price': 0.0, 'B_price': 0.0}
+    for epsilon in epsilons:
+        models = [
+            StochasticEconomicDispatch(input_data, epsilon=epsilon, env=env, formulation=formulation, backend=backend)
+            for backend in ('gurobi', 'highs')
+        ]
+        for sample in ('in-sample', 'out-of-sample'):
+            for model in models:
+                if sample == 'out-of-sample':
+                    model.build_out_of_sample()
+                model.run()
+            gurobi, highs = (model.results for model in models)
+            differences['objective'] = max(differences['objective'], abs(gurobi.objective_value - highs.objective_value))
+            differences['DA_dispatch'] = max(differences['DA_dispatch'], *(
+                abs(gurobi.generator_DA_production[g] - highs.generator_DA_production[g]) for g in input_data.GENERATORS
+            ))
+            differences['DA_price'] = max(differences['DA_price'], abs(gurobi.DA_price - highs.DA_price))
+            differences['B_price'] = max(differences['B_price'], *(
+                abs(gurobi.B_price[k] - highs.B_price[k]) for k in input_data.SCENARIOS
+            ))
+            assert differences['objective'] <= tolerance * max(1, abs(gurobi.objective_value)), f"backends differ: {differences}"
+            assert differences['DA_dispatch'] <= tolerance * max(1, input_data.load_capacity), f"backends differ: {differences}"
+    return differences
+
+
+def check_formulation_prices(
+    input_data: InputData, epsilons: tuple = (0, 0.1), tolerance: float = 1e-6
+) -> dict[str, float]:
+    '''
+        Solve every epsilon with the big-M, tight and indicator formulations and assert that the balancing
+        prices agree with those of big-M. Use epsilons with a unique set of violated scenarios: otherwise
+        equally good solutions can violate different scenarios, which then have different prices.
+    '''
+    env = shared_env()
+    differences = {'tight': 0.0, 'indicator': 0.0}
+    for epsilon in epsilons:
+        reference = StochasticEconomicDispatch(input_data, epsilon=epsilon, env=env, formulation='big-M')
+        reference.run()
+        for formulation in differences:
+            model = StochasticEconomicDispatch(input_data, epsilon=epsilon, env=env, formulation=formulation)
+            model.run()
+            differences[formulation] = max(
+                differences[formulation], np.abs(model.results.B_price.array - reference.results.B_price.array).max()
+            )
+            assert differences[formulation] <= tolerance, f"balancing prices differ: {differences}"
+    return differences
+
+
+def benchmark_backends(scenario_counts: tuple = (10, 20, 30), epsilon: float = 0.1, formulation: str = 'tight'):
+    '''
+        Compare build and solve time of the gurobi and HiGHS backends on the in-sample MILP
+    '''
+    env = shared_env()
+    print()
+    print("-------------------   BACKEND BENCHMARK  -------------------")
+    print(f"epsilon = {epsilon}, {formulation} formulation")
+    print(f"{'scenarios':>10} {'gurobi [s]':>11} {'HiGHS [s]':>10} {'objective diff':>15}")
+    for n_scenarios in scenario_counts:
+        input_data = random_input_data(n_scenarios)
+        timings, objectives = [], []
+        for backend in ('gurobi', 'highs'):
+            start = time.perf_counter()
+            model = StochasticEconomicDispatch(input_data, epsilon=epsilon, env=env, formulation=formulation, backend=backend)
+            model.run()
+            timings.append(time.perf_counter() - start)
+            objectives.append(model.results.objective_value)
+        print(f"{n_scenarios:>10} {timings[0]:>11.3f} {timings[1]:>10.3f} {abs(objectives[0] - objectives[1]):>15.2e}")
+
+
+def benchmark_formulations(scenario_counts: tuple = (10, 100, 1000), epsilon: float = 0.1, time_limit: float = 600):
+    '''
+        Compare MIP solve time and node count of the chance-constraint formulations
+    '''
+    env = gp.Env(params={'OutputFlag': 0, 'TimeLimit': time_limit})
+    print()
+    print("-------------------   FORMULATION BENCHMARK  -------------------")
+    print(f"epsilon = {epsilon}")
+    print(f"{'scenarios':>10} {'formulation':>12} {'MIP time [s]':>13} {'nodes':>10} {'objective':>12} {'gap':>8}")
+    for n_scenarios in scenario_counts:
+        input_data = random_input_data(n_scenarios)
+        for formulation in ('big-M', 'tight', 'indicator'):
+            model = StochasticEconomicDispatch(input_data, epsilon=epsilon, env=env, formulation=formulation)
+            model.model.optimize()
+            print(
+                f"{n_scenarios:>10} {formulation:>12} {model.model.Runtime:>13.3f} {model.model.NodeCount:>10.0f} "
+                f"{model.model.ObjVal:>12.2f} {model.model.MIPGap:>8.2%}"
+            )
+
+
+def benchmark_out_of_sample(
+    scenario_counts: tuple = (10, 100, 1000, 10000), epsilon: float = 0.1, processes: int = None
+):
+    '''
+        Compare out-of-sample evaluation by rebuilding the full MIP against the per-scenario evaluator
+    '''
+    processes = processes or os.cpu_count()
+    env = shared_env()
+    model = StochasticEconomicDispatch(random_input_data(10), epsilon=epsilon, env=env, formulation='tight')
+    model.run()
+    print()
+    print("-------------------   OUT-OF-SAMPLE BENCHMARK  -------------------")
+    print(f"{'scenarios':>10} {'rebuild [s]':>12} {'serial [s]':>11} {f'{processes} procs [s]':>12} {'exp. cost':>10} {'violations':>11}")
+    for n_scenarios in scenario_counts:
+        input_data = random_input_data(n_scenarios, seed=1)
+        wind_error_oos = [input_data.wind_error_oos[k] for k in input_data.SCENARIOS]
+        timings = []
+        if n_scenarios <= 1000:
+            full = StochasticEconomicDispatch(input_data, epsilon=epsilon, env=env, formulation='tight')
+            full.results.generator_DA_production = model.results.generator_DA_production
+            start = time.perf_counter()
+            full.build_out_of_sample()
+            full.run()
+            timings.append(f'{time.perf_counter() - start:>12.3f}')
+        else:
+            timings.append(f"{'-':>12}")
+        for n_processes in (1, processes):
+            start = time.perf_counter()
+            out_of_sample = model.evaluate_out_of_sample(wind_error_oos, processes=n_processes)
+            timings.append(f'{time.perf_counter() - start:>{11 if n_processes == 1 else 12}.3f}')
+        print(
+            f"{n_scenarios:>10} {' '.join(timings)} {out_of_sample.expected_cost:>10.1f} "
+            f"{out_of_sample.violation_rate['any']:>11.1%}"
+        )
+
+
+def benchmark_scenario_reduction(
+    sample_sizes: tuple = (10_000, 100_000, 1_000_000),
+    scenario_counts: tuple = (5, 10, 20, 50),
+    n_oos: int = 2000,
+):
+    '''
+        Time the scenario reduction, then compare the solve time and the cost error
+        (in-sample expected cost against out-of-sample expected cost) of reduced
+        scenario sets against equally likely random subsets
+    '''
+    print()
+    print("-------------------   SCENARIO REDUCTION BENCHMARK  -------------------")
+    print(f"{'samples':>10} {'scenarios':>10} {'forward sel. [s]':>17} {'k-medoids [s]':>14}")
+    for n_samples in sample_sizes:
+        samples = sample_wind_errors(n_samples)
+        for n_scenarios in scenario_counts:
+            timings = []
+            for method in ('forward-selection', 'k-medoids'):
+                start = time.perf_counter()
+                reduce_scenarios(samples, n_scenarios, method=method)
+                timings.append(time.perf_counter() - start)
+            print(f"{n_samples:>10} {n_scenarios:>10} {timings[0]:>17.3f} {timings[1]:>14.3f}")
+
+    env = shared_env()
+    template = random_input_data(1)
+    samples = sample_wind_errors(sample_sizes[1] + n_oos, seed=1)
+    pool, oos = samples[:sample_sizes[1]], samples[sample_sizes[1]:]
+    rng = np.random.default_rng(2)
+    print()
+    print(f"epsilon = 0, {sample_sizes[1]} samples, out-of-sample evaluation on {n_oos} further samples")
+    print(f"{'scenarios':>10} {'method':>18} {'solve [s]':>10} {'in-sample':>10} {'out-of-sample':>14} {'cost error':>11} {'violations':>11}")
+    for n_scenarios in scenario_counts:
+        for method in ('random', 'forward-selection', 'k-medoids'):
+            if method == 'random':
+                input_data = build_input_data(template, rng.choice(pool, n_scenarios), wind_error_oos=oos[:n_scenarios])
+            else:
+                wind_error, probabilities = reduce_scenarios(pool, n_scenarios, method=method)
+                input_data = build_input_data(template, wind_error, probabilities, wind_error_oos=oos[:n_scenarios])
+            model = StochasticEconomicDispatch(input_data, epsilon=0, env=env, formulation='tight')
+            start = time.perf_counter()
+            model.run()
+            solve = time.perf_counter() - start
+            out_of_sample = model.evaluate_out_of_sample(oos)
+            error = abs(model.results.objective_value - out_of_sample.expected_cost) / abs(out_of_sample.expected_cost)
+            print(
+                f"{n_scenarios:>10} {method:>18} {solve:>10.3f} {model.results.objective_value:>10.1f} "
+                f"{out_of_sample.expected_cost:>14.1f} {error:>11.2%} {out_of_sample.violation_rate['any']:>11.1%}"
+            )
+
+
 if __name__ == '__main__':
     input_data = InputData(
         SCENARIOS=[f'S{i}' for i in range(1,11)],
@@ -378,3 +1329,18 @@ if __name__ == '__main__':
         model.build_out_of_sample()
         model.run()
         model.display_results()
+
+    # same expected costs and DA dispatches without a gurobi license
+    print("Largest differences between the gurobi and HiGHS backends:")
+    print(check_backend_parity(input_data))
+    # same balancing prices with every chance-constraint formulation
+    print("Largest balancing price differences to the big-M formulation:")
+    print(check_formulation_prices(input_data))
+
+    if '--benchmark' in sys.argv:
+        benchmark_backends()
+        display_sweep(run_epsilon_sweep(input_data, [0.1, 0.2, 0.3], processes=3, backend='highs'))
+        benchmark_sweep(input_data)
+        benchmark_formulations()
+        benchmark_out_of_sample()
+        benchmark_scenario_reduction()
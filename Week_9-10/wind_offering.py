@@ -0,0 +1,706 @@
+'''
+Day-ahead offering of a price-taker wind producer (Exercises 6, 7 and 9) for large scenario sets.
+With a single offer, the expected profit is piecewise linear in the offer, so the optimal offer
+is a corner (one-price scheme) or a weighted quantile of the production (two-price scheme, a
+newsvendor problem), which is found without an optimization model. The LP is kept as a cross-check.
+The risk-averse (CVaR) offer is found by bisection on the scenario profits sorted around the value
+at risk, or by the CVaR LP on scenarios merged by profit function.
+'''
+
+from concurrent.futures import ProcessPoolExecutor
+import os
+import sys
+import time
+
+import gurobipy as gp
+from gurobipy import GRB
+import numpy as np
+import scipy.sparse as sp
+
+# shared helpers in common.py at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import shared_env
+
+
+class Expando(object):
+    '''
+        A small class which can have attributes set
+    '''
+    pass
+
+
+class InputData:
+
+    def __init__(
+        self,
+        production: np.ndarray,
+        balancing_price: np.ndarray,
+        probabilities: np.ndarray,
+        day_ahead_price: float = 20,
+        marginal_cost: float = 15,
+        capacity: float = 150,
+    ):
+        # Wind production (P^W_w) in every scenario
+        self.production = np.asarray(production, dtype=float)
+        # Balancing price (lambda^B_w) in every scenario
+        self.balancing_price = np.asarray(balancing_price, dtype=float)
+        # Probability (pi_w) of every scenario
+        self.probabilities = np.asarray(probabilities, dtype=float)
+        # Day-ahead price (lambda^DA), a constant or one value per scenario
+        self.day_ahead_price = np.broadcast_to(np.asarray(day_ahead_price, dtype=float), self.production.shape)
+        # Production cost (c^W)
+        self.marginal_cost = marginal_cost
+        # Nominal capacity (W^nom), upper bound of the offer
+        self.capacity = capacity
+
+
+def scenario_product(
+    production: list, production_probabilities: list, balancing_price: list, balancing_probabilities: list, **kwargs
+) -> InputData:
+    '''
+        Input data for independent production and balancing price scenarios (their Cartesian product)
+    '''
+    production, balancing_price = np.meshgrid(np.asarray(production, dtype=float), np.asarray(balancing_price, dtype=float), indexing='ij')
+    probabilities = np.outer(production_probabilities, balancing_probabilities)
+    return InputData(production.ravel(), balancing_price.ravel(), probabilities.ravel(), **kwargs)
+
+
+def weighted_quantile(values: np.ndarray, weights: np.ndarray, target: float, sample_size: int = 10_000) -> float:
+    '''
+        Smallest value whose cumulative weight (over values not above it) reaches target.
+        For large arrays, a random sample brackets the answer within 2 % of the total weight, and only
+        the values inside the bracket are sorted (the whole array when the bracket misses).
+    '''
+    if len(values) > 10 * sample_size:
+        sample = np.random.default_rng(0).integers(0, len(values), sample_size)
+        order = np.argsort(values[sample])
+        sample_values = values[sample][order]
+        cumulative = np.cumsum(weights[sample][order]) * (len(values) / sample_size)
+        margin = 0.02 * cumulative[-1]
+        lower = sample_values[min(np.searchsorted(cumulative, target - margin), sample_size - 1)]
+        upper = sample_values[min(np.searchsorted(cumulative, target + margin), sample_size - 1)]
+        below = values < lower
+        bracket = ~below & (values <= upper)
+        # dot products with the masks are much faster than summing boolean-indexed copies
+        weight_below = weights @ below
+        if weight_below < target <= weight_below + weights @ bracket:
+            values, weights, target = values[bracket], weights[bracket], target - weight_below
+    order = np.argsort(values)
+    position = np.searchsorted(np.cumsum(weights[order]), target)
+    return values[order[min(position, len(values) - 1)]]
+
+
+def imbalance_prices(data: InputData, scheme: str) -> tuple[np.ndarray, np.ndarray]:
+    '''
+        Price received for surplus and price paid for deficit in every scenario.
+        One-price: both at the balancing price. Two-price: the surplus is paid the lower and the
+        deficit charged the higher of the day-ahead and balancing prices.
+    '''
+    if scheme == 'one-price':
+        return data.balancing_price, data.balancing_price
+    return (
+        np.minimum(data.day_ahead_price, data.balancing_price),
+        np.maximum(data.day_ahead_price, data.balancing_price),
+    )
+
+
+def scenario_profits(data: InputData, offer: float, scheme: str) -> np.ndarray:
+    '''
+        Profit of the offer in every scenario
+    '''
+    surplus_price, deficit_price = imbalance_prices(data, scheme)
+    imbalance = data.production - offer
+    return (
+        data.day_ahead_price * offer
+        + surplus_price * np.maximum(imbalance, 0)
+        - deficit_price * np.maximum(-imbalance, 0)
+        - data.marginal_cost * data.production
+    )
+
+
+def conditional_value_at_risk(profits: np.ndarray, probabilities: np.ndarray, alpha: float) -> tuple[float, float]:
+    '''
+        Value at risk and CVaR_alpha of the profit: the expected profit over the worst 1 - alpha of
+        the probability mass, with the scenario at the boundary counted in part
+    '''
+    order = np.argsort(profits)
+    sorted_profits, sorted_probabilities = profits[order], probabilities[order]
+    tail = 1 - alpha
+    cumulative = np.cumsum(sorted_probabilities)
+    boundary = min(np.searchsorted(cumulative, tail), len(profits) - 1)
+    value_at_risk = sorted_profits[boundary]
+    below = sorted_probabilities[:boundary] @ sorted_profits[:boundary]
+    below_probability = cumulative[boundary - 1] if boundary > 0 else 0.0
+    return value_at_risk, (below + (tail - below_probability) * value_at_risk) / tail
+
+
+def optimal_offer(data: InputData, scheme: str) -> float:
+    '''
+        Offer maximizing the expected profit.
+        One-price: the profit is linear in the offer with slope E[lambda^DA - lambda^B], so the
+        offer is the capacity or zero. Two-price: the slope above the offer q is
+        E[(lambda^DA - surplus price) 1{P^W > q}] - E[(deficit price - lambda^DA) 1{P^W < q}],
+        which decreases in q and changes sign at a weighted quantile of the production.
+    '''
+    if scheme == 'one-price':
+        slope = data.probabilities @ (data.day_ahead_price - data.balancing_price)
+        return data.capacity if slope > 0 else 0.0
+    # offering one more MWh gains (lambda^DA - lambda^B)^+ in surplus scenarios and loses
+    # (lambda^B - lambda^DA)^+ in deficit scenarios, a scenario moves from one to the other at P^W = q
+    spread = data.day_ahead_price - data.balancing_price
+    total_gain = data.probabilities @ np.maximum(spread, 0)
+    if total_gain <= 0:
+        return 0.0
+    # the slope above P_(k) is total_gain - sum over the k lowest productions of pi |spread|
+    return min(weighted_quantile(data.production, data.probabilities * np.abs(spread), total_gain), data.capacity)
+
+
+def merge_scenarios(data: InputData, scheme: str) -> tuple[InputData, np.ndarray]:
+    '''
+        Merge scenarios whose profit is the same function of the offer, summing their probabilities.
+        One-price: the profit is (lambda^DA - lambda^B) q + (lambda^B - c^W) P^W, so scenarios with the
+        same slope and intercept merge. Two-price: scenarios with the same production, balancing and
+        day-ahead prices merge. Returns the merged data and the merged scenario of every original one.
+    '''
+    if scheme == 'one-price':
+        keys = np.column_stack([
+            data.day_ahead_price - data.balancing_price,
+            (data.balancing_price - data.marginal_cost) * data.production,
+        ])
+    else:
+        keys = np.column_stack([data.production, data.balancing_price, data.day_ahead_price])
+    # sort the keys and start a new merged scenario wherever they change (much faster than np.unique with axis=0)
+    order = np.lexsort(keys.T[::-1])
+    sorted_keys = keys[order]
+    starts = np.concatenate([[True], (sorted_keys[1:] != sorted_keys[:-1]).any(axis=1)])
+    first = order[starts]
+    inverse = np.empty(len(order), dtype=int)
+    inverse[order] = np.cumsum(starts) - 1
+    merged = InputData(
+        production=data.production[first],
+        balancing_price=data.balancing_price[first],
+        probabilities=np.bincount(inverse, weights=data.probabilities, minlength=len(first)),
+        day_ahead_price=data.day_ahead_price[first],
+        marginal_cost=data.marginal_cost,
+        capacity=data.capacity,
+    )
+    return merged, inverse
+
+
+def _profit_slopes(data: InputData, offer: float, scheme: str) -> np.ndarray:
+    # derivative of every scenario profit just above the offer, a scenario is in deficit once q >= P^W
+    surplus_price, deficit_price = imbalance_prices(data, scheme)
+    return data.day_ahead_price - np.where(data.production > offer, surplus_price, deficit_price)
+
+
+def _tail_slope(profits: np.ndarray, slopes: np.ndarray, probabilities: np.ndarray, alpha: float) -> float:
+    # derivative of CVaR_alpha just above the offer: average slope over the worst 1 - alpha of the mass,
+    # where scenarios tied at the value at risk enter the tail in increasing order of slope
+    tail = 1 - alpha
+    value_at_risk = weighted_quantile(profits, probabilities, tail)
+    below = profits < value_at_risk
+    slope = (probabilities * slopes) @ below
+    remaining = tail - probabilities @ below
+    tied = np.flatnonzero(profits == value_at_risk)
+    tied = tied[np.argsort(slopes[tied])]
+    # share of every tied scenario still needed to fill the tail
+    shares = np.clip(remaining - np.concatenate([[0], np.cumsum(probabilities[tied])[:-1]]), 0, probabilities[tied])
+    return (slope + shares @ slopes[tied]) / tail
+
+
+def optimal_risk_averse_offer(
+    data: InputData, scheme: str, alpha: float, beta: float, tolerance: float = 1e-6
+) -> float:
+    '''
+        Offer maximizing (1 - beta) * expected profit + beta * CVaR_alpha of the profit without an LP.
+        Every scenario profit is concave and piecewise linear in the offer, so the objective is too, and
+        its right derivative (evaluated from the scenario profits sorted around the value at risk)
+        decreases in the offer. The offer is bisected on the sign of that derivative down to
+        tolerance * capacity, and the kink inside the final interval is recovered exactly from the
+        linear pieces at its two ends.
+    '''
+    def derivative(offer: float) -> float:
+        profits = scenario_profits(data, offer, scheme)
+        slopes = _profit_slopes(data, offer, scheme)
+        return (1 - beta) * (data.probabilities @ slopes) + beta * _tail_slope(profits, slopes, data.probabilities, alpha)
+
+    def objective(offer: float) -> float:
+        profits = scenario_profits(data, offer, scheme)
+        return (1 - beta) * (data.probabilities @ profits) + beta * conditional_value_at_risk(profits, data.probabilities, alpha)[1]
+
+    lower, upper = 0.0, float(data.capacity)
+    if derivative(lower) <= 0:
+        return lower
+    step = tolerance * data.capacity
+    while upper - lower > step:
+        middle = (lower + upper) / 2
+        if derivative(middle) > 0:
+            lower = middle
+        else:
+            upper = middle
+    # with a single kink left in [lower, upper], it is where the linear pieces through both ends meet
+    slope_lower, slope_upper = derivative(lower), derivative(upper)
+    candidates = [lower, upper]
+    if slope_lower > slope_upper:
+        kink = (objective(upper) - objective(lower) + slope_lower * lower - slope_upper * upper) / (slope_lower - slope_upper)
+        candidates.append(min(max(kink, lower), upper))
+    return max(candidates, key=objective)
+
+
+class WindOffering():
+    '''
+        scheme='one-price' or 'two-price' balancing settlement. method='analytic' uses optimal_offer,
+        method='lp' solves the expected profit maximization with one surplus and one deficit
+        variable per scenario (two-price).
+    '''
+
+    def __init__(self, input_data: InputData, scheme: str = 'two-price', method: str = 'analytic', env: gp.Env = None):
+        if scheme not in ('one-price', 'two-price'):
+            raise ValueError(f"unknown scheme {scheme}")
+        if method not in ('analytic', 'lp'):
+            raise ValueError(f"unknown method {method}")
+        self.data = input_data # define data attributes
+        self.scheme = scheme
+        self.method = method
+        self.env = env
+        self.variables = Expando() # define variable attributes
+        self.constraints = Expando() # define constraints attributes
+        self.results = Expando() # define results attributes
+        self.timings = Expando() # define latency attributes (seconds)
+        if method == 'lp':
+            self._build_model() # build gurobi model
+
+    def _build_variables(self):
+        data = self.data
+        # build day-ahead offer, bounded by the nominal capacity
+        self.variables.offer = self.model.addVar(lb=0, ub=data.capacity, name='Offer')
+        if self.scheme == 'two-price':
+            surplus_price, deficit_price = imbalance_prices(data, self.scheme)
+            # build surplus and deficit of every scenario, with their expected settlement as objective
+            self.variables.surplus = self.model.addMVar(
+                len(data.production), lb=0, obj=data.probabilities * surplus_price, name='Surplus'
+            )
+            self.variables.deficit = self.model.addMVar(
+                len(data.production), lb=0, obj=-data.probabilities * deficit_price, name='Deficit'
+            )
+
+    def _build_constraints(self):
+        data = self.data
+        if self.scheme == 'two-price':
+            n_scenarios = len(data.production)
+            # build imbalance constraints: offer + surplus - deficit = P^W_w
+            self.constraints.imbalance_constraints = self.model.addMConstr(
+                sp.hstack([np.ones((n_scenarios, 1)), sp.identity(n_scenarios), -sp.identity(n_scenarios)], format='csr'),
+                self._first_stage_variables(),
+                GRB.EQUAL,
+                data.production,
+                name='Imbalance',
+            )
+
+    def _first_stage_variables(self) -> gp.MVar:
+        # offer followed by the surplus and deficit of every scenario (two-price)
+        variables = [self.variables.offer]
+        if self.scheme == 'two-price':
+            variables += self.variables.surplus.tolist() + self.variables.deficit.tolist()
+        return gp.MVar.fromlist(variables)
+
+    def _build_objective_function(self):
+        data = self.data
+        if self.scheme == 'one-price':
+            # the imbalance is settled at lambda^B_w, so the profit is linear in the offer
+            self.variables.offer.Obj = data.probabilities @ (data.day_ahead_price - data.balancing_price)
+            self.model.ObjCon = data.probabilities @ ((data.balancing_price - data.marginal_cost) * data.production)
+        else:
+            self.variables.offer.Obj = data.probabilities @ data.day_ahead_price
+            self.model.ObjCon = -data.marginal_cost * (data.probabilities @ data.production)
+        self.model.ModelSense = GRB.MAXIMIZE
+
+    def _build_model(self):
+        start = time.perf_counter()
+        self.model = gp.Model(name=f'Wind offering ({self.scheme})', env=shared_env(self.env))
+        self._build_variables()
+        self.model.update()
+        self._build_objective_function()
+        self._build_constraints()
+        self.model.update()
+        self.timings.build = time.perf_counter() - start
+
+    def _save_results(self, offer: float):
+        # save day-ahead offer
+        self.results.offer = offer
+        # save profit of every scenario and expected profit
+        self.results.profits = scenario_profits(self.data, offer, self.scheme)
+        self.results.expected_profit = self.data.probabilities @ self.results.profits
+
+    def run(self):
+        start = time.perf_counter()
+        if self.method == 'analytic':
+            self._save_results(optimal_offer(self.data, self.scheme))
+            self.timings.solve = time.perf_counter() - start
+            return
+        self.model.optimize()
+        self.timings.solve = time.perf_counter() - start
+        if self.model.status == GRB.OPTIMAL:
+            self._save_results(self.variables.offer.X)
+        else:
+            print(f"optimization of {self.model.ModelName} was not successful")
+
+    def display_results(self):
+        print()
+        print(f"-------------------   RESULTS ({self.scheme})  -------------------")
+        print("Optimal day-ahead offer:")
+        print(self.results.offer)
+        print("Expected profit:")
+        print(self.results.expected_profit)
+
+
+class RiskAverseWindOffering(WindOffering):
+    '''
+        Offering LP maximizing (1 - beta) * expected profit + beta * CVaR_alpha of the profit (Exercise 9 b),
+        with CVaR_alpha = eta - 1 / (1 - alpha) * sum_w pi_w z_w and z_w >= eta - profit_w. The profits
+        are substituted into the CVaR constraints instead of having one variable and equality per scenario,
+        and with merge=True scenarios with the same profit function are merged first (merge_scenarios).
+        method='sort' skips the LP and uses optimal_risk_averse_offer on the (merged) scenarios.
+        alpha and beta only appear in the objective, so set_risk_aversion changes them in place and
+        the next run() warm-starts from the previous basis.
+    '''
+
+    def __init__(
+        self,
+        input_data: InputData,
+        scheme: str = 'two-price',
+        alpha: float = 0.95,
+        beta: float = 0.5,
+        env: gp.Env = None,
+        method: str = 'lp',
+        merge: bool = True,
+    ):
+        if method not in ('lp', 'sort'):
+            raise ValueError(f"unknown method {method}")
+        self.alpha = alpha
+        self.beta = beta
+        self.original_data = input_data
+        # merged scenario of every original scenario, results are per merged scenario
+        self.scenario_index = None
+        if merge:
+            input_data, self.scenario_index = merge_scenarios(input_data, scheme)
+        # the sort-based method needs no model, which the parent class only builds for method='lp'
+        super().__init__(input_data, scheme=scheme, method='lp' if method == 'lp' else 'analytic', env=env)
+        self.method = method
+
+    def _build_variables(self):
+        super()._build_variables()
+        # build value at risk (eta) and shortfall below it in every scenario (z_w)
+        self.variables.eta = self.model.addVar(lb=-GRB.INFINITY, name='Value at risk')
+        self.variables.shortfall = self.model.addMVar(len(self.data.production), lb=0, name='Shortfall')
+
+    def _build_constraints(self):
+        super()._build_constraints()
+        data = self.data
+        n_scenarios = len(data.production)
+        # build CVaR constraints: z_w - eta + profit_w >= 0, with the constant part of the profit on the right-hand side
+        if self.scheme == 'one-price':
+            columns = [(data.day_ahead_price - data.balancing_price)[:, None]]
+            rhs = (data.marginal_cost - data.balancing_price) * data.production
+        else:
+            surplus_price, deficit_price = imbalance_prices(data, self.scheme)
+            columns = [data.day_ahead_price[:, None], sp.diags(surplus_price), sp.diags(-deficit_price)]
+            rhs = data.marginal_cost * data.production
+        self.constraints.cvar_constraints = self.model.addMConstr(
+            sp.hstack([*columns, -np.ones((n_scenarios, 1)), sp.identity(n_scenarios)], format='csr'),
+            gp.MVar.fromlist(
+                self._first_stage_variables().tolist() + [self.variables.eta] + self.variables.shortfall.tolist()
+            ),
+            GRB.GREATER_EQUAL,
+            rhs,
+            name='CVaR',
+        )
+
+    def _build_objective_function(self):
+        self._set_objective()
+        self.model.ModelSense = GRB.MAXIMIZE
+
+    def _set_objective(self):
+        data = self.data
+        weight = 1 - self.beta
+        if self.scheme == 'one-price':
+            self.variables.offer.Obj = weight * (data.probabilities @ (data.day_ahead_price - data.balancing_price))
+            self.model.ObjCon = weight * (data.probabilities @ ((data.balancing_price - data.marginal_cost) * data.production))
+        else:
+            surplus_price, deficit_price = imbalance_prices(data, self.scheme)
+            self.variables.offer.Obj = weight * (data.probabilities @ data.day_ahead_price)
+            self.variables.surplus.Obj = weight * data.probabilities * surplus_price
+            self.variables.deficit.Obj = -weight * data.probabilities * deficit_price
+            self.model.ObjCon = -weight * data.marginal_cost * (data.probabilities @ data.production)
+        self.variables.eta.Obj = self.beta
+        self.variables.shortfall.Obj = -self.beta * data.probabilities / (1 - self.alpha)
+
+    def set_risk_aversion(self, beta: float = None, alpha: float = None):
+        '''
+            Change beta and/or alpha by updating the objective coefficients of the existing model
+        '''
+        if beta is not None:
+            self.beta = beta
+        if alpha is not None:
+            self.alpha = alpha
+        if self.method == 'lp':
+            self._set_objective()
+
+    def run(self):
+        if self.method == 'lp':
+            super().run()
+            return
+        start = time.perf_counter()
+        self._save_results(optimal_risk_averse_offer(self.data, self.scheme, self.alpha, self.beta))
+        self.timings.solve = time.perf_counter() - start
+
+    def _save_results(self, offer: float):
+        super()._save_results(offer)
+        # save value at risk and CVaR of the profit, evaluated on the scenario profits since
+        # eta and z are not unique when beta = 0
+        self.results.value_at_risk, self.results.cvar = conditional_value_at_risk(
+            self.results.profits, self.data.probabilities, self.alpha
+        )
+
+    def display_results(self):
+        super().display_results()
+        print(f"CVaR ({self.alpha}) of the profit:")
+        print(self.results.cvar)
+
+
+def cvar_frontier(
+    input_data: InputData,
+    betas: list,
+    alpha: float = 0.95,
+    scheme: str = 'two-price',
+    env: gp.Env = None,
+    method: str = 'lp',
+) -> list[dict]:
+    '''
+        Efficient frontier for one alpha: one model, re-solved for every beta with updated objective coefficients
+        (method='lp'), or the sort-based offer for every beta (method='sort')
+    '''
+    offering = RiskAverseWindOffering(input_data, scheme=scheme, alpha=alpha, beta=betas[0], env=env, method=method)
+    if method == 'lp':
+        offering.model.Params.OutputFlag = 0
+    rows = []
+    for beta in betas:
+        offering.set_risk_aversion(beta=beta)
+        offering.run()
+        if method == 'lp' and offering.model.status != GRB.OPTIMAL:
+            continue
+        rows.append({
+            'alpha': alpha,
+            'beta': beta,
+            'expected_profit': offering.results.expected_profit,
+            'cvar': offering.results.cvar,
+            'offer': offering.results.offer,
+            'simplex_iterations': int(offering.model.IterCount) if method == 'lp' else 0,
+            'solve_time': offering.timings.solve,
+        })
+    if method == 'lp':
+        offering.model.dispose()
+    return rows
+
+
+def _init_frontier_worker():
+    # start the shared environment of a worker process before its first job
+    shared_env()
+
+
+def _solve_frontier_job(args: tuple) -> list[dict]:
+    input_data, betas, alpha, scheme, method = args
+    return cvar_frontier(input_data, betas, alpha, scheme, method=method)
+
+
+def cvar_frontiers(
+    input_data: InputData,
+    betas: list,
+    alphas: list,
+    scheme: str = 'two-price',
+    processes: int = 1,
+    method: str = 'lp',
+) -> list[dict]:
+    '''
+        Efficient frontiers for several alphas, one process per alpha when processes > 1.
+        Returns one row (alpha, beta, expected profit, CVaR, offer) per solved pair.
+    '''
+    jobs = [(input_data, list(betas), alpha, scheme, method) for alpha in alphas]
+    if processes > 1:
+        with ProcessPoolExecutor(processes, initializer=_init_frontier_worker) as pool:
+            frontiers = list(pool.map(_solve_frontier_job, jobs))
+    else:
+        frontiers = [cvar_frontier(input_data, list(betas), alpha, scheme, method=method) for alpha in alphas]
+    return [row for frontier in frontiers for row in frontier]
+
+
+def display_frontier(rows: list[dict]):
+    print()
+    print("-------------------   CVaR FRONTIER  -------------------")
+    print(f"{'alpha':>6} {'beta':>6} {'expected profit':>16} {'CVaR':>12} {'offer':>9}")
+    for row in rows:
+        print(
+            f"{row['alpha']:>6.2f} {row['beta']:>6.2f} {row['expected_profit']:>16.2f} "
+            f"{row['cvar']:>12.2f} {row['offer']:>9.2f}"
+        )
+
+
+def random_input_data(n_scenarios: int, seed: int = 0) -> InputData:
+    '''
+        Joint production and price scenarios with equal probabilities, used for benchmarks
+    '''
+    rng = np.random.default_rng(seed)
+    production = 150 * rng.beta(2, 2, n_scenarios)
+    # balancing prices are higher when the wind is low (system short) and lower when it is high
+    balancing_price = np.maximum(0, 20 + 15 * (1 - production / 75) + rng.normal(0, 8, n_scenarios))
+    return InputData(
+        production=production,
+        balancing_price=balancing_price,
+        probabilities=np.full(n_scenarios, 1 / n_scenarios),
+        day_ahead_price=rng.normal(20, 3, n_scenarios),
+    )
+
+
+def benchmark_offering(sizes: tuple = (1_000, 100_000, 1_000_000), lp_sizes: tuple = (1_000, 100_000)):
+    '''
+        Time of the analytic offer against the LP, and difference of their expected profits
+    '''
+    print()
+    print("-------------------   OFFERING BENCHMARK  -------------------")
+    print(
+        f"{'scenarios':>10} {'scheme':>10} {'analytic [ms]':>14} {'LP [s]':>9} {'offer':>9} "
+        f"{'LP offer':>9} {'profit diff':>12}"
+    )
+    env = shared_env()
+    for n_scenarios in sizes:
+        input_data = random_input_data(n_scenarios)
+        for scheme in ('one-price', 'two-price'):
+            analytic = WindOffering(input_data, scheme=scheme)
+            analytic.run()
+            row = f"{n_scenarios:>10} {scheme:>10} {1e3 * analytic.timings.solve:>14.2f}"
+            if n_scenarios in lp_sizes:
+                lp = WindOffering(input_data, scheme=scheme, method='lp', env=env)
+                lp.run()
+                difference = abs(analytic.results.expected_profit - lp.results.expected_profit)
+                row += (
+                    f" {lp.timings.build + lp.timings.solve:>9.3f} {analytic.results.offer:>9.3f} "
+                    f"{lp.results.offer:>9.3f} {difference:>12.2e}"
+                )
+                lp.model.dispose()
+            else:
+                row += f" {'-':>9} {analytic.results.offer:>9.3f} {'-':>9} {'-':>12}"
+            print(row)
+
+
+def benchmark_cvar_frontier(
+    n_scenarios: int = 1_000, n_betas: int = 51, alphas: tuple = (0.9, 0.95, 0.99), processes: int = 3
+):
+    '''
+        Compare one model per (alpha, beta) against one model per alpha re-solved across beta,
+        sequentially and with one process per alpha
+    '''
+    input_data = random_input_data(n_scenarios)
+    betas = np.linspace(0, 1, n_betas).tolist()
+    print()
+    print("-------------------   CVaR FRONTIER BENCHMARK  -------------------")
+    print(f"{n_scenarios} scenarios, {n_betas} betas, alphas {alphas}")
+    print(f"{'mode':>26} {'time [s]':>9} {'simplex its':>12} {'max offer diff':>15}")
+
+    start = time.perf_counter()
+    env = shared_env()
+    rebuilt = []
+    iterations = 0
+    for alpha in alphas:
+        for beta in betas:
+            offering = RiskAverseWindOffering(input_data, alpha=alpha, beta=beta, env=env)
+            offering.run()
+            rebuilt.append(offering.results.offer)
+            iterations += offering.model.IterCount
+            offering.model.dispose()
+    print(f"{'rebuild per beta':>26} {time.perf_counter() - start:>9.3f} {int(iterations):>12} {'-':>15}")
+
+    for mode, n_processes in (('template', 1), (f'template, {processes} processes', processes)):
+        start = time.perf_counter()
+        rows = cvar_frontiers(input_data, betas, alphas, processes=n_processes)
+        total = time.perf_counter() - start
+        difference = np.abs(np.array([row['offer'] for row in rows]) - np.array(rebuilt)).max()
+        iterations = sum(row['simplex_iterations'] for row in rows)
+        print(f"{mode:>26} {total:>9.3f} {iterations:>12} {difference:>15.2e}")
+
+
+def benchmark_cvar_scaling(
+    sizes: tuple = (1_000, 10_000, 100_000, 1_000_000), lp_sizes: tuple = (1_000, 10_000), alpha: float = 0.95, beta: float = 0.5
+):
+    '''
+        Time of the CVaR offer as the number of scenarios grows: LP on all scenarios, LP on the merged
+        scenarios and the sort-based offer, with production and prices on a 1 MWh / 1 EUR grid
+    '''
+    print()
+    print("-------------------   CVaR SCALING BENCHMARK  -------------------")
+    print(
+        f"{'scenarios':>10} {'merged':>8} {'LP [s]':>9} {'merged LP [s]':>14} {'sort [s]':>9} "
+        f"{'offer':>9} {'objective diff':>15}"
+    )
+    env = shared_env()
+    for n_scenarios in sizes:
+        input_data = random_input_data(n_scenarios)
+        input_data = InputData(
+            production=np.round(input_data.production),
+            balancing_price=np.round(input_data.balancing_price),
+            probabilities=input_data.probabilities,
+            day_ahead_price=np.round(input_data.day_ahead_price),
+        )
+        objectives = []
+        row = ''
+        for method, merge in (('lp', False), ('lp', True), ('sort', True)):
+            if method == 'lp' and n_scenarios not in lp_sizes:
+                row += f" {'-':>14}" if merge else f" {'-':>9}"
+                continue
+            start = time.perf_counter()
+            offering = RiskAverseWindOffering(
+                input_data, scheme='two-price', alpha=alpha, beta=beta, env=env, method=method, merge=merge
+            )
+            offering.run()
+            total = time.perf_counter() - start
+            objectives.append((1 - beta) * offering.results.expected_profit + beta * offering.results.cvar)
+            row += f" {total:>14.3f}" if (method, merge) == ('lp', True) else f" {total:>9.3f}"
+            if method == 'lp':
+                offering.model.dispose()
+        difference = max(objectives) - min(objectives)
+        print(
+            f"{n_scenarios:>10} {len(offering.data.production):>8}{row} {offering.results.offer:>9.3f} {difference:>15.2e}"
+        )
+
+
+if __name__ == '__main__':
+    # Exercise 7: production of 125 or 75 MWh and balancing price of 15 or 35 EUR/MWh, independent
+    input_data = scenario_product(
+        production=[125, 75],
+        production_probabilities=[0.5, 0.5],
+        balancing_price=[15, 35],
+        balancing_probabilities=[0.5, 0.5],
+        day_ahead_price=20,
+        marginal_cost=15,
+        capacity=150,
+    )
+    for scheme in ('one-price', 'two-price'):
+        offering = WindOffering(input_data, scheme=scheme)
+        offering.run()
+        offering.display_results()
+
+    # Exercise 9: ten balancing prices and two production levels, frontier over beta
+    input_data = scenario_product(
+        production=[75, 125],
+        production_probabilities=[0.5, 0.5],
+        balancing_price=[0, 7, 10, 15, 24, 26, 35, 40, 43, 50],
+        balancing_probabilities=[0.1] * 10,
+        day_ahead_price=20,
+        marginal_cost=15,
+        capacity=150,
+    )
+    display_frontier(cvar_frontiers(input_data, betas=np.linspace(0, 1, 11), alphas=[0.95], scheme='one-price'))
+
+    if '--benchmark' in sys.argv:
+        benchmark_offering()
+        benchmark_cvar_frontier()
+        benchmark_cvar_scaling()
@@ -0,0 +1,85 @@
+'''
+Helpers shared by the exercise solutions. The scripts run from their own week folder, so each of
+them puts the repository root on sys.path before importing from here.
+'''
+
+from collections.abc import Mapping
+
+import gurobipy as gp
+import numpy as np
+
+
+class LabeledArray(Mapping):
+    '''
+        Results in a NumPy array with the names along each axis (e.g. generators, or scenarios and
+        generators). Reads like the dict or nested dicts it replaces, e.g. results.up_regulation[k][g],
+        with the name -> index map of the first axis built at the first lookup. to_dict and to_pandas
+        convert on demand.
+    '''
+    __slots__ = ('array', 'labels', '_positions')
+
+    def __init__(self, array: np.ndarray, *labels: list):
+        self.array = array
+        # names along each axis (index -> name)
+        self.labels = labels
+        self._positions = None
+
+    def position(self, key) -> int:
+        # index of a name on the first axis
+        if self._positions is None:
+            self._positions = dict(zip(self.labels[0], range(len(self.labels[0]))))
+        return self._positions[key]
+
+    def __getitem__(self, key):
+        value = self.array[self.position(key)]
+        if self.array.ndim == 1:
+            return value.item()
+        return LabeledArray(value, *self.labels[1:])
+
+    def __iter__(self):
+        return iter(self.labels[0])
+
+    def __len__(self):
+        return len(self.labels[0])
+
+    def to_dict(self) -> dict:
+        if self.array.ndim == 1:
+            return dict(zip(self.labels[0], self.array.tolist()))
+        return {key: LabeledArray(row, *self.labels[1:]).to_dict() for key, row in zip(self.labels[0], self.array)}
+
+    def to_pandas(self):
+        # pandas is only needed for this conversion
+        import pandas as pd
+        if self.array.ndim == 1:
+            return pd.Series(self.array, index=self.labels[0])
+        return pd.DataFrame(self.array, index=self.labels[0], columns=self.labels[1])
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+
+def as_array(values, keys: list) -> np.ndarray:
+    '''
+        Return the values of a dict (or an array already ordered like keys) as a float array
+    '''
+    if isinstance(values, np.ndarray):
+        return values.astype(float, copy=False)
+    if isinstance(values, LabeledArray):
+        return values.array
+    return np.fromiter((values[k] for k in keys), dtype=float, count=len(keys))
+
+
+_env = None
+
+
+def shared_env(env: gp.Env = None) -> gp.Env:
+    '''
+        env if given, else the gurobi environment of this process, started with OutputFlag silenced
+        at the first call and shared by every model built without an explicit env
+    '''
+    global _env
+    if env is not None:
+        return env
+    if _env is None:
+        _env = gp.Env(params={'OutputFlag': 0})
+    return _env